@@ -2,13 +2,24 @@ import streamlit as st
 import streamlit_authenticator as stauth
 from streamlit_gsheets import GSheetsConnection
 import pandas as pd
-from docx import Document
-from docx.shared import Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from fpdf import FPDF
-from num2words import num2words
+from ata_ssvp import metricas
+from ata_ssvp.cache_render import CacheRender
+from ata_ssvp.conferencias import PoolConferencias
+from ata_ssvp.credenciais import chave_cookie
+from ata_ssvp.dados import adicionar_usuario, gerenciar_lista, gravar_configs, ler_cadastro
+from ata_ssvp.espelho import ConflitoEscrita
+from ata_ssvp.financeiro import PERIODOS
+from ata_ssvp.indice import normalizar_numero
+from ata_ssvp.livro import gerar_livro
+from ata_ssvp.membros import aplicar_diferenca, diferenca, interpretar_lista, ler_membros
+from ata_ssvp.modelo import eh_valido
+from ata_ssvp.lote import gerar_zip_lote, iterar_dados_ata, selecionar_atas
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date, timedelta, time
-import io
+from importlib.util import find_spec
+import functools
+import os
+import tempfile
 import time
 
 # ==============================================================================
@@ -16,12 +27,9 @@ import time
 # ==============================================================================
 st.set_page_config(page_title="Gerador de Ata Sociedade de São Vicente de Paulo (Seguro)", layout="wide", page_icon="✝️")
 
-# --- CLASSE PDF (Escopo Global para evitar erros) ---
-class PDF(FPDF):
-    def footer(self):
-        self.set_y(-15)
-        self.set_font('Arial', 'I', 8)
-        self.cell(0, 10, f'Página {self.page_no()}/{{nb}}', 0, 0, 'C')
+# Medições desta sessão (API, caches, documentos), abertas a cada rerun
+if "metricas" not in st.session_state: st.session_state.metricas = metricas.Medicoes()
+st.session_state.metricas.iniciar_rerun()
 
 try:
     conn = st.connection("gsheets", type=GSheetsConnection)
@@ -29,28 +37,41 @@ except Exception as e:
     st.error("Erro de conexão. Verifique se o arquivo .streamlit/secrets.toml existe.")
     st.stop()
 
+def _planilhas_conferencias():
+    """Seção [conferencias] dos secrets: id = "URL da planilha". Sem ela, só a planilha da conexão."""
+    try: return dict(st.secrets.get("conferencias", {}))
+    except Exception: return {}
+
+@st.cache_resource
+def obter_pool():
+    """Conferências servidas por este processo: espelho SQLite, credenciais e estruturas de cada uma; as menos usadas saem da memória."""
+    return PoolConferencias(conn, _planilhas_conferencias(), pasta=".cache/conferencias", max_residentes=8)
+
+pool = obter_pool()
+ID_CONFERENCIA = st.query_params.get("conferencia") or next(iter(pool.planilhas))
+if ID_CONFERENCIA not in pool:
+    st.error(f"Conferência '{ID_CONFERENCIA}' não encontrada.")
+    st.stop()
+conferencia = pool.obter(ID_CONFERENCIA)
+espelho, historico = conferencia.espelho, conferencia.historico
+
+@st.cache_resource
+def obter_cache_render():
+    """PDF/DOCX já gerados, por conteúdo (único para todas as conferências): memória + pasta em disco limitadas."""
+    return CacheRender(max_itens=256, pasta=".cache/documentos", max_bytes_disco=200 * 1024 * 1024,
+                       max_bytes_memoria=64 * 1024 * 1024)
+
+cache_render = obter_cache_render()
+
+@st.cache_resource
+def obter_executor():
+    """Threads que salvam e renderizam as atas fora do rerun (compartilhadas pelo processo)."""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="ata")
+
 # ==============================================================================
 # 2. FUNÇÕES UTILITÁRIAS E DE VALIDAÇÃO
 # ==============================================================================
 
-def eh_valido(valor):
-    """
-    Retorna False se o valor for vazio, nulo, zero, nan ou NaT.
-    Usado para impedir que campos vazios apareçam na impressão.
-    """
-    if valor is None: return False
-    s = str(valor).strip().lower()
-    valores_invalidos = ["", "nan", "none", "null", "false", "0", "0.0", "nat", "nattype"]
-    return s not in valores_invalidos
-
-def formatar_valor_extenso(valor):
-    try:
-        if not valor: return "R$ 0,00"
-        valor = float(valor)
-        extenso = num2words(valor, lang='pt_BR', to='currency')
-        return f"R$ {valor:,.2f} ({extenso})".replace(",", "X").replace(".", ",").replace("X", ".")
-    except: return "R$ 0,00"
-
 def formatar_data_br(data):
     if isinstance(data, (datetime, date)): return data.strftime('%d/%m/%Y')
     return str(data)
@@ -65,313 +86,393 @@ def obter_proxima_data(dia_alvo):
     dias_add = (dia_alvo - dia_hoje + 7) % 7
     return hoje + timedelta(days=dias_add)
 
-def get_index_membro(nome, lista):
-    try: return lista.index(nome) if nome in lista else 0
-    except: return 0
+def valor_carregado(dc, chave, padrao=''):
+    """Célula da ata carregada para correção, ou ``padrao`` se ela não tem (atas antigas não guardam todas as colunas)."""
+    valor = dc.get(chave)
+    return str(valor).strip() if eh_valido(valor) else padrao
+
+def hora_carregada(dc, chave, padrao):
+    """Hora "HH:MM" guardada na ata carregada, ou ``padrao``."""
+    try: return datetime.strptime(valor_carregado(dc, chave), '%H:%M').time()
+    except ValueError: return padrao
+
+def get_index_membro(nome, membros):
+    """Posição de ``nome`` no RegistroMembros (consulta no dicionário, sem percorrer a lista)."""
+    return membros.indice(nome)
 
 def limpar_memoria():
-    carregar_dados_cloud.clear()
-    obter_saldo_anterior.clear()
-    st.cache_data.clear()
-    if 'saldo_cache' in st.session_state:
-        del st.session_state['saldo_cache']
+    carregar_dados_cloud.clear(ID_CONFERENCIA)
+    carregar_membros.clear(ID_CONFERENCIA)
 
 # ==============================================================================
 # 3. FUNÇÕES DE BANCO DE DADOS (GOOGLE SHEETS)
 # ==============================================================================
 
+def obter_credenciais():
+    """Credenciais da conferência, compartilhadas por todas as sessões e renovadas a cada minuto a partir do espelho."""
+    return conferencia.credenciais
+
 def carregar_usuarios():
-    """Lê os usuários da planilha 'Usuarios'."""
-    try:
-        df = conn.read(worksheet="Usuarios", ttl=0)
-        df = df.dropna(subset=['username']) 
-        credentials = {"usernames": {}}
-        for _, row in df.iterrows():
-            credentials["usernames"][row['username']] = {
-                "name": row['name'],
-                "password": row['password'], 
-                "roles": [row['role']] if 'role' in row else ['editor']
-            }
-        return credentials
-    except:
-        return {"usernames": {}}
+    """Credenciais da aba 'Usuarios' (do cache do processo; não lê a planilha a cada rerun)."""
+    return obter_credenciais().obter()
 
 def salvar_novo_usuario(username, name, password_hash, role):
     try:
-        df = conn.read(worksheet="Usuarios", ttl=0)
-        if not df.empty and username in df['username'].values:
+        if not adicionar_usuario(espelho, username, name, password_hash, role):
             return False, "Usuário já existe!"
-        novo_user = pd.DataFrame([{
-            "username": username, "name": name,
-            "password": password_hash, "role": role
-        }])
-        df_atualizado = pd.concat([df, novo_user], ignore_index=True)
-        conn.update(worksheet="Usuarios", data=df_atualizado)
+        obter_credenciais().invalidar()
         return True, "Usuário criado com sucesso!"
     except Exception as e:
         return False, f"Erro ao salvar: {e}"
 
-@st.cache_data(ttl=3600)
-def carregar_dados_cloud():
-    tentativas = 0
-    max_tentativas = 3
-    while tentativas < max_tentativas:
-        try:
-            df_config = conn.read(worksheet="Config")
-            df_membros = conn.read(worksheet="Membros")
-            df_anos = conn.read(worksheet="Anos")
-            break 
-        except Exception as e:
-            if "429" in str(e) or "Quota" in str(e):
-                tentativas += 1
-                time.sleep(2 ** tentativas)
-                if tentativas == max_tentativas: st.stop()
-            else: st.stop()
-
-    if df_membros.empty: lista_membros = []
-    else: lista_membros = df_membros['Nome'].dropna().astype(str).tolist()
-        
-    if df_anos.empty: lista_anos = []
-    else: lista_anos = df_anos['Ano'].dropna().astype(str).tolist()
+@metricas.cache_medido("carregar_dados_cloud")
+@st.cache_data(ttl=3600, max_entries=64)
+def carregar_dados_cloud(id_conferencia):
+    """Config e Anos da conferência (a partida a frio traz Config, Membros e Anos numa única busca, no espelho)."""
+    metricas.falta_cache()
+    try: return ler_cadastro(espelho)
+    except Exception: st.stop()
 
-    config_dict = dict(zip(df_config['Chave'], df_config['Valor']))
-    try: config_dict['ultima_ata'] = int(config_dict.get('ultima_ata', 0))
-    except: config_dict['ultima_ata'] = 0
+@metricas.cache_medido("carregar_membros")
+@st.cache_data(ttl=3600, max_entries=64)
+def carregar_membros(id_conferencia):
+    """Registro de membros da conferência; editar membros invalida só este cache."""
+    metricas.falta_cache()
+    try: return ler_membros(espelho)
+    except Exception: st.stop()
 
-    return {"config": config_dict, "membros": lista_membros, "anos": lista_anos}
+def obter_livro_caixa():
+    return historico.livro_caixa()
 
-@st.cache_data(ttl=3600)
-def obter_saldo_anterior():
-    """Busca o saldo com Cache para evitar estourar a API."""
-    try:
-        df_hist = conn.read(worksheet="Historico") # ttl padrão usa cache
-        if not df_hist.empty and 'Saldo' in df_hist.columns and len(df_hist) > 0:
-            val = df_hist['Saldo'].iloc[-1]
-            return float(val) if val else 0.0
-    except: pass
-    return 0.0
-
-def salvar_lote_configs(dicionario_mudancas):
-    """Salva configurações em lote para economizar cota."""
+def obter_indice_atas():
+    return historico.indice()
+
+def obter_busca():
+    return historico.busca()
+
+def obter_frequencia(membros):
+    return historico.frequencia(membros)
+
+def obter_financeiro():
+    return historico.financeiro()
+
+def obter_saldo_anterior(numero):
+    """Saldo final da ata anterior a ``numero`` (consulta direta no livro caixa)."""
+    try: return historico.saldo_anterior(numero)
+    except Exception: return 0.0
+
+def salvar_lote_configs(dicionario_mudancas, base=None):
+    """Salva configurações em lote (uma chamada); com ``base``, só o que mudou desde a leitura."""
     try:
-        df = conn.read(worksheet="Config")
-        for chave, valor in dicionario_mudancas.items():
-            valor_str = str(valor)
-            if chave in df['Chave'].values:
-                df.loc[df['Chave'] == chave, 'Valor'] = valor_str
-            else:
-                new_row = pd.DataFrame([{'Chave': chave, 'Valor': valor_str}])
-                df = pd.concat([df, new_row], ignore_index=True)
-        conn.update(worksheet="Config", data=df)
+        gravar_configs(espelho, dicionario_mudancas, base)
         limpar_memoria()
         return True
+    except ConflitoEscrita as e:
+        limpar_memoria()
+        st.error(f"{e}. Confira os valores atuais e salve de novo.")
+        return False
     except Exception as e:
         st.error(f"Erro ao salvar: {e}")
         return False
 
 def gerenciar_lista_cloud(aba, coluna, valor, acao="adicionar"):
-    time.sleep(1)
-    df = conn.read(worksheet=aba)
-    if acao == "adicionar":
-        if valor not in df[coluna].values:
-            new_row = pd.DataFrame([{coluna: valor}])
-            df = pd.concat([df, new_row], ignore_index=True)
-            conn.update(worksheet=aba, data=df)
-    elif acao == "remover":
-        df = df[df[coluna] != valor]
-        conn.update(worksheet=aba, data=df)
-    limpar_memoria()
+    gerenciar_lista(espelho, aba, coluna, valor, acao)
+    if aba == "Membros": carregar_membros.clear(ID_CONFERENCIA)
+    else: limpar_memoria()
     return True
 
-def buscar_ata_para_edicao(num_ata_busca):
+def importar_membros(novos, removidos):
+    """Aplica a diferença da importação em lote (um append e um batchUpdate, no máximo)."""
     try:
-        df_hist = conn.read(worksheet="Historico", ttl=0)
-        df_hist.columns = df_hist.columns.str.strip()
-        col_num = None
-        possiveis = ["Numero", "Número", "Num", "Nº"]
-        for c in df_hist.columns:
-            if any(x in c for x in possiveis): col_num = c; break
-        
-        if not col_num: return None, df_hist, "Coluna ID não encontrada."
+        acrescentados, apagados = aplicar_diferenca(espelho, novos, removidos)
+        carregar_membros.clear(ID_CONFERENCIA)
+        return True, f"{acrescentados} membro(s) acrescentado(s), {apagados} removido(s)."
+    except Exception as e:
+        return False, f"Erro ao importar: {e}"
 
-        df_hist['Busca_ID'] = df_hist[col_num].astype(str).str.replace(r'\.0$', '', regex=True).str.strip()
-        termo = str(num_ata_busca).strip()
-        ata = df_hist[df_hist['Busca_ID'] == termo]
-        
-        if not ata.empty: 
-            return ata.iloc[0].to_dict(), None, "Ata encontrada!"
-        else:
-            return None, df_hist, f"Ata {termo} não encontrada."
+def buscar_ata_para_edicao(num_ata_busca):
+    """Localiza a ata pelo índice de números e lê só aquela linha do espelho."""
+    termo = str(num_ata_busca).strip()
+    try:
+        ata = historico.buscar_ata(termo)
+        if ata: return ata, None, "Ata encontrada!"
+        else: return None, None, f"Ata {termo} não encontrada."
     except Exception as e: return None, None, str(e)
 
-def salvar_historico_cloud(dados):
-    try:
-        df_hist = conn.read(worksheet="Historico", ttl=0)
-        df_hist.columns = df_hist.columns.str.strip()
-        col_num = "Numero"
-        for c in df_hist.columns:
-            if "umero" in c or "úmero" in c or "Num" in c: col_num = c; break
-
-        df_hist['Busca_ID'] = df_hist[col_num].astype(str).str.replace(r'\.0$', '', regex=True).str.strip()
-        num_atual = str(dados['num_ata']).strip()
-        
-        nova_linha = {
-            col_num: num_atual,
-            "Data": dados['data_reuniao'],
-            "Presidente": dados['pres_nome'],
-            "Secretario": dados['secretario_nome'],
-            "Leitura": dados['leitura_fonte'],
-            "Presentes": dados['lista_presentes_txt'],
-            "Ausencias": dados['ausencias'],
-            "Visitantes": dados['lista_visitantes_txt'],
-            "Receita": dados['receita'],
-            "Despesa": dados['despesa'],
-            "Saldo": dados['saldo'],
-            "Socioeconomico": dados['socioeconomico'],
-            "Noticias": dados['noticias_trabalhos'],
-            "Palavra_Franca": dados['palavra_franca']
-        }
+def obter_proximo_numero():
+    try: return historico.proximo_numero()
+    except Exception: return 1
+
+def salvar_historico_cloud(dados, base=None, nova=False):
+    """
+    Grava a ata no Historico (upsert por linha, ver HistoricoAtas.salvar). Devolve
+    (ok, tipo ou mensagem, dados gravados): o número pode mudar se outra pessoa o usou antes.
+    """
+    try: return (True,) + historico.salvar(dados, base=base, nova=nova)
+    except ConflitoEscrita as e: return False, str(e), dados
+    except Exception: return False, "erro", dados
+
+def _gravar_ultima_ata(num, ultima_ata):
+    """'ultima_ata' da Config depois de uma ata nova; False se a gravação falhou."""
+    if int(num) <= ultima_ata: return True
+    try: gravar_configs(espelho, {'ultima_ata': int(num)}); return True
+    except Exception: return False
 
-        if num_atual in df_hist['Busca_ID'].values:
-            idx = df_hist.index[df_hist['Busca_ID'] == num_atual].tolist()[0]
-            colunas_originais = [c for c in df_hist.columns if c != 'Busca_ID']
-            for col, val in nova_linha.items():
-                if col in colunas_originais: df_hist.at[idx, col] = val
-            df_atualizado = df_hist[colunas_originais]
-            msg_tipo = "atualizada"
+def _salvar_ata_completa(dados, ultima_ata, base=None):
+    """
+    Historico e, se for uma ata nova, 'ultima_ata' da Config. Roda numa thread do executor (sem st.*).
+    Devolve (ok, tipo ou mensagem, dados gravados, config ok): as duas partes falham em separado.
+    """
+    ok, tipo, gravados = salvar_historico_cloud(dados, base=base, nova=not base)
+    config_ok = not (ok and tipo == "criada") or _gravar_ultima_ata(gravados['num_ata'], ultima_ata)
+    return ok, tipo, gravados, config_ok
+
+def _completar_config(resultado, ultima_ata):
+    """Nova tentativa só da Config, com a ata já no Historico (repetir o salvamento a duplicaria)."""
+    ok, tipo, gravados, _ = resultado
+    return ok, tipo, gravados, _gravar_ultima_ata(gravados['num_ata'], ultima_ata)
+
+def iniciar_tarefa_ata(dados, ultima_ata, base=None):
+    """
+    Salvamento e renderização da ata em paralelo; o andamento fica na sessão. ``base`` é a
+    linha carregada para correção (troca condicional); sem ela, é uma ata nova.
+    """
+    executor = obter_executor()
+    st.session_state.tarefa_ata = {
+        "num": dados['num_ata'], "dados": dados, "ultima_ata": ultima_ata, "base": base, "aviso": None, "concluida": False,
+        "salvar": executor.submit(metricas.no_contexto(_salvar_ata_completa), dados, ultima_ata, base),
+        "render": executor.submit(metricas.no_contexto(cache_render.renderizar), dados),
+    }
+
+def _mostrar_tarefa_ata():
+    tarefa = st.session_state.tarefa_ata
+    num, salvar, render = tarefa["num"], tarefa["salvar"], tarefa["render"]
+    if tarefa["aviso"]: st.toast(tarefa["aviso"]); tarefa["aviso"] = None
+
+    if not salvar.done(): st.info(f"⏳ Salvando a ata {num}...")
+    else:
+        try: ok, tipo, gravados, config_ok = salvar.result()
+        except Exception: ok, tipo, gravados, config_ok = False, "erro", tarefa["dados"], True
+        if ok and gravados['num_ata'] != num:
+            # Outra pessoa salvou o mesmo número antes: a ata ficou com o próximo livre
+            tarefa["aviso"] = f"⚠️ O nº {num} já tinha sido usado; a ata foi salva como nº {gravados['num_ata']}."
+            tarefa["num"], tarefa["dados"] = gravados['num_ata'], gravados
+            tarefa["render"] = obter_executor().submit(metricas.no_contexto(cache_render.renderizar), gravados)
+            st.rerun()
+        if ok:
+            st.success(f"✅ Ata {num} {tipo}.")
+            if not config_ok:
+                st.warning(f"A ata {num} já está no Historico, mas a última ata da Config não foi atualizada.")
+                if st.button("🔁 Atualizar a Config de novo"):
+                    tarefa["salvar"] = obter_executor().submit(metricas.no_contexto(_completar_config), salvar.result(), tarefa["ultima_ata"])
+                    tarefa["concluida"] = False
+                    st.rerun()
+        elif tipo != "erro":
+            st.error(f"Ata {num} não foi salva: {tipo}. Carregue a ata de novo para ver a versão atual.")
         else:
-            df_nova = pd.DataFrame([nova_linha])
-            colunas_limpas = [c for c in df_hist.columns if c != 'Busca_ID']
-            df_atualizado = pd.concat([df_hist[colunas_limpas], df_nova], ignore_index=True)
-            msg_tipo = "criada"
+            st.error(f"Erro ao salvar a ata {num}. Os documentos continuam disponíveis abaixo.")
+            if st.button("🔁 Tentar salvar de novo"):
+                tarefa["salvar"] = obter_executor().submit(metricas.no_contexto(_salvar_ata_completa), tarefa["dados"], tarefa["ultima_ata"], tarefa["base"])
+                tarefa["concluida"] = False
+                st.rerun()
 
-        conn.update(worksheet="Historico", data=df_atualizado)
-        return True, msg_tipo
-    except Exception as e: return False, "erro"
+    if not render.done(): st.info("⏳ Gerando documentos...")
+    else:
+        try:
+            arquivos = render.result()
+            c1, c2 = st.columns(2)
+            c1.download_button("📄 Gerar PDF", arquivos["pdf"], f"Ata_{num}.pdf", "application/pdf", type="primary")
+            c2.download_button("📝 Gerar documento Word", arquivos["docx"], f"Ata_{num}.docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document")
+        except Exception as e: st.error(f"Erro ao gerar os documentos: {e}")
+
+    if salvar.done() and render.done() and not tarefa["concluida"]:
+        tarefa["concluida"] = True
+        if salvar.exception() is None and salvar.result()[0]:
+            tarefa["aviso"] = f"✅ Ata {num} salva!"
+            st.session_state.dados_carregados = {}
+            limpar_memoria()
+        st.rerun()  # rerun completo: o formulário passa a refletir o salvamento
+
+def painel_tarefa_ata():
+    """Andamento do último salvamento; enquanto houver algo pendente, só este trecho é reexecutado a cada segundo."""
+    tarefa = st.session_state.get("tarefa_ata")
+    if not tarefa: return
+    pendente = not (tarefa["salvar"].done() and tarefa["render"].done())
+    st.fragment(run_every=1 if pendente else None)(_mostrar_tarefa_ata)()
+
+def painel_desempenho():
+    """Medições da sessão e do processo (só para admin): rerun anterior, totais e exportação em JSON lines."""
+    sessao = st.session_state.metricas
+    anterior = sessao.rerun_anterior()
+    if anterior:
+        st.caption(f"Rerun anterior (nº {anterior['rerun']}): {anterior['ms']:.0f} ms")
+        eventos = [{"Tipo": e["tipo"], "Operação": e["nome"], "ms": e["ms"], "KB": round(e["bytes"] / 1024, 1),
+                    "Acerto": e["acerto"], "Erro": e["erro"]} for e in anterior["eventos"] if e["tipo"] != "rerun"]
+        if eventos: st.dataframe(pd.DataFrame(eventos), hide_index=True, width="stretch")
+    escopo = st.radio("Totais", ["Sessão", "Processo"], horizontal=True, key="escopo_metricas")
+    medicoes = sessao if escopo == "Sessão" else metricas.PROCESSO
+    resumo = medicoes.resumo()
+    if resumo: st.dataframe(pd.DataFrame(resumo), hide_index=True, width="stretch")
+    else: st.caption("Nada medido ainda.")
+    st.download_button("⬇️ Exportar (JSON lines)", medicoes.exportar_jsonl, f"metricas_{escopo.lower()}.jsonl", "application/x-ndjson")
 
 # ==============================================================================
-# 4. GERADORES DE DOCUMENTOS (COM VALIDACAO AGRESSIVA)
+# 4. SEÇÕES DO FORMULÁRIO (st.fragment)
 # ==============================================================================
+# Mexer num widget de uma seção reexecuta só a seção: login, barra lateral, cargas e as
+# outras seções ficam como estão. No rerun completo (o clique em "Gerar/Salvar Ata") cada
+# seção roda junto com o script e devolve os seus valores.
+
+def secao(funcao):
+    """Seção do formulário como st.fragment; cada execução entra nas medições (tipo "fragmento")."""
+    @functools.wraps(funcao)
+    def medida(*args, **kw):
+        st.session_state.metricas.coletar()
+        with metricas.medir("fragmento", funcao.__name__): return funcao(*args, **kw)
+    return st.fragment(medida)
+
+@secao
+def secao_frequencia(membros):
+    with st.expander("📊 Frequência dos Membros"):
+        periodo = st.date_input("Período", value=(date(date.today().year, 1, 1), date.today()), format="DD/MM/YYYY")
+        if len(periodo) == 2:
+            freq = obter_frequencia(membros.nomes)
+            st.dataframe(freq.resumo(*periodo), hide_index=True, width="stretch")
+
+@secao
+def secao_financeiro():
+    with st.expander("📈 Resumo Financeiro"):
+        fin = obter_financeiro()
+        agrupar = st.radio("Agrupar por", PERIODOS, horizontal=True)
+        st.dataframe(fin.tabela(agrupar), hide_index=True, width="stretch")
+        cx1, cx2 = st.columns(2)
+        # Arquivos gerados só no clique (não a cada rerun)
+        cx1.download_button("⬇️ CSV", lambda: fin.exportar_csv(agrupar), f"financeiro_{agrupar}.csv", "text/csv")
+        if find_spec("openpyxl"):
+            cx2.download_button("⬇️ Excel", fin.exportar_xlsx, "financeiro.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+        else: cx2.caption("Instale o openpyxl para exportar em Excel.")
+
+@secao
+def secao_detalhes(config, dc, hora_pad):
+    with st.expander("📍 Detalhes da Reunião", expanded=False):
+        cx1, cx2, cx3 = st.columns(3)
+        hr_ini = cx1.time_input("Início", hora_carregada(dc, 'Hora_Inicio', hora_pad))
+        local_r = cx2.text_input("Local", valor_carregado(dc, 'Local', config.get('local_padrao','')))
+        cidade_r = cx3.text_input("Cidade", config.get('cidade_padrao',''))
+    return hr_ini, local_r, cidade_r
+
+@secao
+def secao_chamada(dc, membros):
+    """(presentes, ausentes, motivos das justificativas)."""
+    st.divider()
+    st.subheader("Chamada")
+    cp1, cp2 = st.columns(2)
+    def_pres = [p.strip() for p in dc.get('Presentes','').split(',') if p.strip() in membros]
+    presentes = cp1.multiselect("1️⃣ Quem veio?", membros.nomes, default=def_pres)
+    vieram = set(presentes)
+    ausentes = [m for m in membros if m not in vieram]
+    motivos = {}
+    justif = cp2.multiselect("2️⃣ Quem justificou?", ausentes)
+    if justif:
+        cols = st.columns(3)
+        for i, m in enumerate(justif): motivos[m] = cols[i%3].text_input(m, placeholder="Motivo...")
+    return presentes, ausentes, motivos
 
-def gerar_docx(dados):
-    doc = Document()
-    style = doc.styles['Normal']
-    style.font.name = 'Arial'
-    style.font.size = Pt(12)
-    
-    texto = f"Ata nº {dados['num_ata']} da reunião ordinária da Conferência {dados['conf_nome']} da Sociedade de São Vicente de Paulo"
-    if eh_valido(dados['data_fundacao']): texto += f", fundada em {dados['data_fundacao']}"
-    if eh_valido(dados['data_agregacao']): texto += f", agregada em {dados['data_agregacao']}"
-    texto += f", vinculada ao Conselho Particular {dados['cons_particular']}, área do Central de {dados['cons_central']}, realizada às {dados['hora_inicio']} do dia {dados['data_reuniao']} do Ano Temático: {dados['ano_tematico']}, na sala de reuniões {dados['local']}."
-    
-    texto += f" Louvado seja nosso Senhor Jesus Cristo! A reunião foi iniciada pelo Presidente, {dados['pres_nome']}, com as orações regulamentares da Sociedade de São Vicente de Paulo."
-    texto += f" A leitura espiritual foi tirada do(a) {dados['leitura_fonte']}, proclamada por {dados['leitor_nome']}."
-    texto += f" A ata anterior foi lida e {dados['status_ata_ant']}."
-    texto += f" Em seguida foi feita a chamada, com a presença dos Confrades, Consócias e Aspirantes: {dados['lista_presentes_txt']}."
-    
-    if eh_valido(dados['lista_visitantes_txt']): texto += f" Presenças dos visitantes: {dados['lista_visitantes_txt']}."
-    
-    rec = formatar_valor_extenso(dados['receita'])
-    des = formatar_valor_extenso(dados['despesa'])
-    dec = formatar_valor_extenso(dados['decima'])
-    sal = formatar_valor_extenso(dados['saldo'])
-    tes = f"o(a) Tesoureiro(a) {dados['tes_nome']}" if eh_valido(dados['tes_nome']) else "o Tesoureiro"
-    texto += f" Movimento do Caixa: em seguida {tes} apresentou o estado do caixa: Receita total: {rec}; Despesa total: {des}; Décima semanal: {dec}; Saldo final: {sal}."
-    
-    if eh_valido(dados['lista_visitantes_txt']): texto += " Agradecimentos aos visitantes."
-    if eh_valido(dados['socioeconomico']): texto += f" Levantamento Socioeconômico: {dados['socioeconomico']}."
-    if eh_valido(dados['noticias_trabalhos']): texto += f" Notícias dos trabalhos da semana: {dados['noticias_trabalhos']}."
-    if eh_valido(dados['escala_visitas']): texto += f" Novas nomeações (escala de visitas): {dados['escala_visitas']}."
-    if eh_valido(dados['palavra_franca']): texto += f" Palavra franca: {dados['palavra_franca']}."
-    if eh_valido(dados['expediente']): texto += f" Expediente: {dados['expediente']}."
-    if eh_valido(dados['palavra_visitantes']): texto += f" Palavra dos Visitantes: {dados['palavra_visitantes']}."
-    
-    tes_col = f"o(a) tesoureiro(a) {dados['tes_nome']}" if eh_valido(dados['tes_nome']) else "o tesoureiro"
-    texto += f" Coleta Secreta: em seguida {tes_col} fez a coleta secreta, enquanto os demais cantavam {dados['musica_final']}."
-    texto += f" Nada mais havendo a tratar, a reunião foi encerrada com as orações finais regulamentares da Sociedade de São Vicente de Paulo, às {dados['hora_fim']}."
-    texto += f" Para constar, eu, {dados['secretario_nome']}, {dados['secretario_cargo']}, lavrei a presente ata, que dato e assino."
-    
-    p = doc.add_paragraph(texto)
-    p.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
-    pd = doc.add_paragraph(f"{dados['cidade_estado']}, {dados['data_reuniao']}.")
-    pd.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-    #doc.add_paragraph("\n\nAssinaturas dos Presentes:")
-    for _ in range(30): doc.add_paragraph("_"*85)
-    return doc
-
-def gerar_pdf_nativo(dados):
-    def limpar_texto(txt):
-        if not eh_valido(txt): return ""
-        s = str(txt)
-        s = s.replace('\u201c', '"').replace('\u201d', '"') 
-        s = s.replace('\u2018', "'").replace('\u2019', "'") 
-        s = s.replace('\u2013', '-').replace('\u2014', '-')
-        s = s.replace('\u2022', '*') # Bullets
-        
-        return s.encode('latin-1', 'replace').decode('latin-1')
+@secao
+def secao_tesouraria(config, dc, membros, num_ata):
+    """(receita, despesa, décima, saldo, tesoureiro)."""
+    st.divider()
+    st.subheader("Tesouraria")
+    cf1, cf2, cf3, cf4 = st.columns(4)
+
+    # Saldo da ata anterior a esta (vale também ao corrigir uma ata antiga)
+    saldo_ant = obter_saldo_anterior(num_ata)
+    st.caption(f"Saldo Anterior: R$ {saldo_ant:.2f}")
+
+    rec = cf1.number_input("Receita", value=float(dc.get('Receita', 0.0)), step=0.1)
+    des = cf2.number_input("Despesa", value=float(dc.get('Despesa', 0.0)), step=0.1)
+    dec = cf3.number_input("Décima", value=float(dc.get('Decima', 0.0)), step=0.1)
+    saldo = cf4.number_input("Saldo Final", value=saldo_ant+rec-des-dec, disabled=True)
+    tes_nome = cf4.selectbox("Tesoureiro", membros.nomes, index=get_index_membro(valor_carregado(dc, 'Tesoureiro', config.get('tes_padrao')), membros))
+    return rec, des, dec, saldo, tes_nome
+
+@secao
+def secao_abertura(config, dc, membros):
+    """(presidente, fonte da leitura, leitor, situação da ata anterior)."""
+    st.divider()
+    ce1, ce2, ce3 = st.columns(3)
+    pres_nome = ce1.selectbox("Presidente", membros.nomes, index=get_index_membro(dc.get('Presidente', config.get('pres_padrao')), membros))
+    font_l = ce2.text_input("Fonte Leitura", value=dc.get('Leitura',''))
+    leit_nome = ce3.selectbox("Leitor", membros.nomes, index=get_index_membro(valor_carregado(dc, 'Leitor'), membros))
+
+    st.divider()
+    status, _, ressalva = valor_carregado(dc, 'Status_Ata_Anterior').partition(": ")
+    st_ata = st.radio("ata Anterior", ["aprovada sem ressalvas", "aprovada com ressalvas"], index=int(status == "aprovada com ressalvas"))
+    txt_res = st.text_input("Detalhes da ressalva", ressalva) if st_ata == "aprovada com ressalvas" else ""
+    return pres_nome, font_l, leit_nome, f"{st_ata}: {txt_res}" if txt_res else st_ata
+
+@secao
+def secao_relatorios(dc):
+    """Textos da ata, na ordem: visitantes, socioeconômico, notícias, escala, palavra franca, expediente,
+    palavra dos visitantes, movimento extra, música e hora do fim."""
+    st.divider()
+    visit = st.text_area("Visitantes", value=dc.get('Visitantes',''))
+    st.markdown("### Relatórios")
+    socio = st.text_area("Socioeconômico", value=dc.get('Socioeconomico',''))
+    notic = st.text_area("Notícias", value=dc.get('Noticias',''))
+    escal = st.text_area("Escala", value=dc.get('Escala',''))
+    palav = st.text_area("Palavra Franca", value=dc.get('Palavra_Franca',''))
+    exped = st.text_area("Expediente", value=dc.get('Expediente',''))
+
+    st.divider()
+    ce1, ce2 = st.columns(2)
+    p_vis = ce1.text_input("Palavra Visitantes", valor_carregado(dc, 'Palavra_Visitantes'))
+    mov_ex = ce2.text_input("Mov. Extra", "Coleta regular")
+    ce3, ce4 = st.columns(2)
+    music = ce3.text_input("Música", valor_carregado(dc, 'Musica', "Hino de Ozanam"))
+    hr_fim = ce4.time_input("Fim", hora_carregada(dc, 'Hora_Fim', "now"))
+    return visit, socio, notic, escal, palav, exped, p_vis, mov_ex, music, hr_fim
+
+@secao
+def secao_assinatura(config, dc, membros):
+    """(nome do secretário, cargo)."""
+    st.divider()
+    st.markdown("##### ✍️ Assinatura")
+    cargos = ["1º Secretário(a)", "2º Secretário(a)"]
+    cargo = valor_carregado(dc, 'Cargo')
+    qa = st.radio("Secretário Hoje?", ["1º Secretário", "2º Secretário", "Outro"], horizontal=True,
+                  index=cargos.index(cargo) if cargo in cargos else 2 if cargo else 0)
+    if qa == "1º Secretário":
+        idx_s = get_index_membro(config.get('sec_padrao'), membros)
+        cg_fin = "1º Secretário(a)"
+    elif qa == "2º Secretário":
+        idx_s = get_index_membro(config.get('sec2_padrao'), membros)
+        cg_fin = "2º Secretário(a)"
+    else:
+        idx_s = get_index_membro(dc.get('Secretario',''), membros)
+        cg_fin = "Secretário(a) ad hoc"
+    return st.selectbox("Nome Secretário", membros.nomes, index=idx_s), cg_fin
 
-    pdf = PDF() 
-    pdf.alias_nb_pages()
-    pdf.add_page()
-    pdf.set_font("Arial", size=12)
-    pdf.set_margins(25, 25, 25)
-    
-    texto = f"Ata nº {dados['num_ata']} da reunião ordinária da Conferência {dados['conf_nome']} da Sociedade de São Vicente de Paulo"
-    if eh_valido(dados['data_fundacao']): texto += f", fundada em {dados['data_fundacao']}"
-    if eh_valido(dados['data_agregacao']): texto += f", agregada em {dados['data_agregacao']}"
-    texto += f", vinculada ao Conselho Particular {dados['cons_particular']}, área do Central de {dados['cons_central']}, realizada às {dados['hora_inicio']} do dia {dados['data_reuniao']} do Ano Temático: {dados['ano_tematico']}, na sala de reuniões {dados['local']}."
-    
-    texto += f" Louvado seja nosso Senhor Jesus Cristo! A reunião foi iniciada pelo Presidente, {dados['pres_nome']}, com as orações regulamentares da Sociedade de São Vicente de Paulo."
-    texto += f" A leitura espiritual foi tirada do(a) {dados['leitura_fonte']}, proclamada por {dados['leitor_nome']}"
-    texto += f" A ata anterior foi lida e {dados['status_ata_ant']}."
-    texto += f" Em seguida foi feita a chamada, com a presença dos Confrades, Consócias e Aspirantes: {dados['lista_presentes_txt']}."
-    
-    if eh_valido(dados['lista_visitantes_txt']): texto += f" Presenças dos visitantes: {dados['lista_visitantes_txt']}."
-    
-    rec = formatar_valor_extenso(dados['receita'])
-    des = formatar_valor_extenso(dados['despesa'])
-    dec = formatar_valor_extenso(dados['decima'])
-    sal = formatar_valor_extenso(dados['saldo'])
-    tes = f"o(a) Tesoureiro(a) {dados['tes_nome']}" if eh_valido(dados['tes_nome']) else "o Tesoureiro"
-    texto += f" Movimento do Caixa: em seguida {tes} apresentou o estado do caixa: Receita total: {rec}; Despesa total: {des}; Décima semanal: {dec}; Saldo final: {sal}."
-    
-    if eh_valido(dados['lista_visitantes_txt']): texto += " Agradecimentos aos visitantes."
-    if eh_valido(dados['socioeconomico']): texto += f" Levantamento Socioeconômico: {dados['socioeconomico']}."
-    if eh_valido(dados['noticias_trabalhos']): texto += f" Notícias dos trabalhos da semana: {dados['noticias_trabalhos']}."
-    if eh_valido(dados['escala_visitas']): texto += f" Novas nomeações (escala de visitas): {dados['escala_visitas']}."
-    if eh_valido(dados['palavra_franca']): texto += f" Palavra franca: {dados['palavra_franca']}."
-    if eh_valido(dados['expediente']): texto += f" Expediente: {dados['expediente']}."
-    if eh_valido(dados['palavra_visitantes']): texto += f" Palavra dos Visitantes: {dados['palavra_visitantes']}."
-    
-    tes_col = f"o(a) tesoureiro(a) {dados['tes_nome']}" if eh_valido(dados['tes_nome']) else "o tesoureiro"
-    texto += f" Coleta Secreta: em seguida {tes_col} fez a coleta secreta, enquanto os demais cantavam {dados['musica_final']}."
-    texto += f" Nada mais havendo a tratar, a reunião foi encerrada com as orações finais regulamentares da Sociedade de São Vicente de Paulo, às {dados['hora_fim']}."
-    texto += f" Para constar, eu, {dados['secretario_nome']}, {dados['secretario_cargo']}, lavrei a presente ata, que dato e assino."
-    
-    pdf.multi_cell(0, 7, texto, align="J")
-    pdf.ln(10)
-    pdf.cell(0, 10, f"{limpar_texto(dados['cidade_estado'])}, {limpar_texto(dados['data_reuniao'])}.", ln=True, align="R")
-    pdf.ln(10)
-    #pdf.cell(0, 10, "Assinaturas dos Presentes:", ln=True, align="L")
-    for _ in range(30): pdf.cell(0, 8, "_"*65, ln=True, align="C")
-    
-    try:
-        pdf_content = pdf.output(dest='S')
-        
-        if isinstance(pdf_content, str):
-            return pdf_content.encode('latin-1', 'replace')
-        
-        return bytes(pdf_content)
-        
-    except Exception as e:
-        print(f"Erro PDF: {e}")
-        return b"%PDF-1.4 erro_geracao"
 # ==============================================================================
 # 5. AUTENTICAÇÃO E UI
 # ==============================================================================
 
+def _chave_cookie():
+    try: return chave_cookie(st.secrets, ID_CONFERENCIA)
+    except Exception: return None
+
+CHAVE_COOKIE = _chave_cookie()
+if not CHAVE_COOKIE:
+    st.error("Defina cookie_chave (ou [cookie_chaves]) no arquivo .streamlit/secrets.toml.")
+    st.stop()
+
+# O login da sessão vale só para a conferência em que foi feito (trocar ?conferencia= pede outro)
+if st.session_state.get("conferencia_login") != ID_CONFERENCIA:
+    for chave in ("authentication_status", "username", "name"): st.session_state[chave] = None
+    st.session_state.conferencia_login = ID_CONFERENCIA
+
 credentials_dict = carregar_usuarios()
-authenticator = stauth.Authenticate(credentials_dict, "ssvp_cookie_seguro", "chave_secreta_2026", 30)
+authenticator = stauth.Authenticate(credentials_dict, f"ssvp_cookie_seguro_{ID_CONFERENCIA}", CHAVE_COOKIE, 30)
 name, authentication_status, username = authenticator.login("main")
 
 if authentication_status:
@@ -397,7 +498,10 @@ if authentication_status:
                         if ok: st.success(msg); time.sleep(1); st.rerun()
                         else: st.error(msg)
 
-    db = carregar_dados_cloud()
+            with st.expander("⏱️ Desempenho"): painel_desempenho()
+
+    db = carregar_dados_cloud(ID_CONFERENCIA)
+    membros = carregar_membros(ID_CONFERENCIA)
     if 'dados_carregados' not in st.session_state: st.session_state.dados_carregados = {}
     dc = st.session_state.dados_carregados
 
@@ -415,20 +519,78 @@ if authentication_status:
                 if d_old: st.session_state.dados_carregados = d_old; st.rerun()
                 else: st.error(msg)
 
+        with st.expander("🔎 Buscar nas Atas"):
+            termos = st.text_input("Palavras", placeholder="ex.: aluguel familia Conceição")
+            if termos:
+                try: resultados = obter_busca().buscar(termos)
+                except Exception as e: resultados = []; st.error(str(e))
+                if not resultados: st.caption("Nenhuma ata encontrada.")
+                for r in resultados:
+                    st.markdown(f"**Ata {r['numero']}** ({r['data']}): {r['trecho']}")
+                    if st.button("Abrir", key=f"abrir_busca_{r['numero']}"):
+                        d_old, debug_df, msg = buscar_ata_para_edicao(r['numero'])
+                        if d_old: st.session_state.dados_carregados = d_old; st.rerun()
+                        else: st.error(msg)
+
+        with st.expander("📦 Atas em Lote"):
+            modo_lote = st.radio("Selecionar por", ["Números", "Ano Temático"], horizontal=True)
+            if modo_lote == "Números":
+                cl1, cl2 = st.columns(2)
+                lote_ini = cl1.number_input("De", min_value=1, step=1, value=1)
+                lote_fim = cl2.number_input("Até", min_value=1, step=1, value=max(1, db['config']['ultima_ata']))
+                filtro_lote = {'inicio': lote_ini, 'fim': lote_fim}
+            else:
+                filtro_lote = {'ano': st.selectbox("Ano", db['anos'], key="ano_lote")}
+            formatos_lote = st.multiselect("Formatos", ["pdf", "docx"], default=["pdf"])
+            if st.button("Gerar ZIP") and formatos_lote:
+                df_lote = selecionar_atas(espelho.ler("Historico"), **filtro_lote)
+                if df_lote.empty: st.warning("Nenhuma ata encontrada.")
+                else:
+                    barra = st.progress(0.0, text=f"Gerando {len(df_lote)} atas...")
+                    fd, caminho_zip = tempfile.mkstemp(suffix=".zip"); os.close(fd)
+                    falhas_lote = []
+                    try:
+                        with metricas.medir("render", "zip_lote", atas=len(df_lote)):
+                            gerar_zip_lote(iterar_dados_ata(df_lote, db['config']), caminho_zip, formatos_lote,
+                                           progresso=lambda n: barra.progress(n / len(df_lote)), cache=cache_render, falhas=falhas_lote)
+                        with open(caminho_zip, "rb") as f: dados_zip = f.read()
+                    finally: os.remove(caminho_zip)
+                    if falhas_lote: st.warning("Ficaram fora do ZIP: " + "; ".join(f"ata {n} ({erro})" for n, erro in falhas_lote))
+                    st.download_button("⬇️ Baixar ZIP", dados_zip, "Atas.zip", "application/zip")
+
+        with st.expander("📚 Livro de Atas"):
+            ano_livro = st.selectbox("Ano Temático", db['anos'], key="ano_livro")
+            assinaturas_livro = st.checkbox("Incluir laudas de assinatura", value=True)
+            if st.button("Gerar Livro"):
+                df_livro = selecionar_atas(espelho.ler("Historico"), ano=ano_livro)
+                if df_livro.empty: st.warning("Nenhuma ata encontrada.")
+                else:
+                    barra = st.progress(0.0, text=f"Montando o livro com {len(df_livro)} atas...")
+                    fd, caminho_livro = tempfile.mkstemp(suffix=".pdf"); os.close(fd)
+                    try:
+                        with metricas.medir("render", "livro", atas=len(df_livro)):
+                            gerar_livro(iterar_dados_ata(df_livro, db['config']), caminho_livro, titulo="Livro de Atas",
+                                        subtitulo=f"Conferência {db['config'].get('nome_conf','')} - {ano_livro}",
+                                        assinaturas=assinaturas_livro, total=len(df_livro),
+                                        progresso=lambda n: barra.progress(n / len(df_livro)))
+                        with open(caminho_livro, "rb") as f: dados_livro = f.read()
+                    finally: os.remove(caminho_livro)
+                    st.download_button("⬇️ Baixar Livro", dados_livro, f"Livro_de_Atas_{ano_livro}.pdf", "application/pdf")
+
         with st.expander("👔 Cargos"):
-            cp = st.selectbox("Presidente", db['membros'], index=get_index_membro(db['config'].get('pres_padrao'), db['membros']))
+            cp = st.selectbox("Presidente", membros.nomes, index=get_index_membro(db['config'].get('pres_padrao'), membros))
             st.divider()
-            cs1 = st.selectbox("1º Sec.", db['membros'], index=get_index_membro(db['config'].get('sec_padrao'), db['membros']))
+            cs1 = st.selectbox("1º Sec.", membros.nomes, index=get_index_membro(db['config'].get('sec_padrao'), membros))
             csc1 = st.text_input("Cargo 1", db['config'].get('sec_cargo_padrao',''))
             st.divider()
-            cs2 = st.selectbox("2º Sec.", db['membros'], index=get_index_membro(db['config'].get('sec2_padrao'), db['membros']))
+            cs2 = st.selectbox("2º Sec.", membros.nomes, index=get_index_membro(db['config'].get('sec2_padrao'), membros))
             csc2 = st.text_input("Cargo 2", db['config'].get('sec2_cargo_padrao',''))
             st.divider()
-            ct = st.selectbox("Tesoureiro", db['membros'], index=get_index_membro(db['config'].get('tes_padrao'), db['membros']))
+            ct = st.selectbox("Tesoureiro", membros.nomes, index=get_index_membro(db['config'].get('tes_padrao'), membros))
             
             if st.button("Salvar Cargos"):
                 mudancas = {'pres_padrao':cp, 'sec_padrao':cs1, 'sec_cargo_padrao':csc1, 'sec2_padrao':cs2, 'sec2_cargo_padrao':csc2, 'tes_padrao':ct}
-                salvar_lote_configs(mudancas); st.rerun()
+                salvar_lote_configs(mudancas, db['config']); st.rerun()
 
         with st.expander("🏢 Configs"):
             cn = st.text_input("Nome", db['config'].get('nome_conf',''))
@@ -443,20 +605,40 @@ if authentication_status:
             if st.button("Salvar Configs"):
                 mudancas = {'nome_conf':cn, 'horario_padrao':ch, 'local_padrao':cl, 'cidade_padrao':cc, 
                             'cons_particular':cpar, 'cons_central':ccen, 'data_fundacao':dfu, 'data_agregacao':dag}
-                salvar_lote_configs(mudancas); st.rerun()
+                salvar_lote_configs(mudancas, db['config']); st.rerun()
                 
         with st.expander("👥 Membros"):
             nm = st.text_input("Novo Membro")
             if st.button("Add"): gerenciar_lista_cloud("Membros","Nome",nm,"adicionar"); st.rerun()
-            rm = st.selectbox("Remover", ["..."]+db['membros'])
+            rm = st.selectbox("Remover", ["..."]+membros.nomes)
             if st.button("Del") and rm != "...": gerenciar_lista_cloud("Membros","Nome",rm,"remover"); st.rerun()
-
-        if st.button("Forçar Atualização"): limpar_memoria(); st.rerun()
+            st.divider()
+            st.caption("Importar em lote: cole um nome por linha ou envie um CSV (coluna 'Nome').")
+            texto_membros = st.text_area("Lista de membros", key="lista_membros")
+            csv_membros = st.file_uploader("CSV", type=["csv", "txt"], key="csv_membros")
+            if csv_membros is not None: texto_membros = csv_membros.getvalue().decode("utf-8-sig", errors="replace")
+            substituir = st.checkbox("Remover quem não está na lista", key="substituir_membros")
+            nomes_lista = interpretar_lista(texto_membros)
+            if nomes_lista:
+                novos_m, removidos_m = diferenca(membros.nomes, nomes_lista, substituir)
+                if novos_m: st.caption(f"➕ {len(novos_m)}: {', '.join(novos_m)}")
+                if removidos_m: st.caption(f"➖ {len(removidos_m)}: {', '.join(removidos_m)}")
+                if not (novos_m or removidos_m): st.caption("Nada a mudar.")
+                elif st.button("Aplicar importação"):
+                    ok, msg = importar_membros(novos_m, removidos_m)
+                    if ok: st.session_state.pop("lista_membros", None); st.toast(msg); st.rerun()
+                    else: st.error(msg)
+
+        if st.button("Forçar Atualização"): espelho.sincronizar(forcar=True); limpar_memoria(); st.rerun()
 
     # === UI PRINCIPAL ===
     st.title("Gerador de Ata Sociedade de São Vicente de Paulo ✝️")
+
+    secao_frequencia(membros)
+    secao_financeiro()
     
-    val_num = int(dc.get('Numero', db['config']['ultima_ata'] + 1))
+    col_num = obter_indice_atas().col_num or 'Numero'  # a linha carregada vem com o cabeçalho da planilha (Número, Nº...)
+    val_num = int(float(dc.get(col_num, max(db['config']['ultima_ata'] + 1, obter_proximo_numero()))))
     val_data = data_pad
     if 'Data' in dc:
         try: val_data = datetime.strptime(dc['Data'], '%d/%m/%Y').date()
@@ -464,90 +646,24 @@ if authentication_status:
 
     c1, c2, c3 = st.columns(3)
     num_ata = c1.number_input("Número", value=val_num, step=1)
-    if dc: st.caption(f"✏️ Editando Ata {val_num}")
+    if dc: c1.caption(f"✏️ Editando Ata {val_num}")
+    elif int(num_ata) < val_num and obter_indice_atas().posicao(int(num_ata)) is not None:
+        c1.caption(f"⚠️ A ata {int(num_ata)} já existe: carregue-a em 'Corrigir Ata' para corrigir. Salvar agora cria a ata nº {val_num}.")
     
     ia = db['anos'].index(dc['Ano']) if 'Ano' in dc and dc['Ano'] in db['anos'] else 0
     ano_tem = c2.selectbox("Ano Temático", db['anos'], index=ia)
     dt_reuniao = c3.date_input("Data", val_data, format="DD/MM/YYYY")
 
-    with st.expander("📍 Detalhes da Reunião", expanded=False):
-        cx1, cx2, cx3 = st.columns(3)
-        hr_ini = cx1.time_input("Início", hora_pad)
-        local_r = cx2.text_input("Local", db['config'].get('local_padrao',''))
-        cidade_r = cx3.text_input("Cidade", db['config'].get('cidade_padrao',''))
-
-    st.divider()
-    st.subheader("Chamada")
-    cp1, cp2 = st.columns(2)
-    def_pres = [p.strip() for p in dc.get('Presentes','').split(',') if p.strip() in db['membros']]
-    presentes = cp1.multiselect("1️⃣ Quem veio?", db['membros'], default=def_pres)
-    ausentes = [m for m in db['membros'] if m not in presentes]
-    motivos = {}
-    justif = cp2.multiselect("2️⃣ Quem justificou?", ausentes)
-    if justif:
-        cols = st.columns(3)
-        for i, m in enumerate(justif): motivos[m] = cols[i%3].text_input(m, placeholder="Motivo...")
-
-    st.divider()
-    st.subheader("Tesouraria")
-    cf1, cf2, cf3, cf4 = st.columns(4)
-    
-    # Cache do saldo para não quebrar API
-    if 'saldo_cache' not in st.session_state: st.session_state.saldo_cache = obter_saldo_anterior()
-    saldo_ant = st.session_state.saldo_cache
-    st.caption(f"Saldo Anterior: R$ {saldo_ant:.2f}")
-
-    rec = cf1.number_input("Receita", value=float(dc.get('Receita', 0.0)), step=0.1)
-    des = cf2.number_input("Despesa", value=float(dc.get('Despesa', 0.0)), step=0.1)
-    dec = cf3.number_input("Décima", value=float(dc.get('Decima', 0.0)), step=0.1)
-    saldo = cf4.number_input("Saldo Final", value=saldo_ant+rec-des-dec, disabled=True)
-    tes_nome = cf4.selectbox("Tesoureiro", db['membros'], index=get_index_membro(db['config'].get('tes_padrao'), db['membros']))
-
-    st.divider()
-    ce1, ce2, ce3 = st.columns(3)
-    pres_nome = ce1.selectbox("Presidente", db['membros'], index=get_index_membro(dc.get('Presidente', db['config'].get('pres_padrao')), db['membros']))
-    font_l = ce2.text_input("Fonte Leitura", value=dc.get('Leitura',''))
-    leit_nome = ce3.selectbox("Leitor", db['membros'])
-
-    st.divider()
-    st_ata = st.radio("ata Anterior", ["aprovada sem ressalvas", "aprovada com ressalvas"])
-    txt_res = st.text_input("Detalhes da ressalva") if st_ata == "aprovada com ressalvas" else ""
-    
-    st.divider()
-    visit = st.text_area("Visitantes", value=dc.get('Visitantes',''))
-    st.markdown("### Relatórios")
-    socio = st.text_area("Socioeconômico", value=dc.get('Socioeconomico',''))
-    notic = st.text_area("Notícias", value=dc.get('Noticias',''))
-    escal = st.text_area("Escala", value=dc.get('Escala',''))
-    palav = st.text_area("Palavra Franca", value=dc.get('Palavra_Franca',''))
-    exped = st.text_area("Expediente", value=dc.get('Expediente',''))
-    
-    st.divider()
-    ce1, ce2 = st.columns(2)
-    p_vis = ce1.text_input("Palavra Visitantes", "")
-    mov_ex = ce2.text_input("Mov. Extra", "Coleta regular")
-    ce3, ce4 = st.columns(2)
-    music = ce3.text_input("Música", "Hino de Ozanam")
-    hr_fim = ce4.time_input("Fim")
-
-    st.divider()
-    st.markdown("##### ✍️ Assinatura")
-    qa = st.radio("Secretário Hoje?", ["1º Secretário", "2º Secretário", "Outro"], horizontal=True)
-    if qa == "1º Secretário":
-        idx_s = get_index_membro(db['config'].get('sec_padrao'), db['membros'])
-        cg_fin = "1º Secretário(a)"
-    elif qa == "2º Secretário":
-        idx_s = get_index_membro(db['config'].get('sec2_padrao'), db['membros'])
-        cg_fin = "2º Secretário(a)"
-    else:
-        idx_s = get_index_membro(dc.get('Secretario',''), db['membros'])
-        cg_fin = "Secretário(a) ad hoc"
-    sec_nom = st.selectbox("Nome Secretário", db['membros'], index=idx_s)
+    hr_ini, local_r, cidade_r = secao_detalhes(db['config'], dc, hora_pad)
+    presentes, ausentes, motivos = secao_chamada(dc, membros)
+    rec, des, dec, saldo, tes_nome = secao_tesouraria(db['config'], dc, membros, int(num_ata))
+    pres_nome, font_l, leit_nome, st_fin = secao_abertura(db['config'], dc, membros)
+    visit, socio, notic, escal, palav, exped, p_vis, mov_ex, music, hr_fim = secao_relatorios(dc)
+    sec_nom, cg_fin = secao_assinatura(db['config'], dc, membros)
 
     st.divider()
     if st.button("💾 Gerar/Salvar Ata", type="primary"):
         ls_aus = [f"{m} ({motivos.get(m,'').strip() or 'Justificado'})" if m in motivos else m for m in ausentes]
-        st_fin = f"{st_ata}: {txt_res}" if txt_res else st_ata
         
         dados_ata = {
             'num_ata': str(num_ata), 'conf_nome': db['config'].get('nome_conf',''),
@@ -567,20 +683,12 @@ if authentication_status:
             'secretario_nome': sec_nom, 'secretario_cargo': cg_fin, 'cidade_estado': cidade_r
         }
         
-        with st.spinner("Salvando..."):
-            ok, tipo = salvar_historico_cloud(dados_ata)
-            if ok:
-                st.toast(f"✅ Ata {num_ata} salva!"); st.session_state.dados_carregados = {}
-                if tipo=="criada" and int(num_ata) > db['config']['ultima_ata']:
-                    salvar_lote_configs({'ultima_ata': int(num_ata)})
-        
-        doc = gerar_docx(dados_ata)
-        bio = io.BytesIO(); doc.save(bio)
-        pdf_bytes = gerar_pdf_nativo(dados_ata)
-        
-        c1, c2 = st.columns(2)
-        c1.download_button("📄 Gerar PDF", pdf_bytes, f"Ata_{num_ata}.pdf", "application/pdf", type="primary")
-        c2.download_button("📝 Gerar documento Word", bio.getvalue(), f"Ata_{num_ata}.docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document")
+        corrigindo = dc and normalizar_numero(dc.get(col_num, '')) == str(num_ata)
+        iniciar_tarefa_ata(dados_ata, db['config']['ultima_ata'], dc if corrigindo else None)
+
+    painel_tarefa_ata()
 
 elif authentication_status == False: st.error("Login incorreto")
-elif authentication_status == None: st.warning("Faça login")
\ No newline at end of file
+elif authentication_status == None: st.warning("Faça login")
+
+st.session_state.metricas.encerrar_rerun()
\ No newline at end of file
@@ -0,0 +1 @@
+"""Camada de dados e utilitários do Gerador de Ata SSVP, independentes da interface Streamlit."""
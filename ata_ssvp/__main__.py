@@ -0,0 +1,6 @@
+import sys
+
+from ata_ssvp.cli import main
+
+if __name__ == "__main__":  # os processos do lote (spawn) reimportam este módulo
+    sys.exit(main())
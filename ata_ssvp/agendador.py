@@ -0,0 +1,102 @@
+"""
+Agendador das chamadas à API do Google Sheets.
+
+Toda leitura e escrita passa por um balde de fichas do tamanho da cota (60 requisições
+por minuto por usuário, separadas para leitura e escrita), com nova tentativa em espera
+exponencial com variação aleatória nos erros transitórios (429/5xx). Leituras iguais em
+andamento ao mesmo tempo são feitas uma vez só e o resultado é compartilhado. Cada chamada
+(com as esperas e novas tentativas) é registrada em ``metricas``.
+"""
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+from ata_ssvp import metricas
+
+CODIGOS_TRANSITORIOS = (429, 500, 502, 503, 504)
+
+
+def eh_transitorio(erro):
+    """Erros que valem uma nova tentativa: cota estourada ou falha temporária do Google."""
+    codigo = getattr(getattr(erro, "response", None), "status_code", None)
+    if codigo in CODIGOS_TRANSITORIOS: return True
+    texto = str(erro)
+    return "429" in texto or "Quota" in texto or "RATE_LIMIT" in texto
+
+
+class BaldeFichas:
+    """
+    Balde de fichas: ``capacidade`` de rajada e reposição contínua de ``por_minuto`` fichas.
+    Com capacidade c e taxa r, uma janela de 60 s nunca passa de c + 60·r requisições.
+    """
+    def __init__(self, cota_por_minuto):
+        self.capacidade = max(1, cota_por_minuto // 10)
+        self.por_segundo = (cota_por_minuto - self.capacidade) / 60.0
+        self._fichas = float(self.capacidade)
+        self._ultimo = time.monotonic()
+        self._trava = threading.Lock()
+
+    def retirar(self):
+        """Bloqueia até haver uma ficha e a consome."""
+        while True:
+            with self._trava:
+                agora = time.monotonic()
+                self._fichas = min(self.capacidade, self._fichas + (agora - self._ultimo) * self.por_segundo)
+                self._ultimo = agora
+                if self._fichas >= 1:
+                    self._fichas -= 1
+                    return
+                espera = (1 - self._fichas) / self.por_segundo
+            time.sleep(espera)
+
+
+class Agendador:
+    def __init__(self, leituras_por_minuto=60, escritas_por_minuto=60, max_tentativas=5, espera_base=1.0, espera_max=32.0):
+        self._baldes = {"leitura": BaldeFichas(leituras_por_minuto), "escrita": BaldeFichas(escritas_por_minuto)}
+        self.max_tentativas = max_tentativas
+        self.espera_base = espera_base
+        self.espera_max = espera_max
+        self._em_andamento = {}
+        self._trava = threading.Lock()
+
+    def _executar(self, tipo, funcao, nome, dados=None):
+        with metricas.medir("api", nome, operacao=tipo, tentativas=0) as campos:
+            for tentativa in range(1, self.max_tentativas + 1):
+                campos["tentativas"] = tentativa
+                self._baldes[tipo].retirar()
+                try:
+                    resultado = funcao()
+                    campos["bytes"] = metricas.tamanho(dados if tipo == "escrita" else resultado)
+                    return resultado
+                except Exception as e:
+                    if not eh_transitorio(e) or tentativa == self.max_tentativas: raise
+                    espera = min(self.espera_max, self.espera_base * 2 ** (tentativa - 1))
+                    time.sleep(espera * random.uniform(0.5, 1.5))
+
+    def ler(self, chave, funcao, nome=None):
+        """
+        Executa a leitura ``funcao``; quem pedir a mesma ``chave`` enquanto ela roda recebe o mesmo
+        resultado. ``nome`` identifica a chamada nas medições (padrão: a chave ou o 1º item dela).
+        """
+        nome = nome or (chave if isinstance(chave, str) else chave[0])
+        with self._trava:
+            futuro = self._em_andamento.get(chave)
+            dono = futuro is None
+            if dono: futuro = self._em_andamento[chave] = Future()
+        if not dono:
+            with metricas.medir("api", nome, operacao="leitura", acerto=True):
+                return futuro.result()  # acerto: carona numa leitura igual em andamento
+        try:
+            resultado = self._executar("leitura", funcao, nome)
+            futuro.set_result(resultado)
+            return resultado
+        except Exception as e:
+            futuro.set_exception(e)
+            raise
+        finally:
+            with self._trava: self._em_andamento.pop(chave, None)
+
+    def escrever(self, funcao, nome="escrita", dados=None):
+        """Executa a escrita ``funcao``; ``dados`` (o que é enviado) só serve para medir os bytes."""
+        return self._executar("escrita", funcao, nome, dados)
@@ -0,0 +1,89 @@
+"""
+Busca de texto nas atas do Historico.
+
+Índice invertido (SQLite FTS5) sobre os campos de texto livre, sem distinção de acentos
+nem de maiúsculas, guardado em disco ao lado do espelho. Cada gravação de ata atualiza só
+a linha dela; o índice inteiro só é refeito (a partir do espelho local, nunca da planilha)
+quando o Historico muda por fora.
+"""
+import re
+import sqlite3
+import threading
+
+from ata_ssvp.indice import normalizar_numero
+from ata_ssvp.linhas import coluna_numero, texto
+
+CAMPOS_BUSCA = ("Noticias", "Socioeconomico", "Palavra_Franca", "Presentes", "Visitantes")
+
+
+def montar_consulta(termos):
+    """Texto digitado -> consulta FTS5: todas as palavras, cada uma também como prefixo."""
+    palavras = re.findall(r"\w+", termos)
+    return " ".join(f'"{p}"*' for p in palavras)
+
+
+class BuscaAtas:
+    def __init__(self, caminho):
+        self._db = sqlite3.connect(caminho, check_same_thread=False)
+        colunas = ", ".join(CAMPOS_BUSCA)
+        self._db.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS atas USING fts5(numero UNINDEXED, data UNINDEXED, {colunas}, "
+                         "tokenize = 'unicode61 remove_diacritics 2')")
+        self._db.execute("CREATE TABLE IF NOT EXISTS _meta (chave TEXT PRIMARY KEY, valor TEXT)")
+        self._db.commit()
+        self._trava = threading.Lock()
+
+    @classmethod
+    def do_espelho(cls, caminho, espelho, aba="Historico"):
+        """Abre o índice em disco e só o refaz se ele não corresponder à versão atual do espelho."""
+        busca = cls(caminho)
+        versao = espelho.versao(aba)
+        if busca.versao != repr(versao): busca.reconstruir(espelho.ler(aba), versao)
+        return busca
+
+    @property
+    def versao(self):
+        with self._trava:
+            linha = self._db.execute("SELECT valor FROM _meta WHERE chave = 'versao'").fetchone()
+        return linha[0] if linha else None
+
+    def _marcar_versao(self, versao):
+        self._db.execute("INSERT OR REPLACE INTO _meta VALUES ('versao', ?)", (repr(versao),))
+
+    def _inserir(self, numero, linha):
+        valores = [texto(linha.get(c)) for c in CAMPOS_BUSCA]
+        self._db.execute(f"INSERT INTO atas VALUES (?, ?{', ?' * len(CAMPOS_BUSCA)})",
+                         [numero, texto(linha.get("Data"))] + valores)
+
+    def reconstruir(self, df_hist, versao):
+        df = df_hist.set_axis([str(c).strip() for c in df_hist.columns], axis=1)
+        col_num = coluna_numero(df.columns)
+        with self._trava:
+            self._db.execute("DELETE FROM atas")
+            if col_num is not None:
+                vistos = set()
+                for linha in df.to_dict("records"):
+                    numero = normalizar_numero(linha[col_num])
+                    if numero in vistos: continue  # número repetido: vale a primeira linha, como no índice
+                    vistos.add(numero)
+                    self._inserir(numero, linha)
+            self._marcar_versao(versao)
+            self._db.commit()
+
+    def registrar(self, numero, linha, versao):
+        """Atualiza só a ata ``numero`` (``linha``: {coluna: valor}) e grava a nova versão do espelho."""
+        numero = normalizar_numero(numero)
+        with self._trava:
+            self._db.execute("DELETE FROM atas WHERE numero = ?", (numero,))
+            self._inserir(numero, linha)
+            self._marcar_versao(versao)
+            self._db.commit()
+
+    def buscar(self, termos, limite=20):
+        """Atas mais relevantes para ``termos``: [{numero, data, trecho}], com os termos em **negrito** no trecho."""
+        consulta = montar_consulta(termos)
+        if not consulta: return []
+        with self._trava:
+            linhas = self._db.execute(
+                "SELECT numero, data, snippet(atas, -1, '**', '**', '…', 16) FROM atas WHERE atas MATCH ? "
+                "ORDER BY bm25(atas) LIMIT ?", (consulta, limite)).fetchall()
+        return [{"numero": n, "data": d, "trecho": t} for n, d, t in linhas]
@@ -0,0 +1,115 @@
+"""
+Cache endereçado por conteúdo dos documentos gerados.
+
+A chave é o hash dos ``dados_ata`` normalizados, da versão do modelo/layout e dos formatos,
+então um único cache pode servir várias conferências. A primeira camada é um LRU em
+memória, limitado em itens e em bytes; a segunda, opcional, é uma pasta em disco com
+limite de tamanho, que descarta os arquivos usados há mais tempo.
+"""
+import hashlib
+import json
+import math
+import os
+import threading
+from collections import OrderedDict
+
+from ata_ssvp import metricas
+from ata_ssvp.documentos import FORMATOS, VERSAO_LAYOUT, renderizar_ata
+from ata_ssvp.modelo import TRECHOS_ATA
+
+VERSAO = hashlib.sha256(repr((TRECHOS_ATA, VERSAO_LAYOUT)).encode("utf-8")).hexdigest()[:12]
+
+
+def _normalizar(valor):
+    if hasattr(valor, "item"): valor = valor.item()
+    if valor is None or (isinstance(valor, float) and math.isnan(valor)): return ""
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool): return round(float(valor), 2)
+    return str(valor)
+
+def chave_dados(dados, formatos=FORMATOS):
+    """Hash estável dos dados da ata: mesmo conteúdo, mesma chave (independe da ordem e de 10 vs 10.0)."""
+    normalizado = {k: _normalizar(v) for k, v in dados.items()}
+    bruto = json.dumps([VERSAO, sorted(formatos), normalizado], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(bruto.encode("utf-8")).hexdigest()
+
+
+class CacheRender:
+    def __init__(self, max_itens=64, pasta=None, max_bytes_disco=200 * 1024 * 1024, max_bytes_memoria=None):
+        self.max_itens = max_itens
+        self.max_bytes_memoria = max_bytes_memoria
+        self.pasta = pasta
+        self.max_bytes_disco = max_bytes_disco
+        self._memoria = OrderedDict()
+        self._bytes_memoria = 0
+        self._trava = threading.Lock()
+        if pasta: os.makedirs(pasta, exist_ok=True)
+
+    def _caminho(self, chave, ext):
+        return os.path.join(self.pasta, f"{chave}.{ext}")
+
+    def obter(self, chave, formatos=FORMATOS):
+        """Devolve {extensão: bytes} ou None. Acertos no disco sobem para a memória."""
+        with self._trava:
+            if chave in self._memoria:
+                self._memoria.move_to_end(chave)
+                return self._memoria[chave]
+        if not self.pasta: return None
+        arquivos = {}
+        try:
+            for ext in formatos:
+                caminho = self._caminho(chave, ext)
+                with open(caminho, "rb") as f: arquivos[ext] = f.read()
+                os.utime(caminho)  # marca como usado recentemente para a política de descarte
+        except OSError: return None
+        self._guardar_memoria(chave, arquivos)
+        return arquivos
+
+    def guardar(self, chave, arquivos):
+        self._guardar_memoria(chave, arquivos)
+        if not self.pasta: return
+        for ext, conteudo in arquivos.items():
+            temporario = self._caminho(chave, ext) + ".tmp"
+            with open(temporario, "wb") as f: f.write(conteudo)
+            os.replace(temporario, self._caminho(chave, ext))
+        self._descartar_disco()
+
+    def _guardar_memoria(self, chave, arquivos):
+        tamanho = sum(len(b) for b in arquivos.values())
+        with self._trava:
+            anterior = self._memoria.pop(chave, None)
+            if anterior is not None: self._bytes_memoria -= sum(len(b) for b in anterior.values())
+            self._memoria[chave] = arquivos
+            self._bytes_memoria += tamanho
+            # O item recém-guardado sempre fica, mesmo que sozinho passe do limite de bytes
+            while len(self._memoria) > 1 and (len(self._memoria) > self.max_itens or
+                    (self.max_bytes_memoria is not None and self._bytes_memoria > self.max_bytes_memoria)):
+                _, descartado = self._memoria.popitem(last=False)
+                self._bytes_memoria -= sum(len(b) for b in descartado.values())
+
+    @property
+    def bytes_memoria(self):
+        with self._trava: return self._bytes_memoria
+
+    def _descartar_disco(self):
+        """Apaga os arquivos menos usados até caber no limite."""
+        try:
+            entradas = [e for e in os.scandir(self.pasta) if e.is_file() and not e.name.endswith(".tmp")]
+        except OSError: return
+        stats = sorted(((e.stat().st_mtime, e.stat().st_size, e.path) for e in entradas))
+        total = sum(tamanho for _, tamanho, _ in stats)
+        for _, tamanho, caminho in stats:
+            if total <= self.max_bytes_disco: break
+            try: os.remove(caminho); total -= tamanho
+            except OSError: pass
+
+    def renderizar(self, dados, formatos=FORMATOS):
+        """Documentos da ata: do cache se o conteúdo já foi renderizado, senão renderiza e guarda."""
+        chave = chave_dados(dados, formatos)
+        with metricas.medir("cache", "documentos") as campos:
+            arquivos = self.obter(chave, formatos)
+            campos["acerto"] = arquivos is not None
+            if arquivos is None:
+                _, arquivos = renderizar_ata(dados, formatos)
+                self.guardar(chave, arquivos)
+            campos["bytes"] = sum(len(b) for b in arquivos.values())
+        return arquivos
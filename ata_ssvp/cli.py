@@ -0,0 +1,119 @@
+"""
+Linha de comando: renderiza atas a partir de uma exportação do Historico, sem Streamlit nem planilha.
+
+    python -m ata_ssvp Historico.csv --config Config.csv --de 10 --ate 20 --saida atas.zip
+    python -m ata_ssvp historico.json --ano "Ano Temático 2026" --formatos pdf --saida pasta/
+    python -m ata_ssvp Historico.csv --ano "Ano Temático 2026" --saida livro.pdf --sem-assinaturas
+
+O Historico pode ser um CSV (baixado do Google Sheets) ou um JSON com a lista de linhas ou
+{"Historico": [...], "Config": {...}}. A Config (nome da conferência, conselhos, local...)
+vem de ``--config`` (CSV Chave/Valor ou JSON) ou da chave "Config" do JSON. Só o que a
+renderização precisa é importado, e só quando precisa.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from ata_ssvp.documentos import FORMATOS
+
+COLUNAS_VALORES = ("Receita", "Despesa", "Decima", "Saldo")
+
+
+def _numero_br(valor):
+    """'1.234,50' -> '1234.50' (planilhas em pt-BR exportam vírgula decimal); o resto fica como está."""
+    texto = str(valor).replace("R$", "").strip()
+    if "," in texto: texto = texto.replace(".", "").replace(",", ".")
+    return texto
+
+def _ler_json(caminho):
+    with open(caminho, encoding="utf-8-sig") as f: return json.load(f)
+
+def _config_de(bruto):
+    """Config em JSON ({chave: valor} ou [[chave, valor], ...]) ou DataFrame Chave/Valor -> dicionário."""
+    from ata_ssvp.dados import montar_config
+    if hasattr(bruto, "columns"): return montar_config(bruto)
+    if isinstance(bruto, list): bruto = dict(bruto)
+    config = dict(bruto or {})
+    try: config['ultima_ata'] = int(config.get('ultima_ata', 0))
+    except (TypeError, ValueError): config['ultima_ata'] = 0
+    return config
+
+def carregar_exportacao(caminho, caminho_config=None):
+    """(DataFrame do Historico, dicionário da Config) a partir dos arquivos exportados."""
+    import pandas as pd
+    config = {}
+    if caminho.lower().endswith(".json"):
+        bruto = _ler_json(caminho)
+        if isinstance(bruto, dict):
+            config = _config_de(bruto.get("Config"))
+            bruto = bruto.get("Historico", [])
+        df = pd.DataFrame(bruto)
+    else:
+        df = pd.read_csv(caminho, sep=None, engine="python", dtype=str, keep_default_na=False, encoding="utf-8-sig")
+    df.columns = [str(c).strip() for c in df.columns]
+    for coluna in COLUNAS_VALORES:
+        if coluna in df.columns: df[coluna] = df[coluna].map(_numero_br)
+    if caminho_config:
+        if caminho_config.lower().endswith(".json"): config = _config_de(_ler_json(caminho_config))
+        else: config = _config_de(pd.read_csv(caminho_config, sep=None, engine="python", dtype=str,
+                                              keep_default_na=False, encoding="utf-8-sig"))
+    return df, config
+
+def renderizar_em_pasta(lista_dados, pasta, formatos=FORMATOS, progresso=None, falhas=None):
+    """
+    Renderiza uma ata de cada vez neste processo, gravando Ata_<n>.<ext> em ``pasta``.
+    Uma ata que falha é pulada (e vai para ``falhas``, como em ``gerar_zip_lote``). Retorna o total gravado.
+    """
+    from ata_ssvp.documentos import renderizar_ata
+    os.makedirs(pasta, exist_ok=True)
+    total, processadas = 0, 0
+    for dados in lista_dados:
+        processadas += 1
+        try: num, arquivos = renderizar_ata(dados, tuple(formatos))
+        except Exception as e:
+            if falhas is not None: falhas.append((dados['num_ata'], f"{type(e).__name__}: {e}"))
+            arquivos = None
+        if arquivos is not None:
+            for ext, conteudo in arquivos.items():
+                with open(os.path.join(pasta, f"Ata_{num}.{ext}"), "wb") as f: f.write(conteudo)
+            total += 1
+        if progresso: progresso(processadas)
+    return total
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ata_ssvp", description="Renderiza atas a partir de uma exportação do Historico.")
+    parser.add_argument("historico", help="Historico exportado (.csv ou .json)")
+    parser.add_argument("--config", help="Config exportada (.csv com Chave/Valor ou .json)")
+    parser.add_argument("--de", type=int, help="primeira ata (número)")
+    parser.add_argument("--ate", type=int, help="última ata (número)")
+    parser.add_argument("--ano", help="só as atas deste Ano Temático")
+    parser.add_argument("--formatos", nargs="+", choices=FORMATOS, default=list(FORMATOS))
+    parser.add_argument("--saida", default="Atas.zip", help="arquivo .zip (renderiza em vários processos), .pdf (Livro de Atas) ou pasta")
+    parser.add_argument("--processos", type=int, help="processos para o .zip (padrão: um por núcleo)")
+    parser.add_argument("--titulo", default="Livro de Atas", help="título da capa do livro (.pdf)")
+    parser.add_argument("--sem-assinaturas", action="store_true", help="no livro, omite as laudas de assinatura")
+    args = parser.parse_args(argv)
+
+    from ata_ssvp.lote import gerar_zip_lote, iterar_dados_ata, selecionar_atas
+    inicio = time.perf_counter()
+    df, config = carregar_exportacao(args.historico, args.config)
+    df = selecionar_atas(df, inicio=args.de, fim=args.ate, ano=args.ano)
+    if df.empty:
+        print("Nenhuma ata encontrada.", file=sys.stderr)
+        return 1
+    progresso = lambda n: print(f"\r{n}/{len(df)}", end="", file=sys.stderr, flush=True)
+    falhas = []
+    if args.saida.lower().endswith(".pdf"):
+        from ata_ssvp.livro import gerar_livro
+        subtitulo = " - ".join(str(v) for v in (config.get('nome_conf'), args.ano) if v)
+        total = gerar_livro(iterar_dados_ata(df, config), args.saida, args.titulo, subtitulo,
+                            assinaturas=not args.sem_assinaturas, total=len(df), progresso=progresso)
+    elif args.saida.lower().endswith(".zip"):
+        total = gerar_zip_lote(iterar_dados_ata(df, config), args.saida, args.formatos, processos=args.processos, progresso=progresso, falhas=falhas)
+    else:
+        total = renderizar_em_pasta(iterar_dados_ata(df, config), args.saida, args.formatos, progresso=progresso, falhas=falhas)
+    print(f"\n{total} atas em {args.saida} ({time.perf_counter() - inicio:.1f} s)", file=sys.stderr)
+    for num, erro in falhas: print(f"Ata {num} não foi gerada: {erro}", file=sys.stderr)
+    return 1 if falhas else 0
@@ -0,0 +1,109 @@
+"""
+Várias conferências num mesmo processo.
+
+Cada conferência aponta para a sua planilha; todas usam a mesma conexão de conta de serviço
+(e o mesmo ``Agendador``, já que a cota do Google é da conta, não da planilha). O estado
+residente de cada uma — espelho, credenciais e atas (com as estruturas do Historico) — fica num pool LRU:
+acima de ``max_residentes`` a conferência usada há mais tempo é descarregada da memória
+(o espelho em disco continua lá para a próxima vez).
+"""
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from ata_ssvp.agendador import Agendador
+from ata_ssvp.credenciais import CredenciaisCache
+from ata_ssvp.espelho import ABAS, EspelhoLocal
+from ata_ssvp.historico import HistoricoAtas
+
+PADRAO = "padrao"
+
+
+class _ClienteConferencia:
+    def __init__(self, cliente, planilha):
+        self._cliente, self._planilha = cliente, planilha
+
+    def _open_spreadsheet(self, **kw):
+        if self._planilha: kw.setdefault("spreadsheet", self._planilha)
+        return self._cliente._open_spreadsheet(**kw)
+
+    def _select_worksheet(self, **kw):
+        if self._planilha: kw.setdefault("spreadsheet", self._planilha)
+        return self._cliente._select_worksheet(**kw)
+
+
+class ConexaoConferencia:
+    """A conexão compartilhada, com todas as chamadas apontadas para ``planilha`` (None = a dos secrets)."""
+    def __init__(self, conn, planilha=None):
+        self._conn, self.planilha = conn, planilha
+        self.chave = (id(conn), planilha)  # separa as planilhas no Agendador e nas travas (ver EspelhoLocal.chave)
+
+    def read(self, **kw):
+        if self.planilha: kw.setdefault("spreadsheet", self.planilha)
+        return self._conn.read(**kw)
+
+    def update(self, **kw):
+        if self.planilha: kw.setdefault("spreadsheet", self.planilha)
+        return self._conn.update(**kw)
+
+    @property
+    def client(self):
+        return _ClienteConferencia(self._conn.client, self.planilha)
+
+
+class Conferencia:
+    def __init__(self, ident, conn, pasta, agendador, intervalo_sync=300, intervalo_credenciais=60):
+        self.id = ident
+        self.pasta = pasta
+        self.espelho = EspelhoLocal(conn, os.path.join(pasta, "espelho.sqlite3"), agendador=agendador)
+        try: self.espelho.ler_varias(ABAS)  # partida a frio: todas as abas numa só chamada
+        except Exception: pass
+        self.espelho.iniciar_sincronizacao(intervalo=intervalo_sync)
+        self.credenciais = CredenciaisCache(lambda: self.espelho.ler("Usuarios"))
+        self.credenciais.iniciar_atualizacao(intervalo=intervalo_credenciais)
+        self.historico = HistoricoAtas(self.espelho, pasta)
+
+    def parar(self):
+        self.credenciais.parar()
+        self.espelho.parar()
+
+
+class PoolConferencias:
+    def __init__(self, conn, planilhas, pasta=".cache/conferencias", max_residentes=8, agendador=None):
+        """``planilhas``: {id da conferência: URL ou nome da planilha (None = a dos secrets)}."""
+        self.conn = conn
+        self.planilhas = dict(planilhas) or {PADRAO: None}
+        self.pasta = pasta
+        self.max_residentes = max_residentes
+        self.agendador = agendador or Agendador()
+        self._residentes = OrderedDict()
+        self._travas = {ident: threading.Lock() for ident in self.planilhas}
+        self._trava = threading.Lock()
+
+    def __contains__(self, ident):
+        return ident in self.planilhas
+
+    def residentes(self):
+        with self._trava: return list(self._residentes)
+
+    def obter(self, ident):
+        """Conferência ``ident`` em memória (carregada na primeira vez; KeyError se não existir)."""
+        planilha = self.planilhas[ident]
+        with self._trava:
+            if ident in self._residentes:
+                self._residentes.move_to_end(ident)
+                return self._residentes[ident]
+        with self._travas[ident]:  # a partida a frio de uma conferência não trava as outras
+            with self._trava: conferencia = self._residentes.get(ident)
+            if conferencia is None:
+                pasta = os.path.join(self.pasta, re.sub(r'[^\w-]', '_', ident))
+                conferencia = Conferencia(ident, ConexaoConferencia(self.conn, planilha), pasta, self.agendador)
+            with self._trava:
+                self._residentes[ident] = conferencia
+                self._residentes.move_to_end(ident)
+                excedentes = []
+                while len(self._residentes) > self.max_residentes:
+                    excedentes.append(self._residentes.popitem(last=False)[1])
+        for velha in excedentes: velha.parar()
+        return conferencia
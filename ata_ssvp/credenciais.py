@@ -0,0 +1,73 @@
+"""
+Credenciais do authenticator, montadas uma vez por processo e compartilhadas entre sessões.
+
+O cache é invalidado explicitamente quando um usuário é criado e renovado periodicamente
+em segundo plano, então os reruns não leem a aba 'Usuarios'.
+"""
+import copy
+import hashlib
+import hmac
+import threading
+
+from ata_ssvp import metricas
+
+
+def montar_credenciais(df):
+    """DataFrame da aba 'Usuarios' -> dicionário no formato do streamlit-authenticator."""
+    df = df.dropna(subset=['username'])
+    roles = [[r] for r in df['role']] if 'role' in df.columns else [['editor']] * len(df)
+    return {"usernames": {
+        user: {"name": nome, "password": senha, "roles": papeis}
+        for user, nome, senha, papeis in zip(df['username'], df['name'], df['password'], roles)
+    }}
+
+
+def chave_cookie(segredos, id_conferencia):
+    """
+    Chave que assina o cookie de login de ``id_conferencia``: a da seção [cookie_chaves] dos
+    secrets ou, sem ela, derivada (HMAC-SHA256) de ``cookie_chave``. Cada conferência assina
+    com a sua, então o cookie de uma não vale em outra. None se os secrets não têm nenhuma.
+    """
+    propria = (segredos.get("cookie_chaves") or {}).get(id_conferencia)
+    if propria: return str(propria)
+    mestra = segredos.get("cookie_chave")
+    if not mestra: return None
+    return hmac.new(str(mestra).encode(), f"cookie:{id_conferencia}".encode(), hashlib.sha256).hexdigest()
+
+
+class CredenciaisCache:
+    def __init__(self, ler_usuarios):
+        self._ler_usuarios = ler_usuarios  # função que devolve o DataFrame de 'Usuarios'
+        self._credenciais = None
+        self._trava = threading.Lock()
+        self._thread = None
+        self._parado = threading.Event()
+
+    def recarregar(self):
+        """Remonta as credenciais; numa falha de leitura mantém as que já estavam em cache."""
+        try: credenciais = montar_credenciais(self._ler_usuarios())
+        except Exception:
+            with self._trava: credenciais = self._credenciais or {"usernames": {}}
+        with self._trava: self._credenciais = credenciais
+        return credenciais
+
+    def obter(self):
+        """Cópia das credenciais (o authenticator altera o dicionário que recebe)."""
+        with metricas.medir("cache", "credenciais") as campos:
+            with self._trava: credenciais = self._credenciais
+            campos["acerto"] = credenciais is not None
+            if credenciais is None: credenciais = self.recarregar()
+            return copy.deepcopy(credenciais)
+
+    def invalidar(self):
+        with self._trava: self._credenciais = None
+
+    def iniciar_atualizacao(self, intervalo=60):
+        if self._thread is not None: return
+        def laco():
+            while not self._parado.wait(intervalo): self.recarregar()
+        self._thread = threading.Thread(target=laco, name="credenciais-atualizacao", daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        self._parado.set()
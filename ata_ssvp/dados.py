@@ -0,0 +1,62 @@
+"""
+Config, Membros, Anos e Usuarios de uma conferência, lidos e gravados pelo espelho.
+
+Sem nada de Streamlit: o app põe cache e mensagens em volta destas funções, e scripts
+podem usá-las com qualquer ``EspelhoLocal``.
+"""
+ABAS_CADASTRO = ("Config", "Membros", "Anos")
+
+
+def montar_config(df_config):
+    """Aba Config (Chave/Valor) -> dicionário, com 'ultima_ata' como inteiro."""
+    config = dict(zip(df_config['Chave'], df_config['Valor'])) if not df_config.empty else {}
+    try: config['ultima_ata'] = int(config.get('ultima_ata', 0))
+    except (TypeError, ValueError): config['ultima_ata'] = 0
+    return config
+
+def _lista(df, coluna):
+    if df.empty or coluna not in df.columns: return []
+    return df[coluna].dropna().astype(str).tolist()
+
+def ler_cadastro(espelho):
+    """
+    Config e Anos: {"config": {...}, "anos": [...]}. Membros vem na mesma busca (partida a frio),
+    mas fica de fora do resultado: tem registro e cache próprios (``membros.ler_membros``).
+    """
+    abas = espelho.ler_varias(list(ABAS_CADASTRO))
+    return {"config": montar_config(abas["Config"]), "anos": _lista(abas["Anos"], 'Ano')}
+
+def gravar_configs(espelho, mudancas, base=None):
+    """
+    Aplica {chave: valor} na aba Config: chaves existentes regravam só a célula do Valor (uma
+    chamada batch_update), chaves novas viram linhas (um append). Com ``base`` (a config como
+    foi lida), é uma troca condicional por chave: só o que mudou desde ``base`` é gravado, e
+    mudanças de outra pessoa em outras chaves ficam (``ConflitoEscrita`` se for na mesma).
+    """
+    from ata_ssvp.espelho import ConflitoEscrita
+    df = espelho.ler("Config", atualizar=True)
+    linhas = {str(ch): i for i, ch in df['Chave'].items()} if 'Chave' in df.columns else {}
+    existentes = {linhas[ch]: {'Valor': str(v)} for ch, v in mudancas.items() if ch in linhas}
+    lidas = {linhas[ch]: {'Chave': ch, 'Valor': base[ch]} for ch in mudancas if ch in linhas and ch in (base or {})}
+    try:
+        if existentes: espelho.atualizar_linhas("Config", existentes, base=lidas or None)
+    except ConflitoEscrita as e:
+        raise ConflitoEscrita("Config", e.conflitos, ", ".join(str(df.at[i, 'Chave']) for i in e.conflitos)) from None
+    novas = [{'Chave': ch, 'Valor': str(v)} for ch, v in mudancas.items() if ch not in linhas]
+    if novas: espelho.anexar_linhas("Config", novas)
+
+def gerenciar_lista(espelho, aba, coluna, valor, acao="adicionar"):
+    """Acrescenta (uma linha, se ainda não existir) ou remove (só as linhas de ``valor``) da ``coluna`` de ``aba``."""
+    df = espelho.ler(aba, atualizar=True)
+    if acao == "adicionar":
+        if valor not in df[coluna].values:
+            espelho.anexar_linha(aba, {coluna: valor})
+    elif acao == "remover":
+        espelho.remover_linhas(aba, df.index[df[coluna] == valor])
+
+def adicionar_usuario(espelho, username, name, password_hash, role):
+    """Acrescenta o usuário na aba Usuarios; False se o login já existe."""
+    df = espelho.ler("Usuarios", atualizar=True)
+    if not df.empty and username in df['username'].values: return False
+    espelho.anexar_linha("Usuarios", {"username": username, "name": name, "password": password_hash, "role": role})
+    return True
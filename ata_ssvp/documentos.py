@@ -0,0 +1,119 @@
+"""
+Geradores de DOCX e PDF da ata (com validação agressiva dos campos vazios).
+
+python-docx, fpdf e num2words só são importados na primeira renderização, então importar
+este módulo (ou o pacote) é barato para scripts e para a CLI.
+"""
+import io
+from functools import lru_cache
+
+from ata_ssvp import metricas
+from ata_ssvp.modelo import eh_valido, montar_texto_ata
+
+FORMATOS = ("pdf", "docx")
+# Mude quando o layout dos documentos mudar (invalida o cache de renderização)
+VERSAO_LAYOUT = 2
+
+# --- CLASSE PDF (criada uma vez, na primeira renderização) ---
+@lru_cache(maxsize=1)
+def classe_pdf():
+    from fpdf import FPDF
+
+    class PDF(FPDF):
+        def footer(self):
+            self.set_y(-15)
+            self.set_font('Arial', 'I', 8)
+            self.cell(0, 10, f'Página {self.page_no()}/{{nb}}', 0, 0, 'C')
+    return PDF
+
+@lru_cache(maxsize=1)
+def _docx_base():
+    """Documento pronto (estilo, parágrafos vazios de texto e data, lauda de assinaturas) em bytes, montado uma vez."""
+    from docx import Document
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Pt
+
+    doc = Document()
+    style = doc.styles['Normal']
+    style.font.name = 'Arial'
+    style.font.size = Pt(12)
+    
+    p = doc.add_paragraph()
+    p.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
+    pd = doc.add_paragraph()
+    pd.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+    #doc.add_paragraph("\n\nAssinaturas dos Presentes:")
+    for _ in range(30): doc.add_paragraph("_"*85)
+    bio = io.BytesIO(); doc.save(bio)
+    return bio.getvalue()
+
+def gerar_docx(dados, texto=None):
+    """Clona o documento base e preenche só o texto da ata e a linha de data."""
+    from docx import Document
+
+    doc = Document(io.BytesIO(_docx_base()))
+    if texto is None: texto = montar_texto_ata(dados)
+    p, pd = doc.paragraphs[0], doc.paragraphs[1]
+    p.text = texto
+    pd.text = f"{dados['cidade_estado']}, {dados['data_reuniao']}."
+    return doc
+
+def limpar_texto_pdf(txt):
+    """Texto aceito pelas fontes padrão do PDF (latin-1), com aspas e travessões tipográficos trocados."""
+    if not eh_valido(txt): return ""
+    s = str(txt)
+    s = s.replace('\u201c', '"').replace('\u201d', '"') 
+    s = s.replace('\u2018', "'").replace('\u2019', "'") 
+    s = s.replace('\u2013', '-').replace('\u2014', '-')
+    s = s.replace('\u2022', '*') # Bullets
+    
+    return s.encode('latin-1', 'replace').decode('latin-1')
+
+def escrever_ata_pdf(pdf, dados, texto=None, assinaturas=True):
+    """
+    Escreve a ata na página atual de ``pdf``: texto, cidade e data e, se pedido, a lauda de assinaturas.
+    O texto passa por ``limpar_texto_pdf`` aqui, para a ata avulsa, o lote e o livro.
+    """
+    if texto is None: texto = montar_texto_ata(dados)
+    pdf.multi_cell(0, 7, limpar_texto_pdf(texto), align="J")
+    pdf.ln(10)
+    pdf.cell(0, 10, f"{limpar_texto_pdf(dados['cidade_estado'])}, {limpar_texto_pdf(dados['data_reuniao'])}.", ln=True, align="R")
+    pdf.ln(10)
+    #pdf.cell(0, 10, "Assinaturas dos Presentes:", ln=True, align="L")
+    if assinaturas:
+        for _ in range(30): pdf.cell(0, 8, "_"*65, ln=True, align="C")
+
+def gerar_pdf_nativo(dados, texto=None):
+    pdf = classe_pdf()()
+    pdf.alias_nb_pages()
+    pdf.add_page()
+    pdf.set_font("Arial", size=12)
+    pdf.set_margins(25, 25, 25)
+    escrever_ata_pdf(pdf, dados, texto)
+    
+    try:
+        pdf_content = pdf.output(dest='S')
+        
+        if isinstance(pdf_content, str):
+            return pdf_content.encode('latin-1', 'replace')
+        
+        return bytes(pdf_content)
+        
+    except Exception as e:
+        print(f"Erro PDF: {e}")
+        return b"%PDF-1.4 erro_geracao"
+
+def renderizar_ata(dados, formatos=FORMATOS):
+    """Renderiza uma ata e devolve (número, {extensão: bytes}), montando o texto uma só vez."""
+    texto = montar_texto_ata(dados)
+    arquivos = {}
+    if "pdf" in formatos:
+        with metricas.medir("render", "gerar_pdf_nativo") as campos:
+            arquivos["pdf"] = gerar_pdf_nativo(dados, texto)
+            campos["bytes"] = len(arquivos["pdf"])
+    if "docx" in formatos:
+        with metricas.medir("render", "gerar_docx") as campos:
+            bio = io.BytesIO(); gerar_docx(dados, texto).save(bio)
+            arquivos["docx"] = bio.getvalue()
+            campos["bytes"] = len(arquivos["docx"])
+    return dados['num_ata'], arquivos
@@ -0,0 +1,542 @@
+"""
+Espelho local (SQLite) das abas da planilha.
+
+As leituras são servidas do arquivo local e as gravações vão primeiro ao Google Sheets
+e depois ao espelho. Toda chamada remota passa pelo ``Agendador`` (cota, retentativa e leituras compartilhadas).
+A ressincronização é incremental: o horário de modificação da
+planilha (Drive) diz se algo mudou e a última linha de cada aba diz se basta buscar
+só as linhas novas. Funciona com qualquer objeto que tenha ``read``/``update`` como o
+``GSheetsConnection``; sem acesso ao gspread (conexão pública ou falsa) cai na
+leitura/escrita da aba inteira.
+
+Vários editores ao mesmo tempo: a versão de uma linha é o hash do seu conteúdo
+(``hash_linha``), então não há coluna de controle na planilha e edições feitas direto no
+Google Sheets também contam. ``atualizar_linhas`` com ``base`` é uma troca condicional
+(mudanças de fora em outras colunas são mescladas; na mesma célula, ``ConflitoEscrita``)
+e os appends trazem junto as linhas que outros acrescentaram desde a última leitura.
+"""
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from gspread.utils import a1_to_rowcol, rowcol_to_a1
+from pandas.io.parsers import TextParser
+
+from ata_ssvp.agendador import Agendador
+
+ABAS = ("Config", "Membros", "Anos", "Historico", "Usuarios")
+PARAMS_VALORES = {"valueRenderOption": "UNFORMATTED_VALUE", "dateTimeRenderOption": "FORMATTED_STRING"}
+
+
+def valores_para_dataframe(valores, primeira_linha=2):
+    """
+    Converte a matriz da API (cabeçalho na 1ª posição) no mesmo DataFrame que conn.read devolve.
+    O índice segue a convenção do conn.read: linha da planilha - 2.
+    """
+    if not valores: return pd.DataFrame()
+    largura = len(valores[0])
+    linhas = [list(l)[:largura] + [""] * (largura - len(l)) for l in valores]
+    df = TextParser(linhas).read()
+    df.index = df.index + primeira_linha - 2
+    return df.dropna(how="all")
+
+
+def _celula(valor):
+    """Valor aceito pela API (sem tipos numpy nem NaN)."""
+    if hasattr(valor, "item"): valor = valor.item()
+    if valor is None or (isinstance(valor, float) and math.isnan(valor)): return ""
+    return valor
+
+
+def texto_celula(valor):
+    """Forma canônica de uma célula para comparar versões: 10, 10.0, '10' e ' 10 ' são iguais; vazio e NaN viram ''."""
+    valor = _celula(valor)
+    if isinstance(valor, float) and valor.is_integer(): valor = int(valor)
+    return str(valor).strip()
+
+
+def hash_linha(linha):
+    """Versão de uma linha ({coluna: valor}): muda sempre que o conteúdo muda."""
+    conteudo = "\x1f".join(f"{str(c).strip()}={texto_celula(v)}" for c, v in sorted(linha.items(), key=lambda cv: str(cv[0]).strip()))
+    return hashlib.sha1(conteudo.encode("utf-8")).hexdigest()[:12]
+
+
+class ConflitoEscrita(Exception):
+    """A mesma célula foi mudada por outra pessoa desde a leitura e por esta gravação."""
+    def __init__(self, aba, conflitos, detalhe=None):
+        self.aba, self.conflitos = aba, conflitos  # {indice: [colunas]}
+        detalhe = detalhe or ", ".join(sorted({c for cs in conflitos.values() for c in cs}))
+        super().__init__(f"{aba}: alterado por outra pessoa enquanto era editado ({detalhe})")
+
+
+class EspelhoLocal:
+    def __init__(self, conn, caminho, abas=ABAS, agendador=None):
+        self.conn = conn
+        self.chave = getattr(conn, "chave", None) or id(conn)  # a planilha (ver ConexaoConferencia.chave)
+        self.abas = tuple(abas)
+        self.agendador = agendador or Agendador()
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        self._db = sqlite3.connect(caminho, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS _controle (aba TEXT PRIMARY KEY, ultima_linha INTEGER, marcador TEXT, sincronizado REAL)")
+        self._db.commit()
+        self._trava = threading.RLock()        # acesso ao SQLite
+        self._trava_sync = threading.Lock()    # uma sincronização por vez
+        self._trava_escrita = threading.Lock() # uma reescrita de aba inteira por vez
+        self._planilha = None
+        self._worksheets = {}
+        self._thread = None
+        self._parado = threading.Event()
+
+    # --- Acesso ao gspread (opcional) ---
+
+    def _ler_remoto(self, chave, funcao):
+        """Leitura pelo Agendador. Ele é comum a todas as conferências, então a chave leva a planilha."""
+        chave = (chave,) if isinstance(chave, str) else tuple(chave)
+        return self.agendador.ler((self.chave,) + chave, funcao, chave[0])
+
+    def _abrir_planilha(self):
+        if self._planilha is None:
+            try: self._planilha = self._ler_remoto("planilha", lambda: self.conn.client._open_spreadsheet())
+            except Exception: return None
+        return self._planilha
+
+    def _aba_ws(self, aba):
+        if aba not in self._worksheets:
+            try: self._worksheets[aba] = self._ler_remoto(("worksheet", aba), lambda: self.conn.client._select_worksheet(worksheet=aba))
+            except Exception: return None
+        return self._worksheets[aba]
+
+    def _marcador_remoto(self):
+        planilha = self._abrir_planilha()
+        if planilha is None: return None
+        try: return self._ler_remoto("marcador", planilha.get_lastUpdateTime)
+        except Exception: return None
+
+    # --- Tabelas locais ---
+
+    def _controle(self, aba):
+        with self._trava:
+            row = self._db.execute("SELECT ultima_linha, marcador, sincronizado FROM _controle WHERE aba = ?", (aba,)).fetchone()
+        return None if row is None else {"ultima_linha": row[0], "marcador": row[1], "sincronizado": row[2]}
+
+    def _gravar_controle(self, aba, ultima_linha=None, marcador=None):
+        with self._trava:
+            atual = self._controle(aba) or {}
+            if ultima_linha is None: ultima_linha = atual.get("ultima_linha", 1)
+            if marcador is None: marcador = atual.get("marcador")
+            self._db.execute(
+                "INSERT INTO _controle (aba, ultima_linha, marcador, sincronizado) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(aba) DO UPDATE SET ultima_linha = excluded.ultima_linha, marcador = excluded.marcador, sincronizado = excluded.sincronizado",
+                (aba, ultima_linha, marcador, time.time()))
+            self._db.commit()
+
+    def _substituir(self, aba, df, marcador=None):
+        local = df.copy()
+        local["_linha"] = local.index + 2
+        with self._trava:
+            local.to_sql(aba, self._db, if_exists="replace", index=False)
+            self._gravar_controle(aba, int(local["_linha"].max()) if len(local) else 1, marcador)
+
+    def _acrescentar(self, aba, df, ultima_linha):
+        local = df.copy()
+        local["_linha"] = local.index + 2
+        with self._trava:
+            local.to_sql(aba, self._db, if_exists="append", index=False)
+            self._gravar_controle(aba, ultima_linha)
+
+    def _marcadores(self, aba):
+        """Antes de uma gravação nossa em ``aba``: (marcador guardado da aba, marcador da planilha agora)."""
+        return (self._controle(aba) or {}).get("marcador"), self._marcador_remoto()
+
+    def _renovar_marcador(self, anteriores):
+        """
+        Após uma gravação nossa, abas que estavam em dia passam a valer o novo marcador. O marcador
+        é da planilha inteira: se ele já não batia com o guardado antes da gravação, alguém mexeu na
+        planilha desde a última leitura e nada é renovado (a próxima sincronização relê as abas).
+        """
+        guardado, antes = anteriores
+        if not antes or antes != guardado: return
+        novo = self._marcador_remoto()
+        if not novo: return
+        with self._trava:
+            self._db.execute("UPDATE _controle SET marcador = ? WHERE marcador = ?", (novo, guardado))
+            self._db.commit()
+
+    # --- Leitura ---
+
+    def ler(self, aba, atualizar=False):
+        """Lê a aba do espelho. Na primeira vez (ou com atualizar=True) sincroniza antes."""
+        if atualizar or self._controle(aba) is None: self.sincronizar([aba])
+        with self._trava:
+            df = pd.read_sql_query(f'SELECT * FROM "{aba}" ORDER BY _linha', self._db)
+        df.index = (df.pop("_linha") - 2).astype(int).tolist()
+        return df.where(df.notna(), float("nan")).infer_objects()  # NULL do SQLite -> NaN, sem o downcast implícito do replace
+
+    def versao(self, aba):
+        """Muda sempre que a cópia local da aba muda (sincronização ou gravação)."""
+        return (self._controle(aba) or {}).get("sincronizado")
+
+    def colunas(self, aba):
+        """Cabeçalho da aba, sem ler os dados."""
+        if self._controle(aba) is None: self.sincronizar([aba])
+        with self._trava:
+            return [r[1] for r in self._db.execute(f'PRAGMA table_info("{aba}")') if r[1] != "_linha"]
+
+    def ler_coluna(self, aba, coluna):
+        """Uma única coluna, indexada como no DataFrame de ``ler``."""
+        if self._controle(aba) is None: self.sincronizar([aba])
+        with self._trava:
+            linhas = self._db.execute(f'SELECT _linha, "{coluna}" FROM "{aba}" ORDER BY _linha').fetchall()
+        return pd.Series([v for _, v in linhas], index=[l - 2 for l, _ in linhas], dtype=object)
+
+    def ler_linha(self, aba, indice):
+        """Só a linha ``indice`` como dicionário (None se não existir)."""
+        if self._controle(aba) is None: self.sincronizar([aba])
+        with self._trava:
+            cursor = self._db.execute(f'SELECT * FROM "{aba}" WHERE _linha = ?', (int(indice) + 2,))
+            linha = cursor.fetchone()
+            nomes = [d[0] for d in cursor.description]
+        if linha is None: return None
+        return {n: (float("nan") if v is None else v) for n, v in zip(nomes, linha) if n != "_linha"}
+
+    def ler_coluna_remota(self, aba, coluna):
+        """
+        A coluna ``coluna`` como está agora na planilha ({indice: valor}, uma chamada col_values,
+        até a última linha preenchida), regravada no espelho nas linhas que ele já tem. None sem
+        acesso ao gspread.
+        """
+        ws = self._aba_ws(aba)
+        originais = self.colunas(aba)
+        cab = [str(c).strip() for c in originais]
+        if ws is None or coluna not in cab: return None
+        valores = self._ler_remoto(("coluna", aba, coluna), lambda: ws.col_values(cab.index(coluna) + 1))
+        lidos = {n - 2: v for n, v in enumerate(valores, start=1) if n > 1}
+        with self._trava:
+            for indice, valor in lidos.items():
+                self._db.execute(f'UPDATE "{aba}" SET "{originais[cab.index(coluna)]}" = ? WHERE _linha = ?', (None if valor == "" else valor, indice + 2))
+            self._gravar_controle(aba)
+        return lidos
+
+    def versao_linha(self, aba, indice):
+        """Hash da linha ``indice`` como está no espelho (None se não existir)."""
+        linha = self.ler_linha(aba, indice)
+        return None if linha is None else hash_linha(linha)
+
+    def ultima_linha(self, aba):
+        """Última linha da planilha que o espelho conhece (1 = só o cabeçalho)."""
+        return (self._controle(aba) or {}).get("ultima_linha", 1)
+
+    def ler_varias(self, abas):
+        """Lê várias abas; as que ainda não estão no espelho vêm juntas numa única busca."""
+        faltando = [aba for aba in abas if self._controle(aba) is None]
+        if faltando: self.sincronizar(faltando)
+        return {aba: self.ler(aba) for aba in abas}
+
+    # --- Sincronização ---
+
+    def sincronizar(self, abas=None, forcar=False):
+        """
+        Ressincroniza as abas com a planilha e devolve as que foram atualizadas.
+        Falhas de rede (ex.: cota) mantêm a cópia local; só propagam se a aba nunca foi lida.
+        """
+        abas = self.abas if abas is None else abas
+        with self._trava_sync:
+            marcador = self._marcador_remoto()
+            atualizadas, completas = [], []
+            for aba in abas:
+                ctrl = self._controle(aba)
+                if ctrl and not forcar and marcador and ctrl["marcador"] == marcador: continue
+                try:
+                    if ctrl and not forcar and self._sincronizar_novas_linhas(aba, ctrl, marcador):
+                        atualizadas.append(aba); continue
+                except Exception:
+                    continue
+                completas.append(aba)
+
+            if completas:
+                lidas = self._buscar_completas(completas)
+                for aba, df in lidas.items():
+                    self._substituir(aba, df, marcador); atualizadas.append(aba)
+                nunca_lidas = [aba for aba in completas if aba not in lidas and self._controle(aba) is None]
+                if nunca_lidas: raise RuntimeError(f"Não foi possível ler: {', '.join(nunca_lidas)}")
+            return atualizadas
+
+    def _sincronizar_novas_linhas(self, aba, ctrl, marcador):
+        """
+        Busca só as linhas acrescentadas desde a última leitura. False se a aba precisa ser lida
+        inteira: nada foi acrescentado, a coluna A das linhas que já temos mudou (linha apagada,
+        inserida ou renumerada) ou a última linha conhecida não é mais a mesma. Uma edição de
+        fora numa linha mais antiga, junto com um append, só aparece na próxima leitura inteira;
+        gravações por cima dela passam por ``atualizar_linhas``, que relê a linha antes.
+        """
+        ws = self._aba_ws(aba)
+        if ws is None: return False
+        conhecida = ctrl["ultima_linha"]
+        coluna = self._ler_remoto(("contagem", aba), lambda: ws.col_values(1, value_render_option=PARAMS_VALORES["valueRenderOption"]))
+        if len(coluna) <= conhecida: return False
+        if conhecida > 1:
+            local = self.ler_coluna(aba, self.colunas(aba)[0])
+            if [texto_celula(local.get(n - 2)) for n in range(2, conhecida + 1)] != [texto_celula(v) for v in coluna[1:conhecida]]: return False
+        novas = self._ler_intervalo(aba, ws, max(conhecida, 2), len(coluna))
+        if conhecida > 1:
+            remota = hash_linha(novas.loc[conhecida - 2].to_dict()) if conhecida - 2 in novas.index else None
+            if self.versao_linha(aba, conhecida - 2) != remota: return False
+            novas = novas.drop(index=conhecida - 2, errors="ignore")
+        self._acrescentar(aba, novas, len(coluna))
+        self._gravar_controle(aba, marcador=marcador)
+        return True
+
+    def _ler_intervalo(self, aba, ws, inicio, fim):
+        """As linhas ``inicio``..``fim`` da planilha como DataFrame (uma chamada values_get)."""
+        with self._trava:
+            cab = [r[1] for r in self._db.execute(f'PRAGMA table_info("{aba}")') if r[1] != "_linha"]
+        intervalo = f"'{aba}'!A{inicio}:{rowcol_to_a1(fim, len(cab))}"
+        valores = self._ler_remoto(("intervalo", intervalo), lambda: ws.spreadsheet.values_get(intervalo, params=PARAMS_VALORES))
+        return valores_para_dataframe([cab] + valores.get("values", []), inicio)
+
+    def _buscar_linhas(self, aba, ws, inicio, fim):
+        """Traz para o espelho as linhas ``inicio``..``fim`` da planilha (uma chamada values_get)."""
+        self._acrescentar(aba, self._ler_intervalo(aba, ws, inicio, fim), fim)
+
+    def _ler_linhas_remotas(self, aba, ws, indices, cab, completas=()):
+        """
+        As linhas ``indices`` como estão agora na planilha ({indice: {coluna: valor}}), numa
+        chamada values_batchGet. Só as de ``completas`` vêm inteiras; das outras basta a primeira coluna.
+        """
+        completas = set(completas)
+        intervalos = [f"'{aba}'!A{i + 2}:{rowcol_to_a1(i + 2, len(cab) if i in completas else 1)}" for i in indices]
+        chave = ("linhas", aba, tuple(indices), tuple(sorted(completas)))
+        resp = self._ler_remoto(chave, lambda: ws.spreadsheet.values_batch_get(intervalos, params=PARAMS_VALORES))
+        linhas = {}
+        for i, r in zip(indices, resp["valueRanges"]):
+            valores = r.get("values", [])[:1]
+            if i not in completas:
+                linhas[i] = {cab[0]: valores[0][0]} if valores and valores[0] else {}
+                continue
+            df = valores_para_dataframe([cab] + valores, i + 2)
+            linhas[i] = df.loc[i].to_dict() if i in df.index else {}  # vazia: apagada na planilha
+        return linhas
+
+    def _conferir_posicoes(self, aba, df, cab, remotas):
+        """
+        Gravação por posição só vale se cada linha ainda é a mesma: a primeira coluna (Numero no
+        Historico, Chave na Config) relida tem de bater com o espelho. Se não bate, linhas foram
+        apagadas, inseridas ou renumeradas na planilha: a aba fica marcada para ser relida
+        inteira e sobe ``ConflitoEscrita`` sem gravar nada.
+        """
+        fora = [i for i, remota in remotas.items()
+                if texto_celula(remota.get(cab[0])) != texto_celula(df.at[i, df.columns[0]] if i in df.index else None)]
+        if not fora: return
+        self._gravar_controle(aba, marcador="")
+        raise ConflitoEscrita(aba, {i: [cab[0]] for i in fora}, "as linhas mudaram de lugar na planilha")
+
+    def _mesclar(self, aba, cab, alteracoes, base, remotas):
+        """
+        Troca condicional de ``atualizar_linhas``: nas linhas que têm ``base`` e mudaram na
+        planilha (``remotas``) desde a leitura, fica só com as colunas que esta gravação muda.
+        Devolve (alterações a gravar, linhas relidas que tinham mudanças de fora).
+        """
+        mescladas, conflitos = {}, {}
+        for i in [i for i in alteracoes if i in base]:
+            lida = {str(c).strip(): v for c, v in base[i].items()}
+            remota = {c: remotas[i].get(c) for c in cab}
+            if hash_linha({c: lida.get(c) for c in cab}) == hash_linha(remota): continue  # ninguém mexeu
+            nossas = {c: v for c, v in alteracoes[i].items() if texto_celula(v) != texto_celula(lida.get(c))}
+            choques = [c for c, v in nossas.items() if texto_celula(remota[c]) not in (texto_celula(lida.get(c)), texto_celula(v))]
+            if choques: conflitos[i] = choques
+            else: alteracoes[i], mescladas[i] = nossas, remota
+        if conflitos: raise ConflitoEscrita(aba, conflitos)
+        return alteracoes, mescladas
+
+    def _buscar_completas(self, abas):
+        """
+        Busca abas inteiras numa única chamada values:batchGet. Se o lote falhar (ou não houver
+        gspread), lê cada aba em paralelo e devolve o que conseguiu.
+        """
+        planilha = self._abrir_planilha()
+        if planilha is not None:
+            try:
+                resp = self._ler_remoto(("lote",) + tuple(abas), lambda: planilha.values_batch_get([f"'{aba}'" for aba in abas], params=PARAMS_VALORES))
+                return {aba: valores_para_dataframe(r.get("values", [])) for aba, r in zip(abas, resp["valueRanges"])}
+            except Exception: pass
+
+        def ler_aba(aba):
+            try: return self._ler_remoto(("aba", aba), lambda: self.conn.read(worksheet=aba, ttl=0))
+            except Exception: return None
+        with ThreadPoolExecutor(max_workers=len(abas)) as pool:
+            lidas = dict(zip(abas, pool.map(ler_aba, abas)))
+        return {aba: df for aba, df in lidas.items() if df is not None}
+
+    def iniciar_sincronizacao(self, intervalo=300):
+        """Sincroniza em segundo plano, para que os reruns nunca esperem pela rede."""
+        if self._thread is not None: return
+        def laco():
+            while not self._parado.wait(intervalo):
+                try: self.sincronizar()
+                except Exception: pass
+        self._thread = threading.Thread(target=laco, name="espelho-sincronizacao", daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        """Encerra a sincronização de fundo."""
+        self._parado.set()
+
+    # --- Escrita (write-through) ---
+
+    def gravar(self, aba, df):
+        """Reescreve a aba inteira na planilha e no espelho."""
+        with self._trava_escrita:
+            anteriores = self._marcadores(aba)
+            self.agendador.escrever(lambda: self.conn.update(worksheet=aba, data=df), "update", df)
+            self._substituir(aba, df.reset_index(drop=True))
+        self._renovar_marcador(anteriores)
+
+    def anexar_linha(self, aba, linha):
+        """
+        Acrescenta uma linha (append de uma linha só quando há acesso gspread) e devolve o
+        índice dela. Devolve None quando a aba precisou ser reescrita inteira (os índices mudam).
+        """
+        df = self.ler(aba)
+        cab = [str(c).strip() for c in df.columns]
+        ws = self._aba_ws(aba)
+        if ws is None or any(c not in cab for c in linha):
+            # Coluna nova ou conexão sem gspread: reescreve uma vez, a partir da aba relida (não do espelho)
+            self.gravar(aba, pd.concat([self._ler_aba_remota(aba), pd.DataFrame([linha])], ignore_index=True))
+            return None
+
+        anteriores = self._marcadores(aba)
+        valores = [_celula(linha.get(c, "")) for c in cab]
+        resp = self.agendador.escrever(lambda: ws.append_row(valores, value_input_option="USER_ENTERED", table_range="A1"), "append_row", valores)
+        try: n_linha = a1_to_rowcol(resp["updates"]["updatedRange"].split("!")[-1].split(":")[0])[0]
+        except Exception: n_linha = self.ultima_linha(aba) + 1
+        self._trazer_intermediarias(aba, ws, n_linha)
+        nova = pd.DataFrame([{c: linha.get(c) for c in cab}], index=[n_linha - 2]).set_axis(list(df.columns), axis=1)
+        self._acrescentar(aba, nova, max(n_linha, (self._controle(aba) or {}).get("ultima_linha", 1)))
+        self._renovar_marcador(anteriores)
+        return n_linha - 2
+
+    def _trazer_intermediarias(self, aba, ws, n_linha):
+        """
+        Linhas que outros acrescentaram entre a última leitura e o nosso append (que caiu na
+        ``n_linha``): entram no espelho agora, senão o marcador renovado as esconderia.
+        """
+        ultima = self.ultima_linha(aba)
+        if n_linha - 1 <= ultima: return
+        try: self._buscar_linhas(aba, ws, ultima + 1, n_linha - 1)
+        except Exception: self._gravar_controle(aba, marcador="")  # a próxima sincronização relê a aba
+
+    def anexar_linhas(self, aba, linhas):
+        """
+        Acrescenta várias linhas ({coluna: valor}) numa única chamada append_rows e devolve os
+        índices delas. Devolve None quando a aba precisou ser reescrita inteira.
+        """
+        if not linhas: return []
+        df = self.ler(aba)
+        cab = [str(c).strip() for c in df.columns]
+        ws = self._aba_ws(aba)
+        if ws is None or any(c not in cab for linha in linhas for c in linha):
+            self.gravar(aba, pd.concat([self._ler_aba_remota(aba), pd.DataFrame(linhas)], ignore_index=True))
+            return None
+
+        anteriores = self._marcadores(aba)
+        valores = [[_celula(linha.get(c, "")) for c in cab] for linha in linhas]
+        resp = self.agendador.escrever(lambda: ws.append_rows(valores, value_input_option="USER_ENTERED", table_range="A1"), "append_rows", valores)
+        try: primeira = a1_to_rowcol(resp["updates"]["updatedRange"].split("!")[-1].split(":")[0])[0]
+        except Exception: primeira = self.ultima_linha(aba) + 1
+        self._trazer_intermediarias(aba, ws, primeira)
+        indices = list(range(primeira - 2, primeira - 2 + len(linhas)))
+        novas = pd.DataFrame([{c: linha.get(c) for c in cab} for linha in linhas], index=indices).set_axis(list(df.columns), axis=1)
+        self._acrescentar(aba, novas, max(primeira + len(linhas) - 1, (self._controle(aba) or {}).get("ultima_linha", 1)))
+        self._renovar_marcador(anteriores)
+        return indices
+
+    def remover_linhas(self, aba, indices):
+        """
+        Apaga as linhas ``indices`` (índices do DataFrame de ``ler``) numa única chamada
+        batchUpdate com um deleteDimension por linha, de baixo para cima; no espelho as linhas
+        de baixo sobem, como na planilha.
+        """
+        indices = sorted({int(i) for i in indices}, reverse=True)
+        if not indices: return
+        ws = self._aba_ws(aba)
+        if ws is None:
+            return self.gravar(aba, self.ler(aba).drop(index=indices, errors="ignore"))
+
+        anteriores = self._marcadores(aba)
+        pedidos = [{"deleteDimension": {"range": {"sheetId": ws.id, "dimension": "ROWS", "startIndex": i + 1, "endIndex": i + 2}}}
+                   for i in indices]  # startIndex é base 0 e a linha 1 é o cabeçalho
+        self.agendador.escrever(lambda: ws.spreadsheet.batch_update({"requests": pedidos}), "delete_rows", pedidos)
+        with self._trava:
+            for i in indices:
+                self._db.execute(f'DELETE FROM "{aba}" WHERE _linha = ?', (i + 2,))
+                self._db.execute(f'UPDATE "{aba}" SET _linha = _linha - 1 WHERE _linha > ?', (i + 2,))
+            ultima = (self._controle(aba) or {}).get("ultima_linha", 1)
+            self._gravar_controle(aba, max(1, ultima - len(indices)))
+        self._renovar_marcador(anteriores)
+
+    def atualizar_linha(self, aba, indice, valores):
+        """Regrava só as células informadas da linha ``indice`` (índice do DataFrame de ``ler``)."""
+        self.atualizar_linhas(aba, {indice: valores})
+
+    def atualizar_linhas(self, aba, alteracoes, base=None):
+        """
+        Regrava células de várias linhas ({indice: {coluna: valor}}) numa única chamada batch_update.
+        Antes, as linhas são relidas na planilha (uma chamada) para conferir que continuam no
+        mesmo lugar (``_conferir_posicoes``).
+
+        Com ``base`` ({indice: linha como foi lida}) é uma troca condicional: se alguém mudou
+        essas linhas desde a leitura, só as colunas que esta gravação muda são regravadas e as
+        mudanças de fora nas demais ficam (também no espelho). Se a mesma célula mudou dos dois
+        lados, nada é gravado e sobe ``ConflitoEscrita``. Devolve os índices das linhas em que
+        houve mescla.
+        """
+        df = self.ler(aba)
+        cab = [str(c).strip() for c in df.columns]
+        alteracoes = {i: {c: v for c, v in valores.items() if c in cab} for i, valores in alteracoes.items()}
+        ws = self._aba_ws(aba)
+        if ws is None: return self._atualizar_sem_gspread(aba, df, cab, alteracoes, base)
+
+        mescladas = {}
+        remotas = self._ler_linhas_remotas(aba, ws, list(alteracoes), cab, [i for i in alteracoes if i in (base or {})]) if alteracoes else {}
+        self._conferir_posicoes(aba, df, cab, remotas)
+        if base: alteracoes, mescladas = self._mesclar(aba, cab, alteracoes, base, remotas)
+        anteriores = self._marcadores(aba)
+        celulas = [{"range": rowcol_to_a1(int(indice) + 2, cab.index(col) + 1), "values": [[_celula(val)]]}
+                   for indice, valores in alteracoes.items() for col, val in valores.items()]
+        if celulas:
+            self.agendador.escrever(lambda: ws.batch_update(celulas, value_input_option="USER_ENTERED"), "batch_update", celulas)
+        alteracoes = {i: {**mescladas.get(i, {}), **valores} for i, valores in alteracoes.items()}
+        with self._trava:
+            for indice, valores in alteracoes.items():
+                for col, val in valores.items():
+                    valor = _celula(val)
+                    self._db.execute(f'UPDATE "{aba}" SET "{df.columns[cab.index(col)]}" = ? WHERE _linha = ?', (None if valor == "" else valor, int(indice) + 2))
+            self._gravar_controle(aba)
+        if celulas: self._renovar_marcador(anteriores)
+        return list(mescladas)
+
+    def _atualizar_sem_gspread(self, aba, df, cab, alteracoes, base):
+        """
+        ``atualizar_linhas`` sem acesso gspread: a aba é relida inteira (conn.read), conferida e
+        mesclada com ``base`` como no caminho normal e regravada a partir do que foi lido, nunca
+        do espelho, que pode estar atrasado. Se a leitura falhar, o erro sobe e nada é gravado.
+        """
+        remoto = self._ler_aba_remota(aba).astype(object)
+        remotas = {i: (remoto.loc[i].to_dict() if i in remoto.index else {}) for i in alteracoes}
+        self._conferir_posicoes(aba, df, cab, remotas)
+        mescladas = {}
+        if base: alteracoes, mescladas = self._mesclar(aba, cab, alteracoes, base, remotas)
+        for indice, valores in alteracoes.items():
+            for col, val in valores.items(): remoto.loc[indice, col] = val
+        self.gravar(aba, remoto)
+        return list(mescladas)
+
+    def _ler_aba_remota(self, aba):
+        """A aba inteira como está agora na planilha (conn.read, colunas sem espaços nas pontas), para as gravações que a reescrevem."""
+        df = self._ler_remoto(("aba", aba), lambda: self.conn.read(worksheet=aba, ttl=0))
+        return df.set_axis([str(c).strip() for c in df.columns], axis=1)
@@ -0,0 +1,88 @@
+"""
+Resumo financeiro do Historico por mês, ano civil e Ano Temático.
+
+Os totais de receita, despesa e décima de cada período são calculados uma vez, agrupando
+as colunas do Historico, e depois mantidos por diferença: gravar uma ata tira a
+contribuição antiga dela dos seus períodos e soma a nova.
+"""
+import io
+
+import numpy as np
+import pandas as pd
+
+from ata_ssvp.linhas import atas_numeradas, coluna_numerica
+
+PERIODOS = ("Mês", "Ano", "Ano Temático")
+COLUNAS_VALORES = ("Atas", "Receita", "Despesa", "Décima")
+SEM_DATA, SEM_ANO = "Sem data", "Sem Ano Temático"
+
+
+def _chaves(datas, anos_tematicos):
+    """Séries de datas (datetime) e Anos Temáticos -> chave de cada período, na ordem de PERIODOS."""
+    mes = datas.dt.strftime("%Y-%m").fillna(SEM_DATA)
+    ano = datas.dt.strftime("%Y").fillna(SEM_DATA)
+    tem = anos_tematicos.fillna("").astype(str).str.strip()
+    tem = tem.where((tem != "") & (tem.str.lower() != "nan"), SEM_ANO)
+    return mes.to_numpy(), ano.to_numpy(), tem.to_numpy()
+
+
+class ResumoFinanceiro:
+    def __init__(self):
+        self._atas = {}                              # número -> (chaves por período, [1, receita, despesa, décima])
+        self._totais = {p: {} for p in PERIODOS}     # período -> {chave: [atas, receita, despesa, décima]}
+
+    @classmethod
+    def do_historico(cls, df_hist):
+        """Agrupa o Historico inteiro (linhas sem número são ignoradas; número repetido: vale a primeira)."""
+        resumo = cls()
+        df = atas_numeradas(df_hist)
+        if df.empty: return resumo
+        datas = pd.to_datetime(df.get("Data", pd.Series("", index=df.index)).astype(str).str.strip(), format="%d/%m/%Y", errors="coerce")
+        chaves = _chaves(datas, df.get("Ano", pd.Series("", index=df.index)))
+        valores = np.column_stack([np.ones(len(df)), coluna_numerica(df, "Receita"), coluna_numerica(df, "Despesa"), coluna_numerica(df, "Decima")])
+
+        for periodo, chaves_periodo in zip(PERIODOS, chaves):
+            soma = pd.DataFrame(valores, columns=COLUNAS_VALORES).groupby(chaves_periodo).sum()
+            resumo._totais[periodo] = {k: linha for k, linha in zip(soma.index, soma.to_numpy())}
+        for numero, k, linha in zip(df["_num"].tolist(), zip(*chaves), valores):
+            resumo._atas[numero] = (k, linha)
+        return resumo
+
+    def _aplicar(self, chaves, valores, sinal):
+        for periodo, chave in zip(PERIODOS, chaves):
+            totais = self._totais[periodo]
+            total = totais.get(chave, np.zeros(len(COLUNAS_VALORES))) + sinal * valores
+            if total[0] > 0: totais[chave] = total
+            else: totais.pop(chave, None)
+
+    def registrar(self, numero, data, ano_tematico, receita, despesa, decima):
+        """Grava (ou corrige) a ata ``numero``: só os períodos dela (antigos e novos) mudam."""
+        numero = int(numero)
+        antigo = self._atas.pop(numero, None)
+        if antigo is not None: self._aplicar(*antigo, -1)
+        datas = pd.to_datetime(pd.Series([str(data).strip()]), format="%d/%m/%Y", errors="coerce")
+        chaves = tuple(c[0] for c in _chaves(datas, pd.Series([ano_tematico])))
+        valores = np.array([1.0, receita, despesa, decima], dtype=float)
+        self._atas[numero] = (chaves, valores)
+        self._aplicar(chaves, valores, +1)
+
+    def tabela(self, periodo):
+        """Totais do período (Mês, Ano ou Ano Temático), com o resultado (receita - despesa - décima)."""
+        itens = sorted(self._totais[periodo].items())
+        valores = np.array([v for _, v in itens], dtype=float).reshape(-1, len(COLUNAS_VALORES))
+        df = pd.DataFrame(valores, columns=COLUNAS_VALORES).round(2)
+        df.insert(0, periodo, [k for k, _ in itens])
+        df["Atas"] = df["Atas"].astype(int)
+        df["Resultado"] = (df["Receita"] - df["Despesa"] - df["Décima"]).round(2)
+        return df
+
+    def exportar_csv(self, periodo):
+        """CSV no padrão do Excel brasileiro (; e vírgula decimal)."""
+        return self.tabela(periodo).to_csv(index=False, sep=";", decimal=",").encode("utf-8-sig")
+
+    def exportar_xlsx(self):
+        """Planilha com uma aba por período (requer openpyxl)."""
+        saida = io.BytesIO()
+        with pd.ExcelWriter(saida, engine="openpyxl") as planilha:
+            for periodo in PERIODOS: self.tabela(periodo).to_excel(planilha, sheet_name=periodo, index=False)
+        return saida.getvalue()
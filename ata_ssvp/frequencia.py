@@ -0,0 +1,114 @@
+"""
+Matriz de frequência membro x ata.
+
+As colunas Presentes/Ausencias do Historico são separadas uma única vez e guardadas numa
+matriz int8 (uma linha por membro da aba Membros, uma coluna por ata, em ordem de número).
+Taxas, sequências de faltas e faltas justificadas/injustificadas em qualquer intervalo de
+datas são operações vetorizadas sobre essa matriz; gravar uma ata altera só a coluna dela.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from ata_ssvp.linhas import atas_numeradas, texto
+
+SEM_REGISTRO, PRESENTE, JUSTIFICADA, INJUSTIFICADA = 0, 1, 2, 3
+
+_ITEM = re.compile(r'\s*([^,(]+?)\s*(\([^)]*\))?\s*(?:,|$)')
+
+
+def separar_nomes(texto_nomes):
+    """'Ana, Bruno (Doente, viagem), Carla' -> [('Ana', False), ('Bruno', True), ('Carla', False)] (True = com motivo)."""
+    return [(m.group(1), m.group(2) is not None) for m in _ITEM.finditer(texto(texto_nomes)) if m.group(1)]
+
+def _data(valor):
+    data = pd.to_datetime(texto(valor).strip(), format="%d/%m/%Y", errors="coerce")
+    return np.datetime64("NaT", "D") if pd.isna(data) else np.datetime64(data.date(), "D")
+
+
+class MatrizFrequencia:
+    def __init__(self, membros):
+        self.membros = list(membros)
+        self._idx = {nome: i for i, nome in enumerate(self.membros)}
+        self.numeros = np.zeros(0, dtype=np.int64)
+        self.datas = np.zeros(0, dtype="datetime64[D]")
+        self.matriz = np.zeros((len(self.membros), 0), dtype=np.int8)
+
+    @classmethod
+    def do_historico(cls, df_hist, membros):
+        """Monta a matriz de todas as atas numeradas do Historico (número repetido: vale a primeira linha)."""
+        freq = cls(membros)
+        df = atas_numeradas(df_hist)
+        if df.empty: return freq
+        df = df.sort_values("_num", kind="stable")
+        freq.numeros = df["_num"].to_numpy()
+        freq.datas = np.array([_data(d) for d in df.get("Data", [""] * len(df))], dtype="datetime64[D]")
+        freq.matriz = np.zeros((len(freq.membros), len(df)), dtype=np.int8)
+        for j, (presentes, ausencias) in enumerate(zip(df.get("Presentes", [""] * len(df)), df.get("Ausencias", [""] * len(df)))):
+            freq._preencher(j, presentes, ausencias)
+        return freq
+
+    def _preencher(self, j, presentes, ausencias):
+        coluna = self.matriz[:, j]
+        coluna[:] = SEM_REGISTRO
+        for nome, _ in separar_nomes(presentes):
+            if nome in self._idx: coluna[self._idx[nome]] = PRESENTE
+        for nome, justificada in separar_nomes(ausencias):
+            if nome in self._idx: coluna[self._idx[nome]] = JUSTIFICADA if justificada else INJUSTIFICADA
+
+    def registrar(self, numero, data, presentes, ausencias):
+        """Grava (ou corrige) a coluna da ata ``numero``."""
+        numero = int(numero)
+        j = int(np.searchsorted(self.numeros, numero))
+        if j == len(self.numeros) or self.numeros[j] != numero:
+            self.numeros = np.insert(self.numeros, j, numero)
+            self.datas = np.insert(self.datas, j, _data(data))
+            self.matriz = np.insert(self.matriz, j, SEM_REGISTRO, axis=1)
+        else:
+            self.datas[j] = _data(data)
+        self._preencher(j, presentes, ausencias)
+
+    def _colunas(self, inicio=None, fim=None):
+        mascara = np.ones(len(self.numeros), dtype=bool)
+        if inicio is not None: mascara &= self.datas >= np.datetime64(inicio, "D")
+        if fim is not None: mascara &= self.datas <= np.datetime64(fim, "D")
+        return mascara
+
+    @staticmethod
+    def _sequencias(faltas):
+        """Maior sequência e sequência atual (terminando na última ata) de True em cada linha."""
+        n_linhas, n_cols = faltas.shape
+        maior = np.zeros(n_linhas, dtype=np.int64)
+        if not n_cols: return maior, maior.copy()
+        bordas = np.diff(np.pad(faltas.astype(np.int8), ((0, 0), (1, 1))), axis=1)
+        linhas, inicios = np.nonzero(bordas == 1)
+        _, fins = np.nonzero(bordas == -1)  # mesma ordem (linha, coluna) dos inícios
+        np.maximum.at(maior, linhas, fins - inicios)
+        invertida = ~faltas[:, ::-1]
+        atual = np.where(invertida.any(axis=1), invertida.argmax(axis=1), n_cols)
+        return maior, atual
+
+    def resumo(self, inicio=None, fim=None):
+        """Uma linha por membro com presenças, faltas (justificadas ou não), taxa e sequências de faltas no intervalo."""
+        m = self.matriz[:, self._colunas(inicio, fim)]
+        presencas = (m == PRESENTE).sum(axis=1)
+        justificadas = (m == JUSTIFICADA).sum(axis=1)
+        injustificadas = (m == INJUSTIFICADA).sum(axis=1)
+        reunioes = presencas + justificadas + injustificadas
+        # Atas sem nenhum nome reconhecido (texto fora do padrão) ficam fora das sequências
+        registradas = m[:, (m != SEM_REGISTRO).any(axis=0)] if m.size else m
+        maior, atual = self._sequencias(registradas >= JUSTIFICADA)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            taxa = np.where(reunioes > 0, presencas / np.maximum(reunioes, 1), np.nan)
+        return pd.DataFrame({
+            "Membro": self.membros, "Reuniões": reunioes, "Presenças": presencas,
+            "Faltas Justificadas": justificadas, "Faltas Injustificadas": injustificadas,
+            "Frequência (%)": np.round(taxa * 100, 1), "Maior Sequência de Faltas": maior,
+            "Faltas Seguidas Atuais": atual,
+        })
+
+    def presencas_por_ata(self, inicio=None, fim=None):
+        """Quantos membros vieram a cada ata do intervalo."""
+        mascara = self._colunas(inicio, fim)
+        return pd.Series((self.matriz[:, mascara] == PRESENTE).sum(axis=0), index=self.numeros[mascara], name="Presentes")
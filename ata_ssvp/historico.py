@@ -0,0 +1,224 @@
+"""
+Atas de uma conferência: busca, gravação e estruturas derivadas da aba Historico.
+
+Livro caixa, índice de números, busca de texto, frequência e resumo financeiro são
+montados sob demanda a partir do espelho e guardados com a versão do Historico em que
+foram montados; só são refeitos quando o Historico muda por fora. Uma gravação feita por
+aqui atualiza cada estrutura já montada e aceita a nova versão do espelho.
+"""
+import os
+import threading
+
+from ata_ssvp import metricas
+from ata_ssvp.busca import BuscaAtas
+from ata_ssvp.espelho import texto_celula
+from ata_ssvp.financeiro import ResumoFinanceiro
+from ata_ssvp.frequencia import MatrizFrequencia
+from ata_ssvp.indice import IndiceAtas, normalizar_numero
+from ata_ssvp.livro_caixa import LivroCaixa
+
+ABA = "Historico"
+MAX_RENUMERACOES = 5
+_TRAVAS = {}  # planilha -> trava dos salvamentos (todos os espelhos dela no processo)
+_TRAVA_TRAVAS = threading.Lock()
+
+
+def trava_da_planilha(espelho):
+    """Trava dos salvamentos na planilha do ``espelho``, a mesma para todos os espelhos dela."""
+    with _TRAVA_TRAVAS: return _TRAVAS.setdefault(espelho.chave, threading.Lock())
+
+
+def montar_linha_historico(dados, col_num):
+    """``dados_ata`` -> linha do Historico ({coluna: valor})."""
+    return {
+        col_num: str(dados['num_ata']).strip(),
+        "Data": dados['data_reuniao'],
+        "Ano": dados['ano_tematico'],
+        "Presidente": dados['pres_nome'],
+        "Secretario": dados['secretario_nome'],
+        "Leitura": dados['leitura_fonte'],
+        "Presentes": dados['lista_presentes_txt'],
+        "Ausencias": dados['ausencias'],
+        "Visitantes": dados['lista_visitantes_txt'],
+        "Receita": dados['receita'],
+        "Despesa": dados['despesa'],
+        "Decima": dados['decima'],
+        "Saldo": dados['saldo'],
+        "Socioeconomico": dados['socioeconomico'],
+        "Noticias": dados['noticias_trabalhos'],
+        "Palavra_Franca": dados['palavra_franca'],
+        "Escala": dados['escala_visitas'],
+        "Expediente": dados['expediente'],
+        "Palavra_Visitantes": dados['palavra_visitantes'],
+        "Leitor": dados['leitor_nome'],
+        "Status_Ata_Anterior": dados['status_ata_ant'],
+        "Tesoureiro": dados['tes_nome'],
+        "Musica": dados['musica_final'],
+        "Hora_Inicio": dados['hora_inicio'],
+        "Hora_Fim": dados['hora_fim'],
+        "Local": dados['local'],
+        "Cargo": dados['secretario_cargo']
+    }
+
+
+class HistoricoAtas:
+    def __init__(self, espelho, pasta=None):
+        self.espelho = espelho
+        self.pasta = pasta  # onde fica o índice de busca em disco (None = só em memória)
+        self.estruturas = {}  # nome -> (estrutura, versão do Historico)
+
+    def _derivada(self, nome, montar):
+        """Estrutura ``nome`` em dia com o espelho; só é remontada quando o Historico muda por fora."""
+        versao = self.espelho.versao(ABA)
+        with metricas.medir("cache", f"historico.{nome}") as campos:
+            campos["acerto"] = nome in self.estruturas and self.estruturas[nome][1] == versao
+            if not campos["acerto"]: self.estruturas[nome] = (montar(), versao)
+            return self.estruturas[nome][0]
+
+    def _em_dia(self):
+        """Após uma gravação nossa (já aplicada nas estruturas), aceita a nova versão do espelho."""
+        versao = self.espelho.versao(ABA)
+        for nome, (estrutura, _) in list(self.estruturas.items()): self.estruturas[nome] = (estrutura, versao)
+
+    def livro_caixa(self):
+        return self._derivada("livro_caixa", lambda: LivroCaixa.do_historico(self.espelho.ler(ABA)))
+
+    def indice(self):
+        return self._derivada("indice", lambda: IndiceAtas.do_espelho(self.espelho, ABA))
+
+    def busca(self):
+        """Índice de texto, persistido ao lado do espelho (refeito só se o Historico mudou por fora)."""
+        caminho = os.path.join(self.pasta, "busca.sqlite3") if self.pasta else ":memory:"
+        return self._derivada("busca", lambda: BuscaAtas.do_espelho(caminho, self.espelho, ABA))
+
+    def frequencia(self, membros):
+        """Matriz membro x ata; remontada também quando a lista de membros muda."""
+        montar = lambda: MatrizFrequencia.do_historico(self.espelho.ler(ABA), membros)
+        freq = self._derivada("frequencia", montar)
+        if freq.membros != list(membros):
+            self.estruturas.pop("frequencia", None)
+            freq = self._derivada("frequencia", montar)
+        return freq
+
+    def financeiro(self):
+        return self._derivada("financeiro", lambda: ResumoFinanceiro.do_historico(self.espelho.ler(ABA)))
+
+    def saldo_anterior(self, numero):
+        """Saldo final da ata anterior a ``numero`` (consulta direta no livro caixa)."""
+        return self.livro_caixa().saldo_anterior(numero)
+
+    def buscar_ata(self, numero):
+        """Linha da ata ``numero`` (colunas sem espaços nas pontas) ou None; localizada pelo índice de números."""
+        indice = self.indice()
+        if not indice.col_num: raise LookupError("Coluna ID não encontrada.")
+        posicao = indice.posicao(numero)
+        ata = self.espelho.ler_linha(ABA, posicao) if posicao is not None else None
+        return {str(k).strip(): v for k, v in ata.items()} if ata else None
+
+    def proximo_numero(self, indice=None):
+        """Número livre para uma ata nova: o maior número no Historico (ou em ``indice``) + 1."""
+        if indice is None: indice = self.indice()
+        numeros = [int(n) for n in indice.numeros() if n.isdigit()]
+        return max(numeros, default=0) + 1
+
+    def _com_numero(self, dados, numero, saldo_anterior):
+        """``dados`` com outro número e o saldo refeito sobre o saldo da ata anterior a ele."""
+        movimento = float(dados['receita']) - float(dados['despesa']) - float(dados['decima'])
+        return dict(dados, num_ata=str(numero), saldo=round(float(saldo_anterior) + movimento, 2))
+
+    def salvar(self, dados, base=None, nova=False):
+        """
+        Upsert por linha: o número é procurado no índice (sem ler a aba na nuvem).
+        Ata nova vira um append de uma linha; correção regrava só as células da linha encontrada
+        e, na mesma chamada, o saldo das atas seguintes (propagado pelo livro caixa).
+
+        Vários editores: ``base`` é a linha como foi carregada para correção; a gravação só
+        sobrescreve o que mudou desde então (ver ``EspelhoLocal.atualizar_linhas``) e sobe
+        ``ConflitoEscrita`` se a mesma célula foi mudada por outra pessoa. Com ``nova=True`` um
+        número que já existe não é sobrescrito: a ata recebe o próximo número livre. O append
+        é quem decide entre dois salvamentos simultâneos do mesmo número (vale a linha de cima,
+        como no índice): as linhas que outros acrescentaram no meio chegam junto com o append e,
+        se uma delas tem o nosso número, a nossa linha é renumerada. No processo, os salvamentos
+        de uma mesma planilha passam um de cada vez (``trava_da_planilha``).
+
+        Devolve ("criada" ou "atualizada", ``dados`` como foram gravados); numa falha descarta as estruturas e propaga o erro.
+        """
+        with trava_da_planilha(self.espelho):
+            return self._salvar(dados, base, nova)
+
+    def _salvar(self, dados, base, nova):
+        try:
+            self.espelho.sincronizar([ABA])
+            indice = self.indice()
+            busca = self.busca()
+            if nova and str(dados['num_ata']).strip() in indice:
+                numero = self.proximo_numero()
+                dados = self._com_numero(dados, numero, self.livro_caixa().saldo_anterior(numero))
+            nova_linha = montar_linha_historico(dados, indice.col_num or "Numero")
+            num_atual = str(dados['num_ata']).strip()
+
+            cascata = {}
+            if num_atual.isdigit():
+                cascata = self.livro_caixa().registrar(num_atual, dados['receita'], dados['despesa'], dados['decima'], dados['saldo'])
+            saldos = {indice.posicao(n): {"Saldo": s} for n, s in cascata.items() if n in indice}
+
+            posicao, de_fora = indice.posicao(num_atual), False
+            if posicao is not None:
+                base = {posicao: base} if base else None
+                de_fora = bool(self.espelho.atualizar_linhas(ABA, {posicao: nova_linha, **saldos}, base=base))
+                tipo = "atualizada"
+            else:
+                ultima = self.espelho.ultima_linha(ABA)
+                nova_posicao = self.espelho.anexar_linha(ABA, nova_linha)
+                if saldos: self.espelho.atualizar_linhas(ABA, saldos)
+                if nova_posicao is None: self.estruturas.pop("indice", None)  # aba reescrita: índices mudaram
+                else:
+                    de_fora = nova_posicao > ultima - 1
+                    if de_fora: dados = self._resolver_numero(indice, dados, range(ultima - 1, nova_posicao), nova_posicao)
+                    indice.registrar(dados['num_ata'], nova_posicao)
+                tipo = "criada"
+            if de_fora:
+                self.estruturas.clear()  # outros gravaram no meio: remontadas do espelho, que já tem tudo
+                return tipo, dados
+            if num_atual.isdigit():  # só as estruturas que já foram montadas
+                if "frequencia" in self.estruturas:
+                    self.estruturas["frequencia"][0].registrar(num_atual, dados['data_reuniao'], dados['lista_presentes_txt'], dados['ausencias'])
+                if "financeiro" in self.estruturas:
+                    self.estruturas["financeiro"][0].registrar(num_atual, dados['data_reuniao'], dados['ano_tematico'],
+                                                               dados['receita'], dados['despesa'], dados['decima'])
+            self._em_dia()
+        except Exception:
+            self.estruturas.clear()
+            raise
+        try: busca.registrar(num_atual, nova_linha, self.espelho.versao(ABA))
+        except Exception: self.estruturas.pop("busca", None)  # refeito na próxima consulta
+        return tipo, dados
+
+    def _resolver_numero(self, indice, dados, intermediarias, nova_posicao):
+        """
+        Depois de um append com linhas de outros no meio (``intermediarias``, já no espelho):
+        registra os números delas e, se alguma tomou o nosso, renumera a nossa linha. Outro
+        processo pode ter escolhido o mesmo número novo ao mesmo tempo, então a coluna de número
+        é relida na planilha e a renumeração se repete enquanto uma linha acima da nossa tiver o
+        número que ficou. Devolve ``dados`` com o número que ficou.
+        """
+        col_num = indice.col_num or "Numero"
+        for i in intermediarias:
+            linha = self.espelho.ler_linha(ABA, i)
+            if linha is None: continue
+            numero = next((v for c, v in linha.items() if str(c).strip() == col_num), None)
+            if numero is not None: indice.registrar(numero, i)
+        if indice.posicao(dados['num_ata']) in (None, nova_posicao): return dados
+        for _ in range(MAX_RENUMERACOES):
+            numero = self.proximo_numero(indice)
+            posicao = indice.posicao(numero - 1)
+            anterior = (self.espelho.ler_linha(ABA, posicao) if posicao is not None else None) or {}
+            saldo_anterior = texto_celula(next((v for c, v in anterior.items() if str(c).strip() == "Saldo"), None)) or 0
+            dados = self._com_numero(dados, numero, saldo_anterior)
+            self.espelho.atualizar_linhas(ABA, {nova_posicao: {col_num: dados['num_ata'], "Saldo": dados['saldo']}})
+            remotos = self.espelho.ler_coluna_remota(ABA, col_num)
+            if remotos is None: break
+            outros = {i: v for i, v in remotos.items() if i != nova_posicao and texto_celula(v)}
+            for i, v in sorted(outros.items()): indice.registrar(v, i)
+            if not any(i < nova_posicao and normalizar_numero(v) == dados['num_ata'] for i, v in outros.items()): break
+        return dados
@@ -0,0 +1,51 @@
+"""
+Índice número da ata -> linha do Historico.
+
+Montado uma vez a partir da coluna de número do espelho local e atualizado a cada
+gravação, para que a busca e o "já existe?" do salvamento sejam consultas a um dicionário.
+"""
+import re
+
+from ata_ssvp.linhas import coluna_numero
+
+
+def normalizar_numero(valor):
+    """'12', 12, 12.0 e ' 12.0 ' viram '12'."""
+    return re.sub(r'\.0$', '', str(valor).strip())
+
+
+class IndiceAtas:
+    def __init__(self, col_num=None, posicoes=None):
+        self.col_num = col_num
+        self._posicoes = dict(posicoes or {})
+
+    @classmethod
+    def da_coluna(cls, col_num, serie):
+        """``serie``: valores da coluna de número, indexados como no DataFrame do espelho."""
+        posicoes = {}
+        for indice, valor in serie.items():
+            posicoes.setdefault(normalizar_numero(valor), indice)  # repetido: vale a primeira linha
+        return cls(col_num, posicoes)
+
+    @classmethod
+    def do_espelho(cls, espelho, aba="Historico"):
+        """Lê só a coluna de número do espelho (nunca a aba inteira)."""
+        col_num = coluna_numero(c.strip() for c in espelho.colunas(aba))
+        if col_num is None: return cls()
+        original = next(c for c in espelho.colunas(aba) if c.strip() == col_num)
+        return cls.da_coluna(col_num, espelho.ler_coluna(aba, original))
+
+    def posicao(self, numero):
+        return self._posicoes.get(normalizar_numero(numero))
+
+    def __contains__(self, numero):
+        return normalizar_numero(numero) in self._posicoes
+
+    def __len__(self):
+        return len(self._posicoes)
+
+    def numeros(self):
+        return list(self._posicoes)
+
+    def registrar(self, numero, indice):
+        self._posicoes.setdefault(normalizar_numero(numero), indice)
@@ -0,0 +1,40 @@
+"""
+Linhas do Historico: coluna de número, atas numeradas e valores de célula.
+
+Usado pelo índice, livro caixa, frequência, resumo financeiro, busca e pela regeração em
+lote. A linha de comando também passa por aqui, então pandas só é carregado quando usado.
+"""
+
+
+def coluna_numero(colunas):
+    """Nome da coluna com o número da ata (Numero, Número, Nº...)."""
+    for c in colunas:
+        if any(x in str(c) for x in ("umero", "úmero", "Num", "Nº")): return c
+    return None
+
+def texto(valor):
+    """Célula como texto; vazio e NaN viram ''."""
+    if valor is None or (isinstance(valor, float) and valor != valor): return ""
+    return str(valor)
+
+def coluna_numerica(df, nome):
+    """Coluna ``nome`` como vetor float (não numérico e ausente viram 0)."""
+    import numpy as np
+    import pandas as pd
+    if nome not in df.columns: return np.zeros(len(df))
+    return pd.to_numeric(df[nome], errors="coerce").fillna(0.0).to_numpy(dtype=float)
+
+def atas_numeradas(df_hist):
+    """
+    Historico com as colunas sem espaços nas pontas e só as linhas com número, que fica na
+    coluna ``_num`` (int64). Número repetido: vale a primeira linha, como na busca por número.
+    Sem coluna de número, nenhuma linha.
+    """
+    import numpy as np
+    import pandas as pd
+    df = df_hist.set_axis([str(c).strip() for c in df_hist.columns], axis=1)
+    col_num = coluna_numero(df.columns)
+    if col_num is None: return df.iloc[0:0].assign(_num=np.zeros(0, dtype=np.int64))
+    nums = pd.to_numeric(df[col_num], errors="coerce")
+    df = df[nums.notna()].assign(_num=nums[nums.notna()].astype(np.int64))
+    return df.drop_duplicates("_num", keep="first")
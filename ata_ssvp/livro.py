@@ -0,0 +1,70 @@
+"""
+Livro de Atas: as atas de um período num único PDF, com capa, sumário e numeração contínua.
+
+Os ``dados_ata`` chegam de um iterador (``iterar_dados_ata``) e cada ata é escrita no
+documento assim que é montada, então só o PDF em construção fica em memória, nunca a lista
+de atas nem um PDF por ata. O arquivo é gravado num temporário ao lado do destino e só
+então o substitui (um livro interrompido não deixa um PDF pela metade).
+"""
+import os
+
+from ata_ssvp.documentos import classe_pdf, escrever_ata_pdf, limpar_texto_pdf
+from ata_ssvp.modelo import montar_texto_ata
+
+ATAS_POR_PAGINA_SUMARIO = 33  # linhas de 7 mm numa A4 com as margens do livro
+
+
+def _sumario(pdf, secoes):
+    pdf.set_font("Arial", "B", 16)
+    pdf.cell(0, 12, "Sumário", ln=True, align="C")
+    pdf.ln(4)
+    pdf.set_font("Arial", size=11)
+    largura = pdf.w - pdf.l_margin - pdf.r_margin
+    for secao in secoes:
+        link = pdf.add_link(page=secao.page_number)
+        pdf.cell(largura - 20, 7, secao.name, link=link)
+        pdf.cell(20, 7, str(secao.page_number), ln=True, align="R", link=link)
+
+def _capa(pdf, titulo, subtitulo):
+    pdf.add_page()
+    pdf.set_y(pdf.h / 3)
+    pdf.set_font("Arial", "B", 24)
+    pdf.multi_cell(0, 12, limpar_texto_pdf(titulo), align="C")
+    if subtitulo:
+        pdf.ln(6)
+        pdf.set_font("Arial", size=14)
+        pdf.multi_cell(0, 8, limpar_texto_pdf(subtitulo), align="C")
+
+def gerar_livro(lista_dados, destino, titulo="Livro de Atas", subtitulo="", assinaturas=True, total=None, progresso=None):
+    """
+    Escreve em ``destino`` (caminho) o livro com as atas de ``lista_dados``, uma por página nova.
+    ``assinaturas=False`` omite as laudas de assinatura de cada ata. ``total`` (quantas atas
+    virão) reserva as páginas do sumário: sem ele, um sumário de mais de uma página empurra
+    as páginas seguintes depois do rodapé já escrito. Retorna quantas atas entraram.
+    """
+    pdf = classe_pdf()()
+    pdf.alias_nb_pages()
+    pdf.set_margins(25, 25, 25)
+    _capa(pdf, titulo, subtitulo)
+    if total is None and hasattr(lista_dados, "__len__"): total = len(lista_dados)
+    paginas_sumario = max(1, -(-(total or 0) // ATAS_POR_PAGINA_SUMARIO))
+    pdf.add_page()
+    pdf.insert_toc_placeholder(_sumario, pages=paginas_sumario, allow_extra_pages=True)
+
+    n = 0
+    for dados in lista_dados:
+        if n: pdf.add_page()  # o sumário já deixa a primeira página em branco
+        pdf.start_section(limpar_texto_pdf(f"Ata nº {dados['num_ata']} - {dados['data_reuniao']}"))
+        pdf.set_font("Arial", size=12)
+        escrever_ata_pdf(pdf, dados, montar_texto_ata(dados), assinaturas)
+        n += 1
+        if progresso: progresso(n)
+
+    temporario = destino + ".tmp"
+    try:
+        pdf.output(temporario)
+        os.replace(temporario, destino)
+    except BaseException:
+        if os.path.exists(temporario): os.remove(temporario)
+        raise
+    return n
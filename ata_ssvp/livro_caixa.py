@@ -0,0 +1,79 @@
+"""
+Livro caixa indexado pelo número da ata.
+
+Guarda receita, despesa, décima e o saldo acumulado de cada ata em vetores ordenados
+pelo número, com um dicionário número -> posição. "Saldo antes da ata N" é uma consulta
+direta; corrigir a ata N propaga a diferença aos saldos seguintes numa só operação
+vetorizada e devolve as linhas afetadas para uma gravação em lote.
+"""
+from bisect import bisect_left
+
+import numpy as np
+
+from ata_ssvp.linhas import atas_numeradas, coluna_numerica
+
+
+class LivroCaixa:
+    def __init__(self, numeros, receita, despesa, decima, saldo):
+        ordem = np.argsort(numeros, kind="stable")
+        self.numeros = np.asarray(numeros, dtype=np.int64)[ordem]
+        self.receita = np.asarray(receita, dtype=float)[ordem]
+        self.despesa = np.asarray(despesa, dtype=float)[ordem]
+        self.decima = np.asarray(decima, dtype=float)[ordem]
+        self.saldo = np.asarray(saldo, dtype=float)[ordem]
+        self._reindexar()
+
+    @classmethod
+    def do_historico(cls, df_hist):
+        """Monta o livro a partir do DataFrame do Historico (linhas sem número são ignoradas)."""
+        df = atas_numeradas(df_hist)
+        return cls(df["_num"].to_numpy(), coluna_numerica(df, "Receita"), coluna_numerica(df, "Despesa"),
+                   coluna_numerica(df, "Decima"), coluna_numerica(df, "Saldo"))
+
+    def _reindexar(self):
+        self._pos = {int(n): i for i, n in enumerate(self.numeros)}
+
+    @property
+    def saldo_inicial(self):
+        """Saldo antes da primeira ata registrada."""
+        if not len(self.saldo): return 0.0
+        return float(self.saldo[0] - (self.receita[0] - self.despesa[0] - self.decima[0]))
+
+    def _posicao(self, numero):
+        """Posição da ata ``numero`` ou, se ela não existir, onde ela entraria."""
+        pos = self._pos.get(numero)
+        if pos is not None: return pos
+        if not len(self.numeros) or numero > self.numeros[-1]: return len(self.numeros)
+        return bisect_left(self.numeros, numero)
+
+    def saldo_anterior(self, numero):
+        """Saldo final da ata imediatamente anterior a ``numero``."""
+        pos = self._posicao(int(numero))
+        return float(self.saldo[pos - 1]) if pos > 0 else self.saldo_inicial
+
+    def registrar(self, numero, receita, despesa, decima, saldo=None):
+        """
+        Grava (ou corrige) a ata ``numero`` e propaga a diferença de saldo às atas seguintes.
+        Devolve {número: saldo novo} só das atas posteriores cujo saldo mudou.
+        """
+        numero = int(numero)
+        if saldo is None: saldo = self.saldo_anterior(numero) + receita - despesa - decima
+        saldo = round(float(saldo), 2)
+        pos = self._pos.get(numero)
+        if pos is None:
+            pos = self._posicao(numero)
+            antigo = self.saldo_anterior(numero)  # saldo que as atas seguintes assumiam
+            self.numeros = np.insert(self.numeros, pos, numero)
+            self.receita = np.insert(self.receita, pos, receita)
+            self.despesa = np.insert(self.despesa, pos, despesa)
+            self.decima = np.insert(self.decima, pos, decima)
+            self.saldo = np.insert(self.saldo, pos, saldo)
+            self._reindexar()
+            delta = saldo - antigo if pos < len(self.numeros) - 1 else 0.0
+        else:
+            delta = saldo - self.saldo[pos]
+            self.receita[pos], self.despesa[pos], self.decima[pos], self.saldo[pos] = receita, despesa, decima, saldo
+
+        if not round(delta, 2): return {}
+        self.saldo[pos + 1:] = np.round(self.saldo[pos + 1:] + delta, 2)
+        return dict(zip(self.numeros[pos + 1:].tolist(), self.saldo[pos + 1:].tolist()))
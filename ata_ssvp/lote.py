@@ -0,0 +1,121 @@
+"""
+Regeração em lote das atas do Historico (auditorias do Conselho Particular).
+
+As linhas viram ``dados_ata``, são renderizadas num pool de processos e cada arquivo
+vai direto para um ZIP em disco assim que fica pronto, sem manter o lote em memória.
+"""
+import multiprocessing
+import os
+import re
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+
+from ata_ssvp.cache_render import chave_dados
+from ata_ssvp.documentos import FORMATOS, renderizar_ata
+from ata_ssvp.linhas import coluna_numero
+from ata_ssvp.modelo import eh_valido
+
+
+def selecionar_atas(df_hist, inicio=None, fim=None, ano=None):
+    """Filtra o Historico por faixa de números e/ou Ano Temático, em ordem de número."""
+    import pandas as pd
+    df = df_hist.copy()
+    df.columns = df.columns.str.strip()
+    col_num = coluna_numero(df.columns)
+    if col_num is None: return df.iloc[0:0]
+    nums = pd.to_numeric(df[col_num], errors="coerce")
+    mascara = nums.notna()
+    if inicio is not None: mascara &= nums >= inicio
+    if fim is not None: mascara &= nums <= fim
+    if ano:
+        if "Ano" in df.columns: mascara &= df["Ano"].astype(str).str.strip() == str(ano).strip()
+        else:
+            # Sem coluna Ano: usa o ano civil que aparece no nome do Ano Temático
+            achado = re.search(r"\d{4}", str(ano))
+            if achado: mascara &= df["Data"].astype(str).str.strip().str.endswith(achado.group())
+    return df[mascara].iloc[nums[mascara].argsort().to_numpy()]
+
+def linha_para_dados_ata(linha, config, col_num="Numero"):
+    """
+    Monta ``dados_ata`` a partir de uma linha do Historico. Da Config vêm só os dados da
+    Conferência; o que a reunião teve (leitor, horários, local, tesoureiro...) vem da linha, e
+    o que uma linha antiga não guarda fica vazio e o trecho sai do texto da ata.
+    """
+    def t(chave, padrao=""):
+        valor = linha.get(chave)
+        return str(valor).strip() if eh_valido(valor) else padrao
+    def v(chave):
+        try: return float(linha.get(chave) or 0.0)
+        except (TypeError, ValueError): return 0.0
+    try: num = str(int(float(linha.get(col_num))))
+    except (TypeError, ValueError, OverflowError): num = t(col_num)
+    return {
+        'num_ata': num, 'conf_nome': config.get('nome_conf',''),
+        'cons_particular': config.get('cons_particular',''), 'cons_central': config.get('cons_central',''),
+        'data_fundacao': str(config.get('data_fundacao','')), 'data_agregacao': str(config.get('data_agregacao','')),
+        'ano_tematico': t('Ano'), 'data_reuniao': t('Data'),
+        'hora_inicio': t('Hora_Inicio'), 'local': t('Local'), 'pres_nome': t('Presidente'),
+        'leitura_fonte': t('Leitura'), 'leitor_nome': t('Leitor'), 'status_ata_ant': t('Status_Ata_Anterior'),
+        'lista_presentes_txt': t('Presentes'), 'ausencias': t('Ausencias', "Não houve."),
+        'lista_visitantes_txt': t('Visitantes'),
+        'receita': v('Receita'), 'despesa': v('Despesa'), 'decima': v('Decima'), 'saldo': v('Saldo'),
+        'tes_nome': t('Tesoureiro'), 'socioeconomico': t('Socioeconomico'), 'noticias_trabalhos': t('Noticias'),
+        'escala_visitas': t('Escala'), 'palavra_franca': t('Palavra_Franca'), 'expediente': t('Expediente'),
+        'palavra_visitantes': t('Palavra_Visitantes'), 'mov_financeiro_extra': '',
+        'musica_final': t('Musica'), 'hora_fim': t('Hora_Fim'),
+        'secretario_nome': t('Secretario'), 'secretario_cargo': t('Cargo'), 'cidade_estado': config.get('cidade_padrao','')
+    }
+
+def iterar_dados_ata(df_hist, config):
+    """Gera os ``dados_ata`` das linhas, um de cada vez."""
+    col_num = coluna_numero(df_hist.columns) or "Numero"
+    for linha in df_hist.to_dict("records"):
+        yield linha_para_dados_ata(linha, config, col_num)
+
+def _renderizar_no_pool(dados, formatos):
+    """``renderizar_ata`` num processo do pool. Um erro volta como RuntimeError: exceções que não
+    se deixam desserializar (as do fpdf, por exemplo) quebrariam o pool inteiro."""
+    try: return renderizar_ata(dados, formatos)
+    except Exception as e: raise RuntimeError(f"{type(e).__name__}: {e}") from None
+
+def gerar_zip_lote(lista_dados, destino, formatos=FORMATOS, processos=None, progresso=None, cache=None, falhas=None):
+    """
+    Renderiza ``lista_dados`` em todos os núcleos e grava cada arquivo no ZIP ``destino``
+    (caminho ou arquivo aberto) na ordem de entrada. No máximo dois documentos por processo
+    ficam em trânsito. ``progresso(n)`` é chamado a cada ata processada. Com ``cache``
+    (CacheRender), atas já renderizadas nem vão para o pool. Uma ata que falha não derruba o
+    lote: fica fora do ZIP e, se ``falhas`` for uma lista, entra nela como (número, erro).
+    Retorna o total gravado.
+    """
+    processos = processos or os.cpu_count() or 1
+    tarefa = partial(_renderizar_no_pool, formatos=tuple(formatos))
+    total, processadas = 0, 0
+    # spawn: os processos filhos não herdam as threads do Streamlit
+    with zipfile.ZipFile(destino, "w", zipfile.ZIP_DEFLATED) as zf, \
+         ProcessPoolExecutor(processos, mp_context=multiprocessing.get_context("spawn")) as pool:
+        pendentes = deque()
+
+        def gravar_proximo():
+            nonlocal total, processadas
+            chave, num, item = pendentes.popleft()
+            processadas += 1
+            if isinstance(item, Future):
+                try: _, item = item.result()
+                except Exception as e:
+                    if falhas is not None: falhas.append((num, str(e)))
+                    item = None
+                if item is not None and cache is not None: cache.guardar(chave, item)
+            if item is not None:
+                for ext, conteudo in item.items(): zf.writestr(f"Ata_{num}.{ext}", conteudo)
+                total += 1
+            if progresso: progresso(processadas)
+
+        for dados in lista_dados:
+            chave = chave_dados(dados, formatos) if cache is not None else None
+            pronto = cache.obter(chave, formatos) if cache is not None else None
+            pendentes.append((chave, dados['num_ata'], pronto if pronto is not None else pool.submit(tarefa, dados)))
+            if len(pendentes) >= 2 * processos: gravar_proximo()
+        while pendentes: gravar_proximo()
+    return total
@@ -0,0 +1,83 @@
+"""
+Cadastro de membros: registro indexado, importação em lote e edição por diferença.
+
+O ``RegistroMembros`` guarda a ordem da aba Membros e um dicionário nome -> posição, então
+"está na lista?" e "qual a posição?" (selectbox, multiselect da chamada) não percorrem a
+lista. Uma importação (lista colada ou CSV) vira uma diferença contra a aba, aplicada com
+um único append das linhas novas e um único batchUpdate das linhas removidas.
+"""
+import csv
+import io
+
+ABA, COLUNA = "Membros", "Nome"
+
+
+class RegistroMembros:
+    def __init__(self, nomes):
+        self.nomes = list(nomes)
+        self._posicoes = {}
+        for i, nome in enumerate(self.nomes): self._posicoes.setdefault(nome, i)
+
+    def __contains__(self, nome):
+        return nome in self._posicoes
+
+    def __iter__(self):
+        return iter(self.nomes)
+
+    def __len__(self):
+        return len(self.nomes)
+
+    def indice(self, nome, padrao=0):
+        """Posição de ``nome`` (para o ``index`` dos selectbox); ``padrao`` se não for membro."""
+        try: return self._posicoes.get(nome, padrao)
+        except TypeError: return padrao  # nome não hashable (ex.: lista vinda de uma célula estranha)
+
+
+def _normalizar(nome):
+    return " ".join(str(nome).split())
+
+def interpretar_lista(texto):
+    """
+    Nomes de uma lista colada (um por linha) ou de um CSV (coluna 'Nome' se houver cabeçalho,
+    senão a primeira). Espaços são normalizados; vazios e repetidos ficam de fora, na ordem.
+    """
+    linhas = [l for l in str(texto or "").splitlines() if l.strip()]
+    if not linhas: return []
+    try: dialeto = csv.Sniffer().sniff(linhas[0], delimiters=",;\t")
+    except csv.Error: dialeto = None
+    if dialeto is None: valores = linhas
+    else:
+        registros = list(csv.reader(io.StringIO("\n".join(linhas)), dialeto))
+        cab = [_normalizar(c).lower() for c in registros[0]]
+        coluna = cab.index("nome") if "nome" in cab else 0
+        if "nome" in cab: registros = registros[1:]
+        valores = [r[coluna] for r in registros if len(r) > coluna]
+    vistos, nomes = set(), []
+    for valor in map(_normalizar, valores):
+        if valor and valor.lower() != "nome" and valor not in vistos:
+            vistos.add(valor); nomes.append(valor)
+    return nomes
+
+def diferenca(atuais, desejados, substituir=False):
+    """(novos, removidos): quem entra e, se ``substituir``, quem sai para a aba ficar igual a ``desejados``."""
+    atuais_set, desejados_set = set(atuais), set(desejados)
+    novos = [n for n in desejados if n not in atuais_set]
+    removidos = [n for n in atuais if n not in desejados_set] if substituir else []
+    return novos, removidos
+
+def ler_membros(espelho):
+    df = espelho.ler(ABA)
+    if df.empty or COLUNA not in df.columns: return RegistroMembros([])
+    return RegistroMembros(df[COLUNA].dropna().astype(str).tolist())
+
+def aplicar_diferenca(espelho, novos, removidos):
+    """Remove (um batchUpdate) e acrescenta (um append) de uma vez. Devolve (acrescentados, removidos)."""
+    df = espelho.ler(ABA, atualizar=True)
+    atuais = df[COLUNA].dropna().astype(str).to_dict() if COLUNA in df.columns else {}  # índice -> nome
+    removidos = set(removidos)
+    indices = [i for i, nome in atuais.items() if nome in removidos]
+    existentes = set(atuais.values()) - removidos
+    novos = [n for n in novos if n not in existentes]
+    if indices: espelho.remover_linhas(ABA, indices)
+    if novos: espelho.anexar_linhas(ABA, [{COLUNA: n} for n in novos])
+    return len(novos), len(indices)
@@ -0,0 +1,144 @@
+"""
+Medições por rerun e por sessão: chamadas à API do Sheets, caches e geração de documentos.
+
+Cada sessão tem um ``Medicoes`` (na session_state) que, no início do rerun, vira o coletor
+atual num ContextVar; threads que recebem o contexto (``no_contexto``) continuam contando
+para a sessão e o rerun que as disparou. Todo evento também entra em ``PROCESSO``, junto
+com o que roda em segundo plano sem sessão (sincronização do espelho, credenciais).
+"""
+import contextvars
+import functools
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+
+_atual = contextvars.ContextVar("medicoes", default=(None, None))  # (Medicoes, número do rerun)
+_falta_cache = contextvars.ContextVar("falta_cache", default=False)
+
+
+def tamanho(obj):
+    """Bytes aproximados de um resultado: bytes/str, DataFrame ou estrutura serializável em JSON."""
+    if obj is None: return 0
+    if isinstance(obj, (bytes, bytearray, str)): return len(obj)
+    if hasattr(obj, "memory_usage"):
+        try: return int(obj.memory_usage(deep=True).sum())
+        except Exception: return 0
+    if not isinstance(obj, (dict, list, tuple)): return 0
+    try: return len(json.dumps(obj, default=str))
+    except Exception: return 0
+
+
+class Medicoes:
+    def __init__(self, max_reruns=50, max_eventos=5000):
+        self.sessao = uuid.uuid4().hex[:8]
+        self.reruns = deque(maxlen=max_reruns)  # {"rerun", "inicio", "ms", "eventos"}
+        self.eventos = deque(maxlen=max_eventos)
+        self.totais = {}  # (tipo, nome) -> chamadas, ms, bytes, acertos, faltas, erros
+        self._n = 0
+        self._trava = threading.Lock()
+
+    def iniciar_rerun(self):
+        """Abre um rerun novo e torna esta sessão o coletor da thread atual."""
+        with self._trava:
+            self._n += 1
+            self.reruns.append({"rerun": self._n, "inicio": time.perf_counter(), "ms": None, "eventos": []})
+            _atual.set((self, self._n))
+
+    def coletar(self):
+        """Torna esta sessão o coletor da thread atual sem abrir rerun (execução só de um fragmento; conta no último rerun)."""
+        if _atual.get()[0] is not self: _atual.set((self, self._n))
+
+    def encerrar_rerun(self):
+        """Fecha o rerun atual registrando a duração do script."""
+        medicoes, n = _atual.get()
+        if medicoes is not self: return
+        with self._trava: rerun = next((r for r in reversed(self.reruns) if r["rerun"] == n), None)
+        if rerun is None or rerun["ms"] is not None: return
+        rerun["ms"] = round(1000 * (time.perf_counter() - rerun["inicio"]), 1)
+        registrar("rerun", "script", rerun["ms"])
+
+    def _adicionar(self, evento):
+        with self._trava:
+            self.eventos.append(evento)
+            if evento["sessao"] == self.sessao:
+                rerun = next((r for r in reversed(self.reruns) if r["rerun"] == evento["rerun"]), None)
+                if rerun is not None: rerun["eventos"].append(evento)
+            t = self.totais.setdefault((evento["tipo"], evento["nome"]),
+                                       {"chamadas": 0, "ms": 0.0, "bytes": 0, "acertos": 0, "faltas": 0, "erros": 0})
+            t["chamadas"] += 1
+            t["ms"] += evento["ms"]
+            t["bytes"] += evento["bytes"]
+            if evento["acerto"] is True: t["acertos"] += 1
+            elif evento["acerto"] is False: t["faltas"] += 1
+            if evento["erro"]: t["erros"] += 1
+
+    def rerun_anterior(self):
+        """Último rerun já encerrado (o atual ainda está em andamento quando o painel é desenhado)."""
+        with self._trava:
+            return next((dict(r, eventos=list(r["eventos"])) for r in reversed(self.reruns) if r["ms"] is not None), None)
+
+    def resumo(self):
+        """Totais por (tipo, operação), do mais demorado ao mais rápido."""
+        with self._trava: itens = [(k, dict(v)) for k, v in self.totais.items()]
+        linhas = [{"Tipo": tipo, "Operação": nome, "Chamadas": t["chamadas"], "ms": round(t["ms"], 1),
+                   "ms/chamada": round(t["ms"] / t["chamadas"], 1), "KB": round(t["bytes"] / 1024, 1),
+                   "Acertos": t["acertos"], "Faltas": t["faltas"], "Erros": t["erros"]} for (tipo, nome), t in itens]
+        return sorted(linhas, key=lambda l: -l["ms"])
+
+    def exportar_jsonl(self):
+        """Um evento por linha (ts, sessao, rerun, tipo, nome, ms, bytes, acerto, erro e extras)."""
+        with self._trava: eventos = list(self.eventos)
+        return "".join(json.dumps(e, ensure_ascii=False, default=str) + "\n" for e in eventos)
+
+
+PROCESSO = Medicoes(max_eventos=20000)
+
+
+def registrar(tipo, nome, ms, bytes=0, acerto=None, erro=False, **extra):
+    """Registra um evento na sessão/rerun do contexto atual (se houver) e no processo."""
+    medicoes, rerun = _atual.get()
+    evento = {"ts": round(time.time(), 3), "sessao": medicoes.sessao if medicoes else None, "rerun": rerun,
+              "tipo": tipo, "nome": nome, "ms": round(ms, 3), "bytes": int(bytes), "acerto": acerto, "erro": erro, **extra}
+    if medicoes is not None: medicoes._adicionar(evento)
+    PROCESSO._adicionar(evento)
+
+
+@contextmanager
+def medir(tipo, nome, **extra):
+    """Mede o bloco; o dicionário devolvido aceita ``bytes`` e ``acerto`` preenchidos pelo bloco."""
+    campos = {"bytes": 0, "acerto": None, **extra}
+    inicio, erro = time.perf_counter(), False
+    try: yield campos
+    except BaseException:
+        erro = True
+        raise
+    finally: registrar(tipo, nome, 1000 * (time.perf_counter() - inicio), erro=erro, **campos)
+
+
+def no_contexto(funcao):
+    """``funcao`` presa ao contexto atual, para rodar noutra thread contando para esta sessão e rerun."""
+    return functools.partial(contextvars.copy_context().run, funcao)
+
+
+def falta_cache():
+    """Chamado dentro de uma função com ``st.cache_data``: o corpo só roda quando o cache falha."""
+    _falta_cache.set(True)
+
+
+def cache_medido(nome):
+    """Decora uma função já cacheada pelo Streamlit registrando tempo e acerto/falta (o corpo chama ``falta_cache``)."""
+    def decorar(cacheada):
+        @functools.wraps(cacheada)
+        def medida(*args, **kw):
+            token = _falta_cache.set(False)
+            try:
+                with medir("cache", nome) as campos:
+                    try: return cacheada(*args, **kw)
+                    finally: campos["acerto"] = not _falta_cache.get()
+            finally: _falta_cache.reset(token)
+        medida.clear = cacheada.clear
+        return medida
+    return decorar
@@ -0,0 +1,99 @@
+"""
+Texto da ata, compartilhado pelos geradores de DOCX e PDF.
+
+O modelo é compilado uma vez na importação (trechos literais + campos) e o texto é
+montado uma única vez por ``dados_ata``; os valores por extenso ficam em cache (o num2words
+só é importado no primeiro valor).
+"""
+from functools import lru_cache
+from string import Formatter
+
+
+def eh_valido(valor):
+    """
+    Retorna False se o valor for vazio, nulo, zero, nan ou NaT.
+    Usado para impedir que campos vazios apareçam na impressão.
+    """
+    if valor is None: return False
+    s = str(valor).strip().lower()
+    valores_invalidos = ["", "nan", "none", "null", "false", "0", "0.0", "nat", "nattype"]
+    return s not in valores_invalidos
+
+@lru_cache(maxsize=4096)
+def _valor_extenso(valor):
+    from num2words import num2words
+    extenso = num2words(valor, lang='pt_BR', to='currency')
+    numero = f"{valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+    return f"R$ {numero} ({extenso})"  # só o número troca os separadores: "mil, duzentos" fica com a vírgula
+
+def formatar_valor_extenso(valor):
+    try:
+        if not valor: return "R$ 0,00"
+        return _valor_extenso(float(valor))
+    except: return "R$ 0,00"
+
+# Cada trecho: (campo que precisa ser válido para o trecho entrar, molde do texto)
+TRECHOS_ATA = (
+    (None, "Ata nº {num_ata} da reunião ordinária da Conferência {conf_nome} da Sociedade de São Vicente de Paulo"),
+    ("data_fundacao", ", fundada em {data_fundacao}"),
+    ("data_agregacao", ", agregada em {data_agregacao}"),
+    (None, ", vinculada ao Conselho Particular {cons_particular}, área do Central de {cons_central}, realizada"),
+    ("hora_inicio", " às {hora_inicio}"),
+    (None, " do dia {data_reuniao} do Ano Temático: {ano_tematico}"),
+    ("local", ", na sala de reuniões {local}"),
+    (None, "."),
+    (None, " Louvado seja nosso Senhor Jesus Cristo! A reunião foi iniciada pelo Presidente, {pres_nome}, com as orações regulamentares da Sociedade de São Vicente de Paulo."),
+    (None, " A leitura espiritual foi tirada do(a) {leitura_fonte}"),
+    ("leitor_nome", ", proclamada por {leitor_nome}"),
+    (None, "."),
+    ("status_ata_ant", " A ata anterior foi lida e {status_ata_ant}."),
+    (None, " Em seguida foi feita a chamada, com a presença dos Confrades, Consócias e Aspirantes: {lista_presentes_txt}."),
+    ("lista_visitantes_txt", " Presenças dos visitantes: {lista_visitantes_txt}."),
+    (None, " Movimento do Caixa: em seguida {tes} apresentou o estado do caixa: Receita total: {rec}; Despesa total: {des}; Décima semanal: {dec}; Saldo final: {sal}."),
+    ("lista_visitantes_txt", " Agradecimentos aos visitantes."),
+    ("socioeconomico", " Levantamento Socioeconômico: {socioeconomico}."),
+    ("noticias_trabalhos", " Notícias dos trabalhos da semana: {noticias_trabalhos}."),
+    ("escala_visitas", " Novas nomeações (escala de visitas): {escala_visitas}."),
+    ("palavra_franca", " Palavra franca: {palavra_franca}."),
+    ("expediente", " Expediente: {expediente}."),
+    ("palavra_visitantes", " Palavra dos Visitantes: {palavra_visitantes}."),
+    (None, " Coleta Secreta: em seguida {tes_col} fez a coleta secreta"),
+    ("musica_final", ", enquanto os demais cantavam {musica_final}"),
+    (None, "."),
+    (None, " Nada mais havendo a tratar, a reunião foi encerrada com as orações finais regulamentares da Sociedade de São Vicente de Paulo"),
+    ("hora_fim", ", às {hora_fim}"),
+    (None, "."),
+    (None, " Para constar, eu, {secretario_nome}"),
+    ("secretario_cargo", ", {secretario_cargo}"),
+    (None, ", lavrei a presente ata, que dato e assino."),
+)
+
+def compilar_modelo(trechos):
+    """Quebra cada molde em pares (literal, campo) para montar o texto sem reinterpretar o formato."""
+    return tuple(
+        (condicao, tuple((literal, campo) for literal, campo, _, _ in Formatter().parse(molde)))
+        for condicao, molde in trechos
+    )
+
+MODELO_ATA = compilar_modelo(TRECHOS_ATA)
+CONDICOES_ATA = frozenset(c for c, _ in TRECHOS_ATA if c)
+
+def montar_texto_ata(dados):
+    """Monta o parágrafo da ata a partir de ``dados_ata``."""
+    valores = dict(dados)
+    valores['rec'] = formatar_valor_extenso(dados['receita'])
+    valores['des'] = formatar_valor_extenso(dados['despesa'])
+    valores['dec'] = formatar_valor_extenso(dados['decima'])
+    valores['sal'] = formatar_valor_extenso(dados['saldo'])
+    tem_tesoureiro = eh_valido(dados['tes_nome'])
+    valores['tes'] = f"o(a) Tesoureiro(a) {dados['tes_nome']}" if tem_tesoureiro else "o Tesoureiro"
+    valores['tes_col'] = f"o(a) tesoureiro(a) {dados['tes_nome']}" if tem_tesoureiro else "o tesoureiro"
+    validos = {c: eh_valido(valores[c]) for c in CONDICOES_ATA}
+
+    partes = []
+    for condicao, pedacos in MODELO_ATA:
+        if condicao and not validos[condicao]: continue
+        for literal, campo in pedacos:
+            partes.append(literal)
+            if campo is not None: partes.append(str(valores[campo]))
+    return "".join(partes)
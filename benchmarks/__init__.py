@@ -0,0 +1 @@
+"""Benchmarks offline do gerador de atas (sem Google Sheets: ver ``conexao_falsa``)."""
@@ -0,0 +1,184 @@
+"""
+Teste de carga do app: N sessões simuladas (``AppTest``) contra uma ``ConexaoFalsa``.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.carga --sessoes 1 5 10 --salvamentos 2 --latencia 0.05 --taxa-429 0.02
+
+Cada sessão faz login pelo formulário, edita a ata (chamada, tesouraria, relatórios; cada
+edição é um rerun completo: no navegador ela reexecuta só a seção do formulário, mas o
+``AppTest`` não roda fragmentos sozinhos, então o tempo de rerun aqui é o pior caso) e clica em "Gerar/Salvar Ata" ``--salvamentos``
+vezes, esperando cada salvamento terminar. As sessões rodam em threads do mesmo processo,
+como num servidor Streamlit: caches, pool de conferências, executor e agendador (com a
+cota real de 60 chamadas por minuto) são compartilhados, então a cota e a CPU aparecem nos
+números. O ``AppTest`` usa um Runtime global, então um rerun de cada vez (a CPU do script
+disputa o GIL de todo jeito); salvamento e renderização, no executor, correm em paralelo.
+
+Antes de medir, uma sessão de aquecimento faz o percurso inteiro uma vez (imports, pool,
+partida a frio e estruturas do Historico ficam fora dos números, como num servidor já no ar). Para cada N são informados reruns por segundo, tempo de
+rerun, chamadas à API por sessão, latência do salvamento (do clique até a gravação
+terminar) e memória por sessão (tracemalloc; o tempo inclui o custo dele, como em ``executar``).
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.conexao_falsa import ESCRITAS, LEITURAS, MEMBROS, ConexaoFalsa
+from benchmarks.executar import imprimir
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+SENHA = "carga"
+_TRAVA_RERUN = threading.Lock()
+COLUNAS = ("sessoes", "reruns_por_s", "rerun_p50_ms", "rerun_p95_ms", "leituras_por_sessao", "escritas_por_sessao",
+           "erros_429", "salvar_p50_ms", "salvar_p95_ms", "memoria_por_sessao_kb", "falhas")
+TITULOS = ("Sessões", "Reruns/s", "Rerun p50", "Rerun p95", "Leit./sessão", "Escr./sessão",
+           "429", "Salvar p50", "Salvar p95", "KB/sessão", "Falhas")
+
+
+def percentil(valores, p):
+    if not valores: return None
+    ordenados = sorted(valores)
+    return round(ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))], 1)
+
+
+def conexao_com_usuarios(n_sessoes, n_atas, latencia, taxa_429, semente):
+    """ConexaoFalsa com um usuário por sessão (todos com a senha ``SENHA``)."""
+    import bcrypt
+    conexao = ConexaoFalsa(n_atas, latencia, taxa_429, semente)
+    hash_senha = bcrypt.hashpw(SENHA.encode(), bcrypt.gensalt(4)).decode()
+    conexao.abas["Usuarios"] = [["username", "name", "password", "role"]] + \
+        [[f"sec{i}", f"Secretário {i}", hash_senha, "editor"] for i in range(n_sessoes)]
+    return conexao
+
+
+class Sessao:
+    """Um navegador: um ``AppTest`` com os tempos de cada rerun e de cada salvamento."""
+    def __init__(self, indice, timeout):
+        from streamlit.testing.v1 import AppTest
+        self.indice = indice
+        self.app = AppTest.from_file(APP, default_timeout=timeout)
+        self.app.secrets["cookie_chave"] = "chave do teste de carga"
+        self.reruns, self.salvamentos = [], []
+
+    def rodar(self):
+        with _TRAVA_RERUN:
+            self.inicio_rerun = inicio = time.perf_counter()
+            self.app.run()
+            self.reruns.append(1000 * (time.perf_counter() - inicio))
+        if self.app.exception: raise RuntimeError(self.app.exception[0].value)
+
+    def _widget(self, tipo, rotulo):
+        return next(w for w in getattr(self.app, tipo) if w.label == rotulo)
+
+    def login(self):
+        self.rodar()
+        self.app.text_input[0].input(f"sec{self.indice}")
+        self.app.text_input[1].input(SENHA)
+        next(b for b in self.app.button if b.label == "Login").click()
+        self.rodar()
+        if not self.app.session_state["authentication_status"]: raise RuntimeError("login recusado")
+
+    def editar(self, rodada):
+        presentes = MEMBROS[:len(MEMBROS) - 2 - (self.indice + rodada) % 4]
+        self._widget("multiselect", "1️⃣ Quem veio?").set_value(presentes); self.rodar()
+        self._widget("number_input", "Receita").set_value(100.0 + self.indice + rodada); self.rodar()
+        self._widget("number_input", "Despesa").set_value(40.0 + rodada); self.rodar()
+        self._widget("text_area", "Socioeconômico").input(f"Sessão {self.indice}: duas famílias visitadas."); self.rodar()
+        self._widget("text_area", "Notícias").input(f"Relatório da rodada {rodada} da sessão {self.indice}. " * 20); self.rodar()
+
+    def salvar(self, timeout):
+        fim = threading.Event()
+        next(b for b in self.app.button if b.label == "💾 Gerar/Salvar Ata").click()
+        self.rodar()
+        inicio = self.inicio_rerun  # o clique conta de quando o rerun começa, não da espera pela trava
+        tarefa = self.app.session_state["tarefa_ata"]
+        tarefa["salvar"].add_done_callback(lambda f: fim.set())
+        if not fim.wait(timeout): raise TimeoutError("salvamento não terminou")
+        self.salvamentos.append(1000 * (time.perf_counter() - inicio))
+        ok = tarefa["salvar"].exception() is None and tarefa["salvar"].result()[0]
+        tarefa["render"].result(timeout)
+        self.rodar()  # o rerun que o painel da tarefa faz ao terminar
+        if not ok: raise RuntimeError("salvamento falhou")
+
+    def executar(self, salvamentos, timeout):
+        self.login()
+        for rodada in range(salvamentos):
+            self.editar(rodada)
+            self.salvar(timeout)
+
+
+def _limpar_streamlit():
+    """Entre uma rodada e outra: nada de pool, espelho ou cache de dados da rodada anterior."""
+    import streamlit as st
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def rodada(n_sessoes, salvamentos=1, n_atas=100, latencia=0.0, taxa_429=0.0, semente=0, timeout=300):
+    """N sessões ao mesmo tempo contra uma planilha falsa nova; devolve as métricas da rodada."""
+    import streamlit
+    conexao = conexao_com_usuarios(n_sessoes, n_atas, latencia, taxa_429, semente)
+    streamlit.connection = lambda *a, **k: conexao
+    _limpar_streamlit()
+    os.chdir(tempfile.mkdtemp(prefix="carga_"))  # .cache/ (espelho, documentos) novo a cada rodada
+    Sessao(0, timeout).executar(1, timeout)  # aquecimento
+    conexao.zerar_contagem()
+
+    sessoes = [Sessao(i, timeout) for i in range(n_sessoes)]
+    tracemalloc.start()
+    antes, _ = tracemalloc.get_traced_memory()
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_sessoes) as pool:
+        futuros = [pool.submit(s.executar, salvamentos, timeout) for s in sessoes]
+        falhas = [str(f.exception()) for f in futuros if f.exception() is not None]
+    decorrido = time.perf_counter() - inicio
+    depois, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    reruns = [ms for s in sessoes for ms in s.reruns]
+    salvar = [ms for s in sessoes for ms in s.salvamentos]
+    return {"sessoes": n_sessoes, "segundos": round(decorrido, 2), "reruns": len(reruns),
+            "reruns_por_s": round(len(reruns) / decorrido, 2),
+            "rerun_p50_ms": percentil(reruns, 50), "rerun_p95_ms": percentil(reruns, 95),
+            "leituras_por_sessao": round(sum(conexao.chamadas[m] for m in LEITURAS) / n_sessoes, 1),
+            "escritas_por_sessao": round(sum(conexao.chamadas[m] for m in ESCRITAS) / n_sessoes, 1),
+            "erros_429": conexao.chamadas["429"],
+            "salvar_p50_ms": percentil(salvar, 50), "salvar_p95_ms": percentil(salvar, 95),
+            "memoria_por_sessao_kb": round((depois - antes) / 1024 / n_sessoes, 1),
+            "falhas": len(falhas), "erros": falhas}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga do app com sessões simuladas e planilha falsa.")
+    parser.add_argument("--sessoes", type=int, nargs="+", default=[1, 5, 10], help="sessões simultâneas em cada rodada")
+    parser.add_argument("--salvamentos", type=int, default=1, help="atas salvas por sessão")
+    parser.add_argument("--atas", type=int, default=100, help="tamanho do Historico")
+    parser.add_argument("--latencia", type=float, default=0.05, help="segundos de atraso por chamada à API falsa")
+    parser.add_argument("--taxa-429", type=float, default=0.0, help="fração das chamadas que falha com 429")
+    parser.add_argument("--timeout", type=float, default=300, help="espera máxima por rerun e por salvamento (s)")
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    pasta = os.getcwd()
+    resultados = []
+    try:
+        for n in args.sessoes:
+            resultados.append(rodada(n, args.salvamentos, args.atas, args.latencia, args.taxa_429, args.semente, args.timeout))
+            for erro in resultados[-1]["erros"]: print(f"[{n} sessões] {erro}")
+    finally:
+        os.chdir(pasta)
+    imprimir(resultados, COLUNAS, TITULOS)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"latencia": args.latencia, "taxa_429": args.taxa_429, "salvamentos": args.salvamentos,
+                       "resultados": resultados}, f, ensure_ascii=False, indent=2)
+    return resultados
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+GSheetsConnection falsa, em memória, para benchmarks.
+
+Imita o que o app usa da conexão real — ``read``/``update`` e, via ``client``, a planilha e
+as abas do gspread (values_get, values_batch_get, col_values, append_row(s), batch_update,
+deleteDimension, get_lastUpdateTime) — com uma latência fixa por chamada e um contador de chamadas.
+Com ``taxa_429``, essa fração das chamadas falha como uma cota estourada do Google.
+"""
+import random
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pandas as pd
+from gspread.utils import a1_to_rowcol, rowcol_to_a1
+
+from ata_ssvp.espelho import valores_para_dataframe
+
+LEITURAS = ("read", "abrir_planilha", "abrir_aba", "get_lastUpdateTime", "values_get", "values_batch_get", "col_values")
+ESCRITAS = ("update", "append_row", "append_rows", "batch_update", "planilha_batch_update")
+
+MEMBROS = ["Ana Souza", "Bruno Lima", "Carla Dias", "Davi Rocha", "Elisa Melo", "Fábio Reis", "Gabriela Nunes",
+           "Heitor Alves", "Irene Castro", "João Pedro", "Karla Moura", "Lucas Freitas", "Marta Gomes", "Nilson Prado"]
+COLUNAS_HISTORICO = ["Numero", "Data", "Ano", "Presidente", "Secretario", "Leitura", "Presentes", "Ausencias", "Visitantes",
+                     "Receita", "Despesa", "Decima", "Saldo", "Socioeconomico", "Noticias", "Palavra_Franca", "Escala", "Expediente",
+                     "Palavra_Visitantes", "Leitor", "Status_Ata_Anterior", "Tesoureiro", "Musica", "Hora_Inicio", "Hora_Fim", "Local", "Cargo"]
+
+
+class ErroCota(Exception):
+    """Como o APIError do gspread num 429 (o ``Agendador`` olha ``response.status_code``)."""
+    def __init__(self):
+        super().__init__("APIError: [429]: Quota exceeded (simulado)")
+        self.response = SimpleNamespace(status_code=429)
+
+
+def historico_ficticio(n_atas):
+    """Matriz (cabeçalho + linhas) de um Historico com ``n_atas`` reuniões semanais."""
+    linhas, saldo, inicio = [COLUNAS_HISTORICO], 0.0, date(2000, 1, 3)
+    for i in range(1, n_atas + 1):
+        presentes = [m for j, m in enumerate(MEMBROS) if (i + j) % 5]
+        ausentes = [f"{m} (viagem)" if j % 2 else m for j, m in enumerate(MEMBROS) if not (i + j) % 5]
+        receita, despesa, decima = float(50 + i % 40), float(20 + i % 25), float(i % 3)
+        saldo = round(saldo + receita - despesa - decima, 2)
+        linhas.append([i, (inicio + timedelta(weeks=i)).strftime("%d/%m/%Y"), f"Ano Temático {2000 + i // 52}",
+                       MEMBROS[0], MEMBROS[1], "Mateus 25, 31-46", ", ".join(presentes), ", ".join(ausentes), "",
+                       receita, despesa, decima, saldo, f"Família {i % 97}: cesta básica e acompanhamento.",
+                       f"Visita à família {i % 97} sobre aluguel atrasado e remédios.", "Avisos da paróquia.", "", "", "",
+                       MEMBROS[2], "aprovada sem ressalvas", MEMBROS[3], "Hino de Ozanam", "20:00", "21:30", "Salão Paroquial", "1º Secretário(a)"])
+    return linhas
+
+
+class _Aba:
+    def __init__(self, conexao, nome):
+        self._conexao, self.nome = conexao, nome
+        self.id = list(conexao.abas).index(nome)
+        self.spreadsheet = _Planilha(conexao)
+
+    @property
+    def _linhas(self):
+        return self._conexao.abas[self.nome]
+
+    def col_values(self, coluna, value_render_option=None):
+        self._conexao._chamar("col_values")
+        valores = [l[coluna - 1] if len(l) >= coluna else "" for l in self._linhas]
+        while valores and valores[-1] in ("", None): valores.pop()
+        return valores
+
+    def append_row(self, valores, value_input_option=None, table_range=None):
+        self._conexao._chamar("append_row", escrita=True)
+        with self._conexao.trava:
+            self._linhas.append(list(valores))
+            n = len(self._linhas)
+        return {"updates": {"updatedRange": f"'{self.nome}'!A{n}:{rowcol_to_a1(n, len(valores))}"}}
+
+    def append_rows(self, valores, value_input_option=None, table_range=None):
+        self._conexao._chamar("append_rows", escrita=True)
+        with self._conexao.trava:
+            inicio = len(self._linhas) + 1
+            self._linhas.extend(list(v) for v in valores)
+            n = len(self._linhas)
+        return {"updates": {"updatedRange": f"'{self.nome}'!A{inicio}:{rowcol_to_a1(n, max(len(v) for v in valores))}"}}
+
+    def batch_update(self, celulas, value_input_option=None):
+        self._conexao._chamar("batch_update", escrita=True)
+        with self._conexao.trava:
+            for celula in celulas:
+                linha, coluna = a1_to_rowcol(celula["range"].split("!")[-1].split(":")[0])
+                while len(self._linhas) < linha: self._linhas.append([])
+                destino = self._linhas[linha - 1]
+                destino.extend([""] * (coluna - len(destino)))
+                destino[coluna - 1] = celula["values"][0][0]
+
+
+class _Planilha:
+    def __init__(self, conexao):
+        self._conexao = conexao
+
+    def get_lastUpdateTime(self):
+        self._conexao._chamar("get_lastUpdateTime")
+        return str(self._conexao.versao)
+
+    def _intervalo(self, intervalo):
+        aba, _, celulas = intervalo.partition("!")
+        linhas = self._conexao.abas[aba.strip("'")]
+        if not celulas: return [list(l) for l in linhas]
+        inicio, _, fim = celulas.partition(":")
+        l0, c0 = a1_to_rowcol(inicio)
+        l1, c1 = a1_to_rowcol(fim or inicio)
+        return [list(l[c0 - 1:c1]) for l in linhas[l0 - 1:l1]]
+
+    def values_get(self, intervalo, params=None):
+        self._conexao._chamar("values_get")
+        return {"values": self._intervalo(intervalo)}
+
+    def batch_update(self, corpo):
+        """Só os pedidos deleteDimension (ROWS), que é o que o espelho usa."""
+        self._conexao._chamar("planilha_batch_update", escrita=True)
+        nomes = list(self._conexao.abas)
+        with self._conexao.trava:
+            for pedido in corpo["requests"]:
+                intervalo = pedido["deleteDimension"]["range"]
+                del self._conexao.abas[nomes[intervalo["sheetId"]]][intervalo["startIndex"]:intervalo["endIndex"]]
+        return {}
+
+    def values_batch_get(self, intervalos, params=None):
+        self._conexao._chamar("values_batch_get")
+        return {"valueRanges": [{"values": self._intervalo(i)} for i in intervalos]}
+
+
+class _Cliente:
+    def __init__(self, conexao):
+        self._conexao = conexao
+
+    def _open_spreadsheet(self, **kw):
+        self._conexao._chamar("abrir_planilha")
+        return _Planilha(self._conexao)
+
+    def _select_worksheet(self, worksheet=None, **kw):
+        self._conexao._chamar("abrir_aba")
+        return _Aba(self._conexao, worksheet)
+
+
+class ConexaoFalsa:
+    def __init__(self, n_atas=100, latencia=0.0, taxa_429=0.0, semente=0):
+        self.latencia = latencia
+        self.taxa_429 = taxa_429
+        self._sorteio = random.Random(semente)
+        self.chamadas = Counter()
+        self.versao = 0
+        self.trava = threading.Lock()
+        self.abas = {
+            "Config": [["Chave", "Valor"], ["ultima_ata", n_atas], ["nome_conf", "Conferência São José"], ["horario_padrao", "20:00"]],
+            "Membros": [["Nome"]] + [[m] for m in MEMBROS],
+            "Anos": [["Ano"], ["Ano Temático 2025"], ["Ano Temático 2026"]],
+            "Usuarios": [["username", "name", "password", "role"], ["adm", "Admin", "x", "admin"]],
+            "Historico": historico_ficticio(n_atas),
+        }
+        self.client = _Cliente(self)
+
+    def _chamar(self, metodo, escrita=False):
+        if self.latencia: time.sleep(self.latencia)
+        with self.trava:
+            self.chamadas[metodo] += 1
+            if self.taxa_429 and self._sorteio.random() < self.taxa_429:
+                self.chamadas["429"] += 1
+                raise ErroCota()
+            if escrita: self.versao += 1
+
+    def zerar_contagem(self):
+        with self.trava: self.chamadas.clear()
+
+    def contagem(self):
+        """(leituras, escritas) desde a última ``zerar_contagem``."""
+        with self.trava:
+            return sum(self.chamadas[m] for m in LEITURAS), sum(self.chamadas[m] for m in ESCRITAS)
+
+    def read(self, worksheet=None, ttl=None, **kw):
+        self._chamar("read")
+        with self.trava: linhas = [list(l) for l in self.abas[worksheet]]
+        return valores_para_dataframe(linhas)
+
+    def update(self, worksheet=None, data=None, **kw):
+        self._chamar("update", escrita=True)
+        df = data.astype(object).where(pd.notna(data), "")
+        with self.trava: self.abas[worksheet] = [list(df.columns)] + df.values.tolist()
@@ -0,0 +1,137 @@
+"""
+Benchmarks dos caminhos quentes: geração dos documentos e camada de dados do Historico.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.executar --atas 10 100 1000 10000 --latencia 0.05 --json resultado.json
+
+Para cada tamanho de Historico, cada operação roda contra uma ``ConexaoFalsa`` nova e
+informa tempo de parede por execução, pico de memória (tracemalloc) e quantas leituras e
+escritas da API cada execução fez. O tempo inclui o custo do tracemalloc, então compare
+resultados medidos sempre do mesmo jeito.
+"""
+import argparse
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.conexao_falsa import MEMBROS, ConexaoFalsa
+from ata_ssvp.agendador import Agendador
+from ata_ssvp.documentos import gerar_docx, gerar_pdf_nativo
+from ata_ssvp.espelho import ABAS, EspelhoLocal
+from ata_ssvp.historico import HistoricoAtas
+from ata_ssvp.modelo import _valor_extenso, formatar_valor_extenso
+
+
+def dados_exemplo(numero, saldo=0.0):
+    presentes = MEMBROS[:10]
+    return {
+        'num_ata': str(numero), 'conf_nome': 'Conferência São José', 'cons_particular': 'CP Centro',
+        'cons_central': 'CC Diocesano', 'data_fundacao': '01/01/1990', 'data_agregacao': '01/06/1991',
+        'ano_tematico': 'Ano Temático 2026', 'data_reuniao': '14/10/2026', 'hora_inicio': '20:00',
+        'local': 'Salão Paroquial', 'pres_nome': MEMBROS[0], 'leitura_fonte': 'Mateus 25, 31-46',
+        'leitor_nome': MEMBROS[2], 'status_ata_ant': 'aprovada sem ressalvas',
+        'lista_presentes_txt': ", ".join(presentes), 'ausencias': ", ".join(f"{m} (viagem)" for m in MEMBROS[10:]),
+        'lista_visitantes_txt': '', 'receita': 150.0, 'despesa': 80.5, 'decima': 15.0, 'saldo': saldo + 54.5,
+        'tes_nome': MEMBROS[3], 'socioeconomico': 'Três famílias acompanhadas; uma cesta básica extra.' * 3,
+        'noticias_trabalhos': 'Visita à família Conceição sobre o aluguel atrasado e remédios.' * 3,
+        'escala_visitas': 'Ana e Bruno: família 12.', 'palavra_franca': 'Avisos da paróquia.',
+        'expediente': 'Ofício do Conselho Particular.', 'palavra_visitantes': '', 'mov_financeiro_extra': 'Coleta regular',
+        'musica_final': 'Hino de Ozanam', 'hora_fim': '21:30', 'secretario_nome': MEMBROS[1],
+        'secretario_cargo': '1º Secretário(a)', 'cidade_estado': 'Belo Horizonte - MG',
+    }
+
+
+def _espelho(conexao, pasta):
+    """Espelho já sincronizado, com um agendador sem limite de cota (o benchmark não deve esperar fichas)."""
+    agendador = Agendador(leituras_por_minuto=10 ** 9, escritas_por_minuto=10 ** 9)
+    espelho = EspelhoLocal(conexao, f"{pasta}/espelho.sqlite3", agendador=agendador)
+    espelho.ler_varias(ABAS)
+    return espelho
+
+
+def medir(nome, n_atas, repeticoes, funcao, conexao=None):
+    """Roda ``funcao(i)`` para i em range(repeticoes) e devolve as métricas por execução."""
+    if conexao: conexao.zerar_contagem()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    for i in range(repeticoes): funcao(i)
+    decorrido = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    leituras, escritas = conexao.contagem() if conexao else (0, 0)
+    return {"operacao": nome, "atas": n_atas, "repeticoes": repeticoes,
+            "ms_por_execucao": round(1000 * decorrido / repeticoes, 3), "pico_memoria_kb": round(pico / 1024, 1),
+            "leituras_por_execucao": round(leituras / repeticoes, 2), "escritas_por_execucao": round(escritas / repeticoes, 2)}
+
+
+def benchmarks_documentos(repeticoes):
+    dados = dados_exemplo(1)
+    valores = [round(random.uniform(0, 10000), 2) for _ in range(1000)]
+    def extenso(i):
+        _valor_extenso.cache_clear()  # mede o custo sem o cache
+        for v in valores: formatar_valor_extenso(v)
+    return [
+        medir("formatar_valor_extenso (1000 valores)", None, repeticoes, extenso),
+        medir("gerar_docx", None, repeticoes, lambda i: gerar_docx(dados)),
+        medir("gerar_pdf_nativo", None, repeticoes, lambda i: gerar_pdf_nativo(dados)),
+    ]
+
+
+def benchmarks_dados(n_atas, latencia, repeticoes):
+    resultados = []
+    with tempfile.TemporaryDirectory() as pasta:
+        conexao = ConexaoFalsa(n_atas, latencia)
+        resultados.append(medir("partida a frio (todas as abas)", n_atas, 1,
+                                lambda i: _espelho(conexao, f"{pasta}/frio"), conexao))
+
+        historico = HistoricoAtas(_espelho(conexao, pasta), pasta)
+        resultados.append(medir("montagem das estruturas do Historico", n_atas, 1,
+                                lambda i: (historico.indice(), historico.livro_caixa(), historico.busca()), conexao))
+
+        sorteados = [random.randint(1, n_atas) for _ in range(repeticoes)]
+        resultados.append(medir("buscar_ata_para_edicao", n_atas, repeticoes,
+                                lambda i: historico.buscar_ata(sorteados[i]), conexao))
+
+        saldo = historico.saldo_anterior(n_atas + 1)
+        resultados.append(medir("salvar_historico_cloud (ata nova)", n_atas, repeticoes,
+                                lambda i: historico.salvar(dados_exemplo(n_atas + 1 + i, saldo)), conexao))
+
+        meio = max(1, n_atas // 2)
+        resultados.append(medir("salvar_historico_cloud (correção com cascata)", n_atas, repeticoes,
+                                lambda i: historico.salvar(dados_exemplo(meio, historico.saldo_anterior(meio) + i)), conexao))
+    return resultados
+
+
+def imprimir(resultados, colunas=None, titulos=None):
+    colunas = colunas or ("operacao", "atas", "repeticoes", "ms_por_execucao", "pico_memoria_kb", "leituras_por_execucao", "escritas_por_execucao")
+    titulos = titulos or ("Operação", "Atas", "Rep.", "ms/exec", "Pico KB", "Leit./exec", "Escr./exec")
+    linhas = [titulos] + [tuple("-" if r[c] is None else str(r[c]) for c in colunas) for r in resultados]
+    larguras = [max(len(l[i]) for l in linhas) for i in range(len(colunas))]
+    for n, linha in enumerate(linhas):
+        print("  ".join(v.ljust(w) if i == 0 else v.rjust(w) for i, (v, w) in enumerate(zip(linha, larguras))))
+        if n == 0: print("  ".join("-" * w for w in larguras))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks offline do gerador de atas.")
+    parser.add_argument("--atas", type=int, nargs="+", default=[10, 100, 1000, 10000], help="tamanhos do Historico")
+    parser.add_argument("--latencia", type=float, default=0.0, help="segundos de atraso por chamada à API falsa")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    random.seed(args.semente)
+    resultados = benchmarks_documentos(args.repeticoes)
+    for n_atas in args.atas: resultados += benchmarks_dados(n_atas, args.latencia, args.repeticoes)
+    imprimir(resultados)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"latencia": args.latencia, "resultados": resultados}, f, ensure_ascii=False, indent=2)
+    return resultados
+
+
+if __name__ == "__main__":
+    main()
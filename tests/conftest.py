@@ -0,0 +1,61 @@
+"""
+Dados de teste: ``dados_ata`` e Historico pequenos montados aqui, a planilha falsa dos
+benchmarks e espelhos sobre ela, sem limite de cota.
+"""
+import pandas as pd
+import pytest
+
+from ata_ssvp.agendador import Agendador
+from ata_ssvp.espelho import ABAS, EspelhoLocal
+from benchmarks.conexao_falsa import ConexaoFalsa
+
+MEMBROS = ["Ana Souza", "Bruno Lima", "Carla Dias", "Davi Rocha", "Elisa Melo"]
+
+
+def dados_ata(numero, saldo=0.0, **campos):
+    """``dados_ata`` completo da ata ``numero``; ``saldo`` é o saldo anterior (o movimento é 54,50)."""
+    dados = {
+        'num_ata': str(numero), 'conf_nome': 'São José', 'cons_particular': 'Centro', 'cons_central': 'Diocesano',
+        'data_fundacao': '01/01/1990', 'data_agregacao': '01/06/1991', 'ano_tematico': 'Ano Temático 2026',
+        'data_reuniao': '14/10/2026', 'hora_inicio': '20:00', 'local': 'Salão Paroquial', 'pres_nome': MEMBROS[0],
+        'leitura_fonte': 'Mateus 25, 31-46', 'leitor_nome': MEMBROS[2], 'status_ata_ant': 'aprovada sem ressalvas',
+        'lista_presentes_txt': ", ".join(MEMBROS[:3]), 'ausencias': f"{MEMBROS[3]} (viagem), {MEMBROS[4]}",
+        'lista_visitantes_txt': '', 'receita': 150.0, 'despesa': 80.5, 'decima': 15.0, 'saldo': round(saldo + 54.5, 2),
+        'tes_nome': MEMBROS[3], 'socioeconomico': 'Duas famílias acompanhadas.', 'noticias_trabalhos': 'Visita à família Conceição.',
+        'escala_visitas': '', 'palavra_franca': 'Avisos da paróquia.', 'expediente': '', 'palavra_visitantes': '',
+        'mov_financeiro_extra': '', 'musica_final': 'Hino de Ozanam', 'hora_fim': '21:30', 'secretario_nome': MEMBROS[1],
+        'secretario_cargo': 'Secretário(a)', 'cidade_estado': 'Belo Horizonte - MG',
+    }
+    dados.update(campos)
+    return dados
+
+
+def historico(*linhas):
+    """DataFrame do Historico a partir de (número, data, ano temático, receita, despesa, décima, saldo, presentes, ausências)."""
+    colunas = ["Numero", "Data", "Ano", "Receita", "Despesa", "Decima", "Saldo", "Presentes", "Ausencias"]
+    return pd.DataFrame([dict(zip(colunas, linha)) for linha in linhas], columns=colunas)
+
+
+def escrever_de_fora(conexao, aba, linha, coluna, valor):
+    """Outro editor mudando uma célula direto na planilha (``linha`` conta o cabeçalho como 1)."""
+    conexao.abas[aba][linha - 1][coluna] = valor
+    conexao.versao += 1
+
+
+@pytest.fixture
+def conexao():
+    return ConexaoFalsa(n_atas=10)
+
+
+@pytest.fixture
+def novo_espelho(conexao, tmp_path):
+    """Fábrica de espelhos da mesma planilha, cada um com o seu arquivo (como outro editor)."""
+    criados = []
+    def criar():
+        agendador = Agendador(leituras_por_minuto=10 ** 9, escritas_por_minuto=10 ** 9)
+        espelho = EspelhoLocal(conexao, str(tmp_path / f"espelho{len(criados)}.sqlite3"), agendador=agendador)
+        espelho.ler_varias(ABAS)
+        criados.append(espelho)
+        return espelho
+    yield criar
+    for espelho in criados: espelho.parar()
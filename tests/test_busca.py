@@ -0,0 +1,57 @@
+import pytest
+
+from ata_ssvp.busca import BuscaAtas, montar_consulta
+from tests.conftest import historico
+
+
+@pytest.fixture
+def busca():
+    df = historico((1, "07/01/2026", "", 0, 0, 0, 0, "Ana, Bruno", ""), (2, "14/01/2026", "", 0, 0, 0, 0, "Carla", ""),
+                   (2, "21/01/2026", "", 0, 0, 0, 0, "Repetida", ""))
+    df["Noticias"] = ["Visita à família Conceição: aluguel atrasado.", "Cesta básica para a família Araújo.", "Conceição"]
+    b = BuscaAtas(":memory:")
+    b.reconstruir(df, versao=1)
+    return b
+
+
+def test_consulta_com_prefixo():
+    assert montar_consulta("aluguel, família!") == '"aluguel"* "família"*'
+    assert montar_consulta("  ") == ""
+
+
+def test_sem_acentos_e_sem_maiusculas(busca):
+    assert [r["numero"] for r in busca.buscar("conceicao")] == ["1"]
+    assert [r["numero"] for r in busca.buscar("ARAUJO cesta")] == ["2"]
+    assert sorted(r["numero"] for r in busca.buscar("famil")) == ["1", "2"]
+
+
+def test_trecho_destaca_o_termo(busca):
+    resultado = busca.buscar("aluguel")[0]
+    assert "**aluguel**" in resultado["trecho"] and resultado["data"] == "07/01/2026"
+
+
+def test_numero_repetido_vale_a_primeira_linha(busca):
+    assert busca.buscar("repetida") == []
+
+
+def test_registrar_atualiza_so_a_ata_e_a_versao(busca):
+    busca.registrar("2.0", {"Data": "14/01/2026", "Noticias": "Reunião com o pároco."}, versao=2)
+    assert busca.buscar("araujo") == []
+    assert [r["numero"] for r in busca.buscar("paroco")] == ["2"]
+    assert [r["numero"] for r in busca.buscar("conceicao")] == ["1"]
+    assert busca.versao == "2"
+
+
+def test_indice_em_disco_refeito_so_quando_a_versao_muda(tmp_path):
+    class Espelho:
+        def __init__(self): self.lidas = 0
+        def versao(self, aba): return 5
+        def ler(self, aba):
+            self.lidas += 1
+            df = historico((1, "07/01/2026", "", 0, 0, 0, 0, "", ""))
+            df["Noticias"] = ["Conceição"]
+            return df
+    espelho, caminho = Espelho(), str(tmp_path / "busca.sqlite3")
+    BuscaAtas.do_espelho(caminho, espelho)
+    assert [r["numero"] for r in BuscaAtas.do_espelho(caminho, espelho).buscar("conceicao")] == ["1"]
+    assert espelho.lidas == 1
@@ -0,0 +1,51 @@
+import os
+
+from ata_ssvp import cache_render
+from ata_ssvp.cache_render import CacheRender, chave_dados
+from tests.conftest import dados_ata
+
+
+def test_chave_independe_da_ordem_e_do_tipo_numerico():
+    dados = dados_ata(7)
+    invertido = dict(reversed(list(dados.items())))
+    assert chave_dados(dados) == chave_dados(invertido)
+    assert chave_dados(dados) == chave_dados(dict(dados, receita=150))
+    assert chave_dados(dados) != chave_dados(dict(dados, receita=151.0))
+    assert chave_dados(dados) != chave_dados(dados, formatos=("pdf",))
+
+
+def test_lru_em_memoria_descarta_o_usado_ha_mais_tempo():
+    cache = CacheRender(max_itens=2)
+    cache.guardar("a", {"pdf": b"1"}); cache.guardar("b", {"pdf": b"22"})
+    cache.obter("a")
+    cache.guardar("c", {"pdf": b"333"})
+    assert cache.obter("b") is None and cache.obter("a") == {"pdf": b"1"}
+    assert cache.bytes_memoria == 4
+
+
+def test_limite_de_bytes_em_memoria_mantem_o_item_novo():
+    cache = CacheRender(max_bytes_memoria=5)
+    cache.guardar("a", {"pdf": b"123"})
+    cache.guardar("b", {"pdf": b"123456"})
+    assert cache.obter("a") is None and cache.obter("b") == {"pdf": b"123456"}
+
+
+def test_disco_serve_outro_processo_e_respeita_o_limite(tmp_path):
+    CacheRender(pasta=str(tmp_path)).guardar("a", {"pdf": b"x" * 10, "docx": b"y" * 10})
+    assert CacheRender(pasta=str(tmp_path)).obter("a") == {"pdf": b"x" * 10, "docx": b"y" * 10}
+
+    pequeno = CacheRender(pasta=str(tmp_path), max_bytes_disco=25)
+    os.utime(tmp_path / "a.pdf", (0, 0)); os.utime(tmp_path / "a.docx", (0, 0))
+    pequeno.guardar("b", {"pdf": b"z" * 10})
+    assert len(os.listdir(tmp_path)) == 2 and "b.pdf" in os.listdir(tmp_path)
+    assert pequeno.obter("a") is None  # faltando um dos formatos, a ata é renderizada de novo
+
+
+def test_renderizar_so_renderiza_conteudo_novo(monkeypatch):
+    renderizadas = []
+    monkeypatch.setattr(cache_render, "renderizar_ata", lambda dados, formatos: renderizadas.append(dados) or (dados['num_ata'], {"pdf": b"%PDF", "docx": b"PK"}))
+    cache = CacheRender()
+    assert cache.renderizar(dados_ata(7)) == {"pdf": b"%PDF", "docx": b"PK"}
+    cache.renderizar(dados_ata(7))
+    cache.renderizar(dados_ata(7, noticias_trabalhos="Outra notícia"))
+    assert len(renderizadas) == 2
@@ -0,0 +1,191 @@
+import threading
+from collections import Counter
+
+import pytest
+
+from ata_ssvp.espelho import ConflitoEscrita
+from ata_ssvp.historico import HistoricoAtas
+from tests.conftest import dados_ata, escrever_de_fora
+
+
+def test_atualizar_linhas_mescla_mudanca_de_fora_em_outra_coluna(conexao, novo_espelho):
+    espelho = novo_espelho()
+    base = espelho.ler_linha("Historico", 4)
+    escrever_de_fora(conexao, "Historico", 6, 14, "Notícia de outra pessoa")
+
+    mescladas = espelho.atualizar_linhas("Historico", {4: {"Noticias": base["Noticias"], "Presentes": "Só nós"}}, base={4: base})
+
+    assert mescladas == [4]
+    linha = conexao.abas["Historico"][5]
+    assert linha[6] == "Só nós" and linha[14] == "Notícia de outra pessoa"
+    local = espelho.ler_linha("Historico", 4)
+    assert local["Presentes"] == "Só nós" and local["Noticias"] == "Notícia de outra pessoa"
+
+
+def test_atualizar_linhas_sem_mudanca_de_fora_grava_direto(conexao, novo_espelho):
+    espelho = novo_espelho()
+    base = espelho.ler_linha("Historico", 4)
+    assert espelho.atualizar_linhas("Historico", {4: {"Presentes": "Só nós"}}, base={4: base}) == []
+    assert conexao.abas["Historico"][5][6] == "Só nós"
+
+
+def test_atualizar_linhas_conflito_na_mesma_celula(conexao, novo_espelho):
+    espelho = novo_espelho()
+    base = espelho.ler_linha("Historico", 4)
+    escrever_de_fora(conexao, "Historico", 6, 14, "Notícia de outra pessoa")
+    conexao.zerar_contagem()
+
+    with pytest.raises(ConflitoEscrita) as erro:
+        espelho.atualizar_linhas("Historico", {4: {"Noticias": "Nossa notícia", "Presentes": "Só nós"}}, base={4: base})
+
+    assert erro.value.conflitos == {4: ["Noticias"]}
+    assert conexao.chamadas["batch_update"] == 0
+    assert conexao.abas["Historico"][5][14] == "Notícia de outra pessoa"
+    assert conexao.abas["Historico"][5][6] == base["Presentes"]
+
+
+def test_anexar_linha_traz_as_linhas_de_outros_no_meio(conexao, novo_espelho):
+    espelho = novo_espelho()
+    conexao.abas["Historico"].append([11] + conexao.abas["Historico"][-1][1:])
+    posicao = espelho.anexar_linha("Historico", {"Numero": "12"})
+    assert posicao == 11
+    assert espelho.ler_linha("Historico", 10)["Numero"] == 11
+
+
+def numeros_na_planilha(conexao):
+    return [str(linha[0]) for linha in conexao.abas["Historico"][1:]]
+
+
+def salvar_ao_mesmo_tempo(historicos, numero):
+    """Cada histórico salva uma ata nova com ``numero``, todos ao mesmo tempo; devolve os números gravados."""
+    barreira, gravados, erros = threading.Barrier(len(historicos)), [], []
+    def salvar(historico):
+        barreira.wait()
+        try: gravados.append(historico.salvar(dados_ata(numero), nova=True)[1]['num_ata'])
+        except Exception as e: erros.append(e)
+    threads = [threading.Thread(target=salvar, args=(h,)) for h in historicos]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert not erros
+    return gravados
+
+
+def test_salvar_nova_com_numero_existente_usa_o_proximo(conexao, novo_espelho):
+    historico = HistoricoAtas(novo_espelho())
+    tipo, dados = historico.salvar(dados_ata(5), nova=True)
+    assert (tipo, dados['num_ata']) == ("criada", "11")
+    assert dados['saldo'] == pytest.approx(float(conexao.abas["Historico"][10][12]) + 54.5)
+    assert numeros_na_planilha(conexao)[-1] == "11"
+
+
+def test_salvar_correcao_regrava_a_linha(conexao, novo_espelho):
+    historico = HistoricoAtas(novo_espelho())
+    base = historico.buscar_ata(4)
+    tipo, _ = historico.salvar(dados_ata(4, historico.saldo_anterior(4)), base=base)
+    assert tipo == "atualizada"
+    assert len(numeros_na_planilha(conexao)) == 10
+
+
+def test_salvar_com_espelho_atrasado_renumera(conexao, novo_espelho):
+    a, b = HistoricoAtas(novo_espelho()), HistoricoAtas(novo_espelho())
+    b.indice()
+    b.espelho.sincronizar = lambda *args, **kw: []  # b não vê o append de a antes do seu
+    a.salvar(dados_ata(11, a.saldo_anterior(11)), nova=True)
+
+    _, dados = b.salvar(dados_ata(11, b.saldo_anterior(11)), nova=True)
+
+    assert dados['num_ata'] == "12"
+    assert numeros_na_planilha(conexao)[-2:] == ["11", "12"]
+    saldo_11 = float(conexao.abas["Historico"][11][12])
+    assert float(conexao.abas["Historico"][12][12]) == pytest.approx(saldo_11 + 54.5)
+
+
+def test_salvar_simultaneo_no_mesmo_historico_nao_repete_numero(conexao, novo_espelho):
+    historico = HistoricoAtas(novo_espelho())
+    gravados = salvar_ao_mesmo_tempo([historico] * 3, 11)
+    assert sorted(gravados) == ["11", "12", "13"]
+    assert not [n for n, k in Counter(numeros_na_planilha(conexao)).items() if k > 1]
+
+
+def test_salvar_simultaneo_em_espelhos_separados_nao_repete_numero(conexao, novo_espelho):
+    historicos = [HistoricoAtas(novo_espelho()) for _ in range(3)]
+    for h in historicos: h.indice()
+    gravados = salvar_ao_mesmo_tempo(historicos, 11)
+    assert sorted(gravados) == ["11", "12", "13"]
+    assert not [n for n, k in Counter(numeros_na_planilha(conexao)).items() if k > 1]
+
+
+def test_atualizar_linhas_nao_grava_em_linha_que_mudou_de_lugar(conexao, novo_espelho):
+    espelho = novo_espelho()
+    del conexao.abas["Historico"][3]  # a ata 3 some: a 6 sobe para a posição da 5
+    conexao.versao += 1
+    conexao.zerar_contagem()
+
+    with pytest.raises(ConflitoEscrita) as erro:
+        espelho.atualizar_linhas("Historico", {4: {"Saldo": 999}})
+
+    assert erro.value.conflitos == {4: ["Numero"]}
+    assert conexao.chamadas["batch_update"] == 0
+    assert "999" not in [str(l[12]) for l in conexao.abas["Historico"]]
+    espelho.sincronizar(["Historico"])
+    assert espelho.ler_linha("Historico", 4)["Numero"] == 6
+
+
+def test_salvar_correcao_depois_de_linha_apagada_e_linha_nova(conexao, novo_espelho):
+    historico = HistoricoAtas(novo_espelho())
+    historico.indice()
+    del conexao.abas["Historico"][3]
+    for numero in (11, 12): conexao.abas["Historico"].append([numero] + conexao.abas["Historico"][-1][1:])
+    conexao.versao += 1
+    seis = list(conexao.abas["Historico"][5])
+
+    historico.salvar(dados_ata(5, historico.saldo_anterior(5), lista_presentes_txt="Só nós"))
+
+    assert conexao.abas["Historico"][4][0] == "5" and conexao.abas["Historico"][4][6] == "Só nós"
+    assert conexao.abas["Historico"][5][:12] == seis[:12]
+
+
+def sem_gspread(espelho):
+    """Como uma conexão sem acesso gspread: só conn.read e conn.update funcionam."""
+    def falha(**kw): raise RuntimeError("sem gspread")
+    espelho.conn.client._select_worksheet = falha
+    espelho._worksheets.clear()
+
+
+def test_atualizar_linhas_sem_gspread_rele_a_aba_antes_de_regravar(conexao, novo_espelho):
+    espelho = novo_espelho()
+    sem_gspread(espelho)
+    base = espelho.ler_linha("Historico", 4)
+    escrever_de_fora(conexao, "Historico", 6, 14, "Notícia de outra pessoa")
+    escrever_de_fora(conexao, "Historico", 9, 14, "Outra linha editada")
+
+    assert espelho.atualizar_linhas("Historico", {4: {"Presentes": "Só nós"}}, base={4: base}) == [4]
+
+    assert conexao.abas["Historico"][5][6] == "Só nós" and conexao.abas["Historico"][5][14] == "Notícia de outra pessoa"
+    assert conexao.abas["Historico"][8][14] == "Outra linha editada"
+    assert espelho.ler_linha("Historico", 7)["Noticias"] == "Outra linha editada"
+
+
+def test_atualizar_linhas_sem_gspread_conflito_na_mesma_celula(conexao, novo_espelho):
+    espelho = novo_espelho()
+    sem_gspread(espelho)
+    base = espelho.ler_linha("Historico", 4)
+    escrever_de_fora(conexao, "Historico", 6, 14, "Notícia de outra pessoa")
+    conexao.zerar_contagem()
+
+    with pytest.raises(ConflitoEscrita) as erro:
+        espelho.atualizar_linhas("Historico", {4: {"Noticias": "Nossa notícia"}}, base={4: base})
+
+    assert erro.value.conflitos == {4: ["Noticias"]}
+    assert conexao.chamadas["update"] == 0
+    assert conexao.abas["Historico"][5][14] == "Notícia de outra pessoa"
+
+
+def test_anexar_linha_com_coluna_nova_nao_reescreve_a_partir_do_espelho(conexao, novo_espelho):
+    espelho = novo_espelho()
+    conexao.abas["Historico"].append([11] + conexao.abas["Historico"][-1][1:])  # o espelho ainda não viu
+
+    assert espelho.anexar_linha("Historico", {"Numero": "12", "Coluna_Nova": "x"}) is None
+
+    assert numeros_na_planilha(conexao)[-2:] == ["11", "12"]
+    assert [str(n) for n in espelho.ler("Historico")["Numero"]][-2:] == ["11", "12"]
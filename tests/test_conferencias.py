@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+from ata_ssvp.agendador import Agendador
+from ata_ssvp.conferencias import PoolConferencias
+from ata_ssvp.espelho import EspelhoLocal
+from ata_ssvp.historico import HistoricoAtas
+from benchmarks.conexao_falsa import ConexaoFalsa
+from tests.conftest import dados_ata
+
+
+class ContaFalsa:
+    """Conexão de conta de serviço falsa: cada chamada vai para a planilha pedida em ``spreadsheet``."""
+    def __init__(self, planilhas):
+        self.planilhas = planilhas
+        self.client = self
+
+    def read(self, spreadsheet=None, **kw): return self.planilhas[spreadsheet].read(**kw)
+    def update(self, spreadsheet=None, **kw): return self.planilhas[spreadsheet].update(**kw)
+    def _open_spreadsheet(self, spreadsheet=None, **kw): return self.planilhas[spreadsheet].client._open_spreadsheet(**kw)
+    def _select_worksheet(self, spreadsheet=None, **kw): return self.planilhas[spreadsheet].client._select_worksheet(**kw)
+
+
+@pytest.fixture
+def pool(tmp_path):
+    planilhas = {"a": ConexaoFalsa(n_atas=3, latencia=0.02), "b": ConexaoFalsa(n_atas=5, latencia=0.02)}
+    planilhas["b"].abas["Config"][2][1] = "Conferência B"
+    agendador = Agendador(leituras_por_minuto=10 ** 9, escritas_por_minuto=10 ** 9)
+    pool = PoolConferencias(ContaFalsa(planilhas), {"a": "a", "b": "b"}, pasta=str(tmp_path), agendador=agendador)
+    yield pool, planilhas
+    for ident in pool.residentes(): pool.obter(ident).parar()
+
+
+def obter_ao_mesmo_tempo(pool, idents):
+    barreira, conferencias = threading.Barrier(len(idents)), {}
+    def obter(ident):
+        barreira.wait()
+        conferencias[ident] = pool.obter(ident)
+    threads = [threading.Thread(target=obter, args=(i,)) for i in idents]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    return conferencias
+
+
+def test_partida_a_frio_simultanea_nao_mistura_planilhas(pool):
+    pool, _ = pool
+    conferencias = obter_ao_mesmo_tempo(pool, ["a", "b"])
+    a, b = conferencias["a"].espelho, conferencias["b"].espelho
+    assert len(a.ler("Historico")) == 3 and len(b.ler("Historico")) == 5
+    assert a.ler("Config").set_index("Chave").at["nome_conf", "Valor"] == "Conferência São José"
+    assert b.ler("Config").set_index("Chave").at["nome_conf", "Valor"] == "Conferência B"
+
+
+def test_salvar_vai_para_a_planilha_da_conferencia(pool):
+    pool, planilhas = pool
+    conferencias = obter_ao_mesmo_tempo(pool, ["a", "b"])
+    for conf in conferencias.values(): conf.espelho.sincronizar(forcar=True)
+    barreira = threading.Barrier(2)
+    def salvar(historico, numero):
+        barreira.wait()
+        historico.salvar(dados_ata(numero), nova=True)
+    threads = [threading.Thread(target=salvar, args=(conferencias["a"].historico, 4)),
+               threading.Thread(target=salvar, args=(conferencias["b"].historico, 6))]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert [str(l[0]) for l in planilhas["a"].abas["Historico"][1:]] == ["1", "2", "3", "4"]
+    assert [str(l[0]) for l in planilhas["b"].abas["Historico"][1:]] == ["1", "2", "3", "4", "5", "6"]
+
+
+def test_espelhos_de_planilhas_diferentes_no_mesmo_agendador(tmp_path):
+    agendador = Agendador(leituras_por_minuto=10 ** 9, escritas_por_minuto=10 ** 9)
+    conexoes = [ConexaoFalsa(n_atas=n, latencia=0.02) for n in (3, 5)]
+    espelhos = [EspelhoLocal(c, str(tmp_path / f"e{i}.sqlite3"), agendador=agendador) for i, c in enumerate(conexoes)]
+    barreira = threading.Barrier(2)
+    def sincronizar(espelho):
+        barreira.wait()
+        espelho.sincronizar()
+    threads = [threading.Thread(target=sincronizar, args=(e,)) for e in espelhos]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert [len(e.ler("Historico")) for e in espelhos] == [3, 5]
+    assert HistoricoAtas(espelhos[1]).proximo_numero() == 6
@@ -0,0 +1,20 @@
+import jwt
+import pytest
+
+from ata_ssvp.credenciais import chave_cookie
+
+SEGREDOS = {"cookie_chave": "mestra", "cookie_chaves": {"santa_luzia": "só dela"}}
+
+
+def test_chave_cookie_por_conferencia():
+    sao_jose, outra = chave_cookie(SEGREDOS, "sao_jose"), chave_cookie(SEGREDOS, "sao_pedro")
+    assert sao_jose and sao_jose != outra and sao_jose == chave_cookie(SEGREDOS, "sao_jose")
+    assert chave_cookie(SEGREDOS, "santa_luzia") == "só dela"
+    assert chave_cookie({}, "sao_jose") is None
+
+
+def test_cookie_de_uma_conferencia_nao_vale_em_outra():
+    token = jwt.encode({"username": "ana", "exp_date": 0}, chave_cookie(SEGREDOS, "sao_jose"), algorithm="HS256")
+    assert jwt.decode(token, chave_cookie(SEGREDOS, "sao_jose"), algorithms=["HS256"])["username"] == "ana"
+    with pytest.raises(jwt.InvalidSignatureError):
+        jwt.decode(token, chave_cookie(SEGREDOS, "sao_pedro"), algorithms=["HS256"])
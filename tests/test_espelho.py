@@ -0,0 +1,66 @@
+from tests.conftest import escrever_de_fora
+
+
+def test_sincronizar_traz_so_as_linhas_novas(conexao, novo_espelho):
+    espelho = novo_espelho()
+    conexao.abas["Historico"].append([11] + conexao.abas["Historico"][-1][1:])
+    conexao.versao += 1
+    conexao.zerar_contagem()
+
+    assert espelho.sincronizar(["Historico"]) == ["Historico"]
+    assert conexao.chamadas["values_get"] == 1  # só as linhas novas
+    assert conexao.chamadas["values_batch_get"] == 0 and conexao.chamadas["read"] == 0
+    df = espelho.ler("Historico")
+    assert len(df) == 11 and df.at[10, "Numero"] == 11
+
+
+def test_sincronizar_sem_mudanca_nao_le_a_aba(conexao, novo_espelho):
+    espelho = novo_espelho()
+    conexao.zerar_contagem()
+    assert espelho.sincronizar(["Historico"]) == []
+    assert conexao.chamadas["values_get"] == 0 and conexao.chamadas["values_batch_get"] == 0
+
+
+def test_sincronizar_edicao_sem_linha_nova_rele_a_aba(conexao, novo_espelho):
+    espelho = novo_espelho()
+    escrever_de_fora(conexao, "Historico", 3, 14, "Editado na planilha")
+    espelho.sincronizar(["Historico"])
+    assert espelho.ler_linha("Historico", 1)["Noticias"] == "Editado na planilha"
+
+
+def test_gravacao_nossa_nao_esconde_edicao_de_fora(conexao, novo_espelho):
+    espelho = novo_espelho()
+    escrever_de_fora(conexao, "Config", 3, 1, "Editado na planilha")
+    espelho.anexar_linha("Historico", {"Numero": "11"})
+
+    assert "Config" in espelho.sincronizar()
+    assert espelho.ler("Config").set_index("Chave").at["nome_conf", "Valor"] == "Editado na planilha"
+
+
+def test_gravacao_nossa_com_planilha_em_dia_renova_o_marcador(conexao, novo_espelho):
+    espelho = novo_espelho()
+    espelho.anexar_linha("Historico", {"Numero": "11"})
+    conexao.zerar_contagem()
+    assert espelho.sincronizar() == []
+    assert conexao.chamadas["values_batch_get"] == 0 and conexao.chamadas["values_get"] == 0
+
+
+def test_sincronizar_edicao_na_ultima_linha_com_linha_nova(conexao, novo_espelho):
+    espelho = novo_espelho()
+    escrever_de_fora(conexao, "Historico", 11, 14, "Editado na planilha")
+    conexao.abas["Historico"].append([11] + conexao.abas["Historico"][-1][1:])
+
+    espelho.sincronizar(["Historico"])
+    assert espelho.ler_linha("Historico", 9)["Noticias"] == "Editado na planilha"
+    assert len(espelho.ler("Historico")) == 11
+
+
+def test_sincronizar_linha_apagada_com_linhas_novas(conexao, novo_espelho):
+    espelho = novo_espelho()
+    del conexao.abas["Historico"][3]
+    for numero in (11, 12): conexao.abas["Historico"].append([numero] + conexao.abas["Historico"][-1][1:])
+    conexao.versao += 1
+
+    espelho.sincronizar(["Historico"])
+    remotos = [str(l[0]) for l in conexao.abas["Historico"][1:]]
+    assert [str(n) for n in espelho.ler("Historico")["Numero"]] == remotos
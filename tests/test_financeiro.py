@@ -0,0 +1,54 @@
+import pytest
+
+from ata_ssvp.financeiro import SEM_ANO, SEM_DATA, ResumoFinanceiro
+from tests.conftest import historico
+
+
+@pytest.fixture
+def resumo():
+    return ResumoFinanceiro.do_historico(historico(
+        (1, "07/12/2025", "Ano Temático 2025", 100, 40, 10, 0),
+        (2, "04/01/2026", "Ano Temático 2025", 50, 20, 5, 0),
+        (3, "11/01/2026", "Ano Temático 2026", 30, 10, 3, 0),
+        (4, "", "", 7, 0, 0, 0),
+        (3, "18/01/2026", "Ano Temático 2026", 999, 0, 0, 0)))  # repetida: vale a primeira
+
+
+def test_totais_por_ano_tematico(resumo):
+    t = resumo.tabela("Ano Temático").set_index("Ano Temático")
+    assert t.loc["Ano Temático 2025", ["Atas", "Receita", "Despesa", "Décima", "Resultado"]].tolist() == [2, 150, 60, 15, 75]
+    assert t.loc["Ano Temático 2026", "Receita"] == 30
+    assert t.loc[SEM_ANO, "Atas"] == 1
+
+
+def test_totais_por_mes_e_ano(resumo):
+    assert resumo.tabela("Mês").set_index("Mês")["Receita"].to_dict() == {"2025-12": 100, "2026-01": 80, SEM_DATA: 7}
+    assert resumo.tabela("Ano").set_index("Ano")["Atas"].to_dict() == {"2025": 1, "2026": 2, SEM_DATA: 1}
+
+
+def test_correcao_muda_de_periodo(resumo):
+    resumo.registrar(2, "04/01/2026", "Ano Temático 2026", 60, 20, 5)
+    t = resumo.tabela("Ano Temático").set_index("Ano Temático")
+    assert t.loc["Ano Temático 2025", ["Atas", "Receita"]].tolist() == [1, 100]
+    assert t.loc["Ano Temático 2026", ["Atas", "Receita"]].tolist() == [2, 90]
+
+
+def test_periodo_que_fica_vazio_sai_da_tabela(resumo):
+    resumo.registrar(4, "01/02/2026", "Ano Temático 2026", 7, 0, 0)
+    assert SEM_ANO not in resumo.tabela("Ano Temático")["Ano Temático"].tolist()
+    assert SEM_DATA not in resumo.tabela("Mês")["Mês"].tolist()
+
+
+def test_incremental_igual_a_remontar():
+    linhas = [(1, "07/12/2025", "Ano Temático 2025", 100, 40, 10, 0), (2, "04/01/2026", "Ano Temático 2026", 50, 20, 5, 0)]
+    incremental = ResumoFinanceiro.do_historico(historico(linhas[0]))
+    incremental.registrar(*linhas[1][:6])
+    remontado = ResumoFinanceiro.do_historico(historico(*linhas))
+    for periodo in ("Mês", "Ano", "Ano Temático"):
+        assert incremental.tabela(periodo).equals(remontado.tabela(periodo))
+
+
+def test_csv_no_padrao_brasileiro(resumo):
+    csv = resumo.exportar_csv("Ano Temático").decode("utf-8-sig")
+    assert csv.splitlines()[0] == "Ano Temático;Atas;Receita;Despesa;Décima;Resultado"
+    assert "Ano Temático 2025;2;150,0;60,0;15,0;75,0" in csv
@@ -0,0 +1,59 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from ata_ssvp.frequencia import INJUSTIFICADA, JUSTIFICADA, PRESENTE, SEM_REGISTRO, MatrizFrequencia, separar_nomes
+from tests.conftest import historico
+
+MEMBROS = ["Ana", "Bruno", "Carla"]
+
+
+@pytest.fixture
+def freq():
+    return MatrizFrequencia.do_historico(historico(
+        (3, "21/01/2026", "", 0, 0, 0, 0, "Ana", "Bruno (doente), Carla"),
+        (1, "07/01/2026", "", 0, 0, 0, 0, "Ana, Bruno, Visitante", "Carla"),
+        (2, "14/01/2026", "", 0, 0, 0, 0, "Ana", "Bruno, Carla (viagem, família)"),
+        (4, "28/01/2026", "", 0, 0, 0, 0, "texto fora do padrão", "")), MEMBROS)
+
+
+def test_separar_nomes():
+    assert separar_nomes("Ana, Bruno (Doente, viagem), Carla") == [("Ana", False), ("Bruno", True), ("Carla", False)]
+    assert separar_nomes(float("nan")) == []
+
+
+def test_matriz_em_ordem_de_numero(freq):
+    assert freq.numeros.tolist() == [1, 2, 3, 4]
+    assert freq.matriz.tolist() == [[PRESENTE, PRESENTE, PRESENTE, SEM_REGISTRO],
+                                    [PRESENTE, INJUSTIFICADA, JUSTIFICADA, SEM_REGISTRO],
+                                    [INJUSTIFICADA, JUSTIFICADA, INJUSTIFICADA, SEM_REGISTRO]]
+
+
+def test_resumo(freq):
+    r = freq.resumo().set_index("Membro")
+    assert r.loc["Ana", "Frequência (%)"] == 100.0
+    assert r.loc["Bruno", ["Presenças", "Faltas Justificadas", "Faltas Injustificadas"]].tolist() == [1, 1, 1]
+    assert r.loc["Bruno", ["Maior Sequência de Faltas", "Faltas Seguidas Atuais"]].tolist() == [2, 2]
+    assert r.loc["Carla", ["Reuniões", "Maior Sequência de Faltas", "Faltas Seguidas Atuais"]].tolist() == [3, 3, 3]
+
+
+def test_resumo_num_intervalo_de_datas(freq):
+    r = freq.resumo(date(2026, 1, 10), date(2026, 1, 20)).set_index("Membro")
+    assert r["Reuniões"].tolist() == [1, 1, 1]
+    assert r.loc["Carla", "Faltas Justificadas"] == 1
+    assert freq.presencas_por_ata(date(2026, 1, 1), date(2026, 1, 15)).to_dict() == {1: 2, 2: 1}
+
+
+def test_intervalo_sem_atas(freq):
+    r = freq.resumo(date(2030, 1, 1), date(2030, 12, 31))
+    assert r["Reuniões"].tolist() == [0, 0, 0] and np.isnan(r["Frequência (%)"]).all()
+
+
+def test_registrar_corrige_e_insere(freq):
+    freq.registrar(2, "14/01/2026", "Ana, Bruno, Carla", "")
+    freq.registrar(5, "04/02/2026", "", "Ana")
+    assert freq.numeros.tolist() == [1, 2, 3, 4, 5]
+    assert freq.matriz[:, 1].tolist() == [PRESENTE] * 3
+    assert freq.matriz[:, 4].tolist() == [INJUSTIFICADA, SEM_REGISTRO, SEM_REGISTRO]
+    assert freq.resumo().set_index("Membro").loc["Ana", "Faltas Seguidas Atuais"] == 1
@@ -0,0 +1,47 @@
+import pytest
+
+from ata_ssvp.livro_caixa import LivroCaixa
+from tests.conftest import historico
+
+
+@pytest.fixture
+def livro():
+    # Saldo inicial 100; movimentos +10, +20, -5 (ata 4 veio fora de ordem e a 2 está repetida)
+    return LivroCaixa.do_historico(historico(
+        (1, "", "", 10, 0, 0, 110), (4, "", "", 0, 5, 0, 125), (2, "", "", 20, 0, 0, 130),
+        (2, "", "", 999, 0, 0, 999), ("", "", "", 1, 0, 0, 1)))
+
+
+def test_monta_em_ordem_de_numero_e_ignora_repetidas_e_sem_numero(livro):
+    assert livro.numeros.tolist() == [1, 2, 4]
+    assert livro.saldo_inicial == pytest.approx(100.0)
+
+
+def test_saldo_anterior(livro):
+    assert livro.saldo_anterior(1) == pytest.approx(100.0)
+    assert livro.saldo_anterior(2) == pytest.approx(110.0)
+    assert livro.saldo_anterior(3) == pytest.approx(130.0)  # ata que não existe: a anterior a ela
+    assert livro.saldo_anterior(99) == pytest.approx(125.0)
+
+
+def test_correcao_propaga_aos_saldos_seguintes(livro):
+    mudancas = livro.registrar(1, 30, 0, 0)
+    assert mudancas == {2: pytest.approx(150.0), 4: pytest.approx(145.0)}
+    assert livro.saldo.tolist() == pytest.approx([130.0, 150.0, 145.0])
+
+
+def test_correcao_sem_mudanca_de_saldo_nao_propaga(livro):
+    assert livro.registrar(2, 15, 0, -5) == {}
+
+
+def test_ata_nova_no_meio_e_no_fim(livro):
+    assert livro.registrar(3, 0, 0, 2) == {4: pytest.approx(123.0)}
+    assert livro.saldo_anterior(4) == pytest.approx(128.0)
+    assert livro.registrar(5, 10, 0, 0) == {}
+    assert livro.saldo_anterior(6) == pytest.approx(133.0)
+
+
+def test_livro_vazio():
+    livro = LivroCaixa.do_historico(historico())
+    assert livro.saldo_anterior(1) == 0.0
+    assert livro.registrar(1, 10, 0, 0) == {} and livro.saldo_anterior(2) == pytest.approx(10.0)
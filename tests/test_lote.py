@@ -0,0 +1,27 @@
+from ata_ssvp.historico import montar_linha_historico
+from ata_ssvp.lote import linha_para_dados_ata
+from ata_ssvp.modelo import montar_texto_ata
+from tests.conftest import dados_ata
+
+# Dados da Conferência como na ata; os padrões do formulário são outros, de propósito
+CONFIG = {'nome_conf': 'São José', 'cons_particular': 'Centro', 'cons_central': 'Diocesano',
+          'data_fundacao': '01/01/1990', 'data_agregacao': '01/06/1991', 'cidade_padrao': 'Belo Horizonte - MG',
+          'horario_padrao': '19:00', 'local_padrao': 'Capela', 'tes_padrao': 'Tesoureiro de hoje'}
+
+
+def test_linha_gravada_refaz_o_mesmo_texto():
+    dados = dados_ata(7, saldo=100.0, escala_visitas="Ana e Bruno: família 12.", hora_inicio="20:15")
+    refeita = linha_para_dados_ata(montar_linha_historico(dados, "Numero"), CONFIG)
+    assert montar_texto_ata(refeita) == montar_texto_ata(dados)
+
+
+def test_linha_antiga_omite_o_que_nao_guardou():
+    linha = {c: v for c, v in montar_linha_historico(dados_ata(7), "Numero").items()
+             if c in ("Numero", "Data", "Ano", "Presidente", "Secretario", "Leitura", "Presentes", "Receita", "Despesa", "Decima", "Saldo")}
+    texto = montar_texto_ata(linha_para_dados_ata(linha, CONFIG))
+
+    assert "realizada do dia 14/10/2026" in texto and "19:00" not in texto and "Capela" not in texto
+    assert "tirada do(a) Mateus 25, 31-46. Em seguida" in texto and "proclamada" not in texto
+    assert "ata anterior" not in texto and "Hino de Ozanam" not in texto and "Tesoureiro de hoje" not in texto
+    assert "Vicente de Paulo. Para constar, eu, Bruno Lima, lavrei" in texto
+    assert " ." not in texto and ", ," not in texto
@@ -0,0 +1,47 @@
+from ata_ssvp import documentos
+from ata_ssvp.modelo import _valor_extenso, eh_valido, formatar_valor_extenso, montar_texto_ata
+from tests.conftest import dados_ata
+
+
+def test_leitura_termina_com_ponto():
+    assert " proclamada por Carla Dias. A ata anterior" in montar_texto_ata(dados_ata(7))
+
+
+def test_trechos_opcionais_so_entram_com_valor():
+    sem = montar_texto_ata(dados_ata(7))
+    com = montar_texto_ata(dados_ata(7, lista_visitantes_txt="Padre João"))
+    assert "visitantes" not in sem.lower()
+    assert " Presenças dos visitantes: Padre João." in com and " Agradecimentos aos visitantes." in com
+    assert ", fundada em 01/01/1990" not in montar_texto_ata(dados_ata(7, data_fundacao=""))
+
+
+def test_tesoureiro_sem_nome():
+    texto = montar_texto_ata(dados_ata(7, tes_nome=""))
+    assert "em seguida o Tesoureiro apresentou" in texto and "em seguida o tesoureiro fez a coleta" in texto
+
+
+def test_valor_por_extenso_em_cache():
+    assert formatar_valor_extenso(0) == "R$ 0,00"
+    assert formatar_valor_extenso(1234.5) == "R$ 1.234,50 (mil, duzentos e trinta e quatro reais e cinquenta centavos)"
+    antes = _valor_extenso.cache_info().hits
+    formatar_valor_extenso("1234.5")
+    assert _valor_extenso.cache_info().hits == antes + 1
+
+
+def test_eh_valido():
+    assert not any(eh_valido(v) for v in (None, "", " ", "nan", 0, 0.0, "NaT"))
+    assert eh_valido("Ana") and eh_valido(10.5)
+
+
+def test_docx_e_pdf_usam_o_mesmo_texto_montado_uma_vez(monkeypatch):
+    dados = dados_ata(7)
+    chamadas, escritos = [], []
+    monkeypatch.setattr(documentos, "montar_texto_ata", lambda d: chamadas.append(d) or montar_texto_ata(d))
+    original = documentos.escrever_ata_pdf
+    monkeypatch.setattr(documentos, "escrever_ata_pdf", lambda pdf, d, texto=None, **kw: escritos.append(texto) or original(pdf, d, texto, **kw))
+
+    _, arquivos = documentos.renderizar_ata(dados)
+
+    assert len(chamadas) == 1 and escritos == [montar_texto_ata(dados)]
+    assert arquivos["pdf"].startswith(b"%PDF") and arquivos["pdf"] != b"%PDF-1.4 erro_geracao"
+    assert documentos.gerar_docx(dados).paragraphs[0].text == montar_texto_ata(dados)